@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
 import os
+import sys
 from pathlib import Path
 from dotenv import load_dotenv
 from urllib.parse import urlparse
@@ -104,8 +105,39 @@ DATABASES = {
         "PASSWORD": os.environ.get("DB_PASSWORD", "1234"),
         "HOST": os.environ.get("DB_HOST", "localhost"),
         "PORT": os.environ.get("DB_PORT", "5432"),
+        # Comprueba que la conexión sigue viva antes de reutilizarla en otra petición,
+        # con el pool se comprueba cada conexión al sacarla de él
+        "CONN_HEALTH_CHECKS": True,
     }
 }
+# Pool de conexiones de psycopg, para no abrir una conexión nueva en cada petición.
+# Se crea al conectar por primera vez, así que cada worker de gunicorn tiene el suyo:
+# la base de datos recibe hasta workers × DB_POOL_MAX_SIZE conexiones. Los hilos
+# de la clonación y la purga también toman sus conexiones del pool del proceso
+if os.environ.get("DB_POOL", "True") == "True":
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", "4")),
+            # Segundos que espera una petición a que quede libre una conexión
+            "timeout": float(os.environ.get("DB_POOL_TIMEOUT", "10")),
+            # Segundos tras los que se cierran las conexiones sin usar por encima de min_size
+            "max_idle": float(os.environ.get("DB_POOL_MAX_IDLE", "600")),
+            # Segundos tras los que se renueva una conexión aunque se esté usando
+            "max_lifetime": float(os.environ.get("DB_POOL_MAX_LIFETIME", "3600")),
+        }
+    }
+else:
+    # Sin pool cada proceso mantiene abierta su conexión estos segundos (0 la cierra en cada petición)
+    DATABASES["default"]["CONN_MAX_AGE"] = int(os.environ.get("DB_CONN_MAX_AGE", "60"))
+# Segunda conexión a la misma base de datos para escribir el progreso de las tareas
+# en segundo plano fuera de su transacción, así se ve antes de que terminen
+DATABASES["progreso"] = {
+    **DATABASES["default"],
+    "OPTIONS": {},
+    "CONN_MAX_AGE": 0,
+    "TEST": {"MIRROR": "default"},
+}
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -163,6 +195,45 @@ REST_FRAMEWORK = {
 EMAIL_BACKEND = "dynamic_email.backend.DynamicEmailBackend"
 DEFAULT_FROM_EMAIL = os.environ.get("DEFAULT_FROM_EMAIL", "")
 EMAIL_FILE_PATH = "../tmp/app-messages"
+# Caché
+# Los años académicos y el temario se cachean y se invalidan en la propia caché
+# (ver seguimientos.cache_catalogo), así que tiene que ser compartida por todos
+# los procesos que sirven la aplicación: con LocMemCache cada worker de gunicorn
+# (y el comando clonar_año) tendría su copia y no vería los cambios de los demás.
+# Por defecto se usa una caché en disco, compartida por los procesos de la
+# máquina; con varias máquinas hay que usar una compartida, p. ej.
+# CACHE_BACKEND=django.core.cache.backends.redis.RedisCache y CACHE_LOCATION=redis://...
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.filebased.FileBasedCache"
+        ),
+        "LOCATION": os.environ.get(
+            "CACHE_LOCATION", os.path.join(BASE_DIR, "..", "tmp", "cache")
+        ),
+    }
+}
+if "test" in sys.argv[1:2]:
+    # Los tests no comparten la caché con el servidor ni con otras ejecuciones
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+# Informes PDF
+# Número de procesos con los que se renderizan los bloques del informe PDF, 1 lo hace en el propio proceso
+PDF_EXPORT_WORKERS = int(os.environ.get("PDF_EXPORT_WORKERS", "1"))
+# Caché en disco de informes PDF ya generados, se borran los menos usados al superar el tamaño máximo (0 la desactiva)
+PDF_CACHE_DIR = os.environ.get(
+    "PDF_CACHE_DIR", os.path.join(BASE_DIR, "..", "tmp", "pdf-cache")
+)
+PDF_CACHE_MAX_BYTES = int(os.environ.get("PDF_CACHE_MAX_BYTES", 200 * 1024 * 1024))
+# Clonación de años académicos
+# Si es False la clonación se hace dentro de la petición del admin en vez de en un hilo aparte
+CLONACION_EN_SEGUNDO_PLANO = True
+# Minutos sin progreso tras los que una clonación en marcha se da por muerta y se marca con error
+CLONACION_MINUTOS_SIN_PROGRESO = int(
+    os.environ.get("CLONACION_MINUTOS_SIN_PROGRESO", "15")
+)
+# Listados del admin
+# Por encima de estas filas los listados grandes muestran el recuento estimado por Postgres en vez de contarlas
+ADMIN_CONTEO_EXACTO_HASTA = int(os.environ.get("ADMIN_CONTEO_EXACTO_HASTA", "10000"))
 # Djoser
 parsed_url = urlparse(FRONTEND_URL)
 DJOSER = {
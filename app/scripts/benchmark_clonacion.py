@@ -0,0 +1,144 @@
+"""
+Benchmark de la clonación de un año académico.
+
+Uso: python manage.py runscript benchmark_clonacion [--script-args 300]
+
+Crea un año de prueba con el número de módulos indicado (300 por defecto)
+y lo clona de dos formas, deshaciendo todo al terminar:
+- Fila a fila: un create por objeto y una consulta por módulo y ciclo, como
+  se hacía antes de seguimientos.clonacion.
+- En bloque: clonar_año_academico, una consulta y un bulk_create por nivel.
+"""
+
+import time
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from seguimientos.clonacion import clonar_año_academico
+from seguimientos.models import (
+    Asignacion,
+    AñoAcademico,
+    Ciclo,
+    Docencia,
+    Grupo,
+    Modulo,
+    Profesor,
+    UnidadDeTrabajo,
+)
+
+MODULOS = 300
+MODULOS_POR_CICLO = 10
+GRUPOS_POR_CICLO = 4
+UNIDADES_POR_MODULO = 10
+AÑO_ORIGINAL = "1990-91"
+
+
+class _Deshacer(Exception):
+    pass
+
+
+def run(*args):
+    modulos = int(args[0]) if args else MODULOS
+    try:
+        with transaction.atomic():
+            año = _crear_año(modulos)
+            print(f"Año de prueba con {modulos} módulos")
+            _medir("fila a fila", lambda: _clonar_fila_a_fila(año, "1991-92"))
+            _medir(
+                "en bloque",
+                lambda: clonar_año_academico(año, "1992-93", "docencias"),
+            )
+            raise _Deshacer
+    except _Deshacer:
+        pass
+
+
+def _medir(nombre, clonar):
+    with CaptureQueriesContext(connection) as consultas:
+        inicio = time.perf_counter()
+        clonar()
+        duracion = time.perf_counter() - inicio
+    print(f"{nombre:>12}: {duracion:6.2f} s, {len(consultas):6} consultas")
+
+
+def _crear_año(modulos):
+    año = AñoAcademico.objects.create(año_academico=AÑO_ORIGINAL)
+    profesores = Profesor.objects.bulk_create(
+        Profesor(email=f"benchmark{i}@example.com", nombre=f"Profesor {i}")
+        for i in range(modulos // 2 + 1)
+    )
+    ciclos = Ciclo.objects.bulk_create(
+        Ciclo(nombre=f"Ciclo {i}", año_academico=año)
+        for i in range(-(-modulos // MODULOS_POR_CICLO))
+    )
+    grupos = Grupo.objects.bulk_create(
+        Grupo(nombre=f"Grupo {i}", ciclo=ciclo, curso=i % 2 + 1)
+        for ciclo in ciclos
+        for i in range(GRUPOS_POR_CICLO)
+    )
+    nuevos_modulos = Modulo.objects.bulk_create(
+        Modulo(
+            nombre=f"Módulo {i}",
+            curso=i % 2 + 1,
+            ciclo=ciclos[i // MODULOS_POR_CICLO],
+        )
+        for i in range(modulos)
+    )
+    UnidadDeTrabajo.objects.bulk_create(
+        UnidadDeTrabajo(numero_tema=n, titulo=f"Unidad {n}", modulo=modulo)
+        for modulo in nuevos_modulos
+        for n in range(1, UNIDADES_POR_MODULO + 1)
+    )
+    # bulk_create no pasa por Docencia.save, el año y la asignación se ponen aquí
+    pares = [
+        (grupos[(i // MODULOS_POR_CICLO) * GRUPOS_POR_CICLO + g], modulo)
+        for i, modulo in enumerate(nuevos_modulos)
+        for g in range(2)
+    ]
+    asignaciones = Asignacion.objects.bulk_create(
+        Asignacion(grupo=grupo, modulo=modulo) for grupo, modulo in pares
+    )
+    Docencia.objects.bulk_create(
+        Docencia(
+            profesor=profesores[i // 4],
+            grupo=grupo,
+            modulo=modulo,
+            año_academico=año,
+            asignacion=asignacion,
+        )
+        for i, ((grupo, modulo), asignacion) in enumerate(zip(pares, asignaciones))
+    )
+    return año
+
+
+def _clonar_fila_a_fila(año_original, nuevo_año_valor):
+    año_nuevo = AñoAcademico.objects.create(año_academico=nuevo_año_valor)
+    ciclos = {}
+    for ciclo in Ciclo.objects.filter(año_academico=año_original):
+        ciclos[ciclo.id] = Ciclo.objects.create(
+            nombre=ciclo.nombre, año_academico=año_nuevo
+        )
+    modulos = {}
+    for modulo in Modulo.objects.filter(ciclo__año_academico=año_original):
+        modulos[modulo.id] = Modulo.objects.create(
+            nombre=modulo.nombre, curso=modulo.curso, ciclo=ciclos[modulo.ciclo_id]
+        )
+        for unidad in UnidadDeTrabajo.objects.filter(modulo=modulo):
+            UnidadDeTrabajo.objects.create(
+                numero_tema=unidad.numero_tema,
+                titulo=unidad.titulo,
+                modulo=modulos[modulo.id],
+            )
+    grupos = {}
+    for ciclo_id, ciclo_nuevo in ciclos.items():
+        for grupo in Grupo.objects.filter(ciclo_id=ciclo_id):
+            grupos[grupo.id] = Grupo.objects.create(
+                nombre=grupo.nombre, ciclo=ciclo_nuevo, curso=grupo.curso
+            )
+    for docencia in Docencia.objects.filter(modulo__ciclo__año_academico=año_original):
+        Docencia.objects.create(
+            profesor=docencia.profesor,
+            grupo=grupos[docencia.grupo_id],
+            modulo=modulos[docencia.modulo_id],
+        )
@@ -0,0 +1,102 @@
+"""
+Benchmark del render del informe PDF con y sin reutilizar los recursos de WeasyPrint.
+
+Uso: python manage.py runscript benchmark_pdf [--script-args 50 500 5000]
+
+- En frío: cada render parsea la hoja de estilos y crea su configuración de fuentes,
+  como se hacía antes de RenderizadorPDF.
+- En caliente: todos los renders usan el mismo RenderizadorPDF ya calentado.
+
+Los seguimientos son objetos en memoria para medir solo WeasyPrint, sin base de datos.
+Cada tamaño se renderiza en bloques de un mes como hace generar_informe_pdf.
+"""
+
+import time
+from types import SimpleNamespace
+
+from django.template.loader import render_to_string
+from django.utils import timezone
+from weasyprint import CSS, HTML
+from weasyprint.text.fonts import FontConfiguration
+
+from seguimientos.pdf_export import (
+    PLANTILLA_PDF,
+    RenderizadorPDF,
+    leer_hoja_estilos,
+)
+
+TAMAÑOS = [50, 500, 5000]
+SEGUIMIENTOS_POR_MES = 250
+
+
+def run(*args):
+    tamaños = [int(arg) for arg in args] or TAMAÑOS
+    hoja_estilos = leer_hoja_estilos()
+    renderizador = RenderizadorPDF(hoja_estilos)
+    renderizador.calentar()
+
+    print(f"{'seguimientos':>12} {'frío (s)':>10} {'caliente (s)':>13} {'mejora':>8}")
+    for tamaño in tamaños:
+        htmls = list(_htmls(tamaño))
+
+        inicio = time.perf_counter()
+        for html_string in htmls:
+            font_config = FontConfiguration()
+            css = CSS(string=hoja_estilos, font_config=font_config)
+            HTML(string=html_string).write_pdf(
+                stylesheets=[css], font_config=font_config
+            )
+        frio = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        for html_string in htmls:
+            renderizador.renderizar(html_string)
+        caliente = time.perf_counter() - inicio
+
+        print(f"{tamaño:>12} {frio:>10.2f} {caliente:>13.2f} {frio / caliente:>7.2f}x")
+
+
+def _htmls(tamaño):
+    """HTML de cada bloque mensual del informe para `tamaño` seguimientos"""
+    seguimientos = [_seguimiento(i) for i in range(tamaño)]
+    bloques = [
+        seguimientos[i : i + SEGUIMIENTOS_POR_MES]
+        for i in range(0, tamaño, SEGUIMIENTOS_POR_MES)
+    ]
+    for indice, bloque in enumerate(bloques):
+        yield render_to_string(
+            PLANTILLA_PDF,
+            {
+                "seguimientos": {"2024-25": {f"Mes {indice + 1}": bloque}},
+                "count": tamaño,
+                "title": "Informe de Seguimientos",
+                "fecha_datos": timezone.localtime(),
+                "cabecera": indice == 0,
+                "pie": indice == len(bloques) - 1,
+                "nuevo_año": indice == 0,
+            },
+        )
+
+
+def _seguimiento(i):
+    temas = [
+        SimpleNamespace(numero_tema=n, titulo=f"Unidad de trabajo {n}")
+        for n in range(1, 6)
+    ]
+    return SimpleNamespace(
+        modulo=f"Módulo {i % 30} - DAW - 2024-25",
+        grupo=f"Grupo {i % 10}",
+        profesor=f"Profesor {i % 40}",
+        año_academico="2024-25",
+        mes=10,
+        evaluacion="PRIMERA",
+        estado="ATRASADO" if i % 3 else "AL_DIA",
+        temario_actual="UT6 - Unidad de trabajo 6",
+        unidades_completadas=temas,
+        ultimo_contenido_impartido="Contenido impartido en clase " * 3,
+        cumple_programacion=bool(i % 2),
+        motivo_no_cumple_programacion="" if i % 2 else "SECUENCIA",
+        get_motivo_display="Cambio en la Secuenciación y distribución temporal",
+        justificacion_estado="Justificación del estado" if i % 3 else "",
+        justificacion_cumple_programacion="" if i % 2 else "Justificación",
+    )
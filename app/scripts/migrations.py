@@ -362,7 +362,12 @@ def pasarSeguimientos(conn, originalYearID):
                     conn, row.IDTEMARIO_IMPARTIDO, modulo
                 )
                 if temarios_completados:
-                    seguimiento.temario_completado.set(temarios_completados)
+                    seguimiento.temario_completado = list(
+                        temarios_completados.order_by("numero_tema").values_list(
+                            "pk", flat=True
+                        )
+                    )
+                    seguimiento.save(update_fields=["temario_completado"])
 
             print(
                 f"Created seguimiento for {profesor.nombre} - {modulo.nombre} - Mes {mes_convertido}"
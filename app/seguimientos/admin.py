@@ -1,14 +1,15 @@
 import calendar
 from django.contrib.admin import SimpleListFilter
+from django.contrib.admin.widgets import AutocompleteMixin
 from dal import autocomplete
 from django import forms
 from django.contrib import admin, messages
 from django.contrib.auth.admin import GroupAdmin  # noqa: F401
 from django.contrib.auth.models import Group
 from django.forms import ModelForm
-from django.shortcuts import render
+from django.shortcuts import get_object_or_404, render
 from django.urls import path
-from django.utils.html import format_html
+from django.utils.html import format_html, format_html_join
 from solo.admin import SingletonModelAdmin
 from import_export import fields, resources
 from django.forms.models import BaseInlineFormSet
@@ -17,22 +18,45 @@ from import_export.admin import (
 )
 from django.urls import reverse
 from django.http import HttpResponseRedirect
-from django.core.exceptions import ValidationError
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.db.models import Count
 from django.http import HttpResponse
-from django.template.loader import render_to_string
-from weasyprint import HTML
 from .admin_filters import (
     BaseAñoAcademicoFilter,
     GrupoAndModuloAñoAcademicoFilter,
     CicloAñoAcademicoFilter,
+    AutocompleteFilter,
+    AutocompleteFilterMixin,
 )
+from .archivo import archivar_año, leer_seguimientos
+from .busqueda import BusquedaTextoMixin
+from .clonacion import (
+    OPCIONES_CLONACION,
+    lanzar_clonacion,
+    marcar_clonaciones_abandonadas,
+    previsualizar_clonacion,
+)
+from .exportacion import StreamingExportMixin
+from .paginacion import PaginadorConteoEstimado
+from .utils import (
+    get_modulo_de_docencia,
+    get_temario_modulo,
+    recorrer_con_unidades_completadas,
+)
+from .pdf_export import obtener_informe_pdf
+from .purga import contar_año, lanzar_purga, purgar_año_academico
 from .models import (
     AñoAcademico,
+    AñoArchivado,
     Ciclo,
+    ClonacionAño,
     Docencia,
+    EstadoClonacion,
+    EstadoSeguimiento,
     Grupo,
     Modulo,
     Profesor,
+    PurgaAño,
     Seguimiento,
     UnidadDeTrabajo,
     RecordatorioEmailConfig,
@@ -47,18 +71,55 @@ admin.site.index_title = (
 admin.site.unregister(Group)
 
 
+class OpcionesCompartidasFormSet(BaseInlineFormSet):
+    """
+    Formset que evalúa una sola vez las opciones de cada desplegable y las
+    comparte entre todas sus filas, en vez de lanzar la consulta en cada una.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._opciones = {}
+        super().__init__(*args, **kwargs)
+
+    def add_fields(self, form, index):
+        super().add_fields(form, index)
+        for nombre, field in form.fields.items():
+            widget = getattr(field.widget, "widget", field.widget)
+            # La clave primaria oculta de cada fila no pinta opciones
+            if (
+                not isinstance(field, forms.ModelChoiceField)
+                or widget.is_hidden
+                or isinstance(widget, AutocompleteMixin)
+            ):
+                continue
+            if nombre not in self._opciones:
+                # iter evita el COUNT que haría list() para saber la longitud
+                self._opciones[nombre] = list(iter(field.choices))
+            field.choices = self._opciones[nombre]
+
+
 class DocenciaInline(admin.TabularInline):
     model = Docencia
+    formset = OpcionesCompartidasFormSet
     extra = 1
 
     def formfield_for_foreignkey(self, db_field, request, **kwargs):
         # Filter grupos based on modulo's ciclo
         if db_field.name == "grupo" and hasattr(self, "parent_obj") and self.parent_obj:
+            # Grupo.__str__ pinta el ciclo en cada opción
             kwargs["queryset"] = Grupo.objects.filter(
                 ciclo=self.parent_obj.ciclo, curso=self.parent_obj.curso
-            )
+            ).select_related("ciclo")
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
+    def get_queryset(self, request):
+        # Lo que pinta Docencia.__str__ en cada fila
+        return (
+            super()
+            .get_queryset(request)
+            .select_related("profesor", "modulo__ciclo", "grupo")
+        )
+
     def get_formset(self, request, obj=None, **kwargs):
         # Store the parent object (modulo) for use in formfield_for_foreignkey
         self.parent_obj = obj
@@ -70,14 +131,23 @@ class GrupoInline(admin.TabularInline):
     extra = 1
 
 
+def anotar_num_unidades(modulos):
+    """Añade a cada módulo su número de unidades de trabajo, en la misma consulta"""
+    return modulos.annotate(num_unidades=Count("unidades_de_temario"))
+
+
 class ModuloInline(admin.TabularInline):
     model = Modulo
     extra = 1
     fields = ["nombre", "curso", "unidad_hint"]
     readonly_fields = ["unidad_hint"]
 
+    def get_queryset(self, request):
+        return anotar_num_unidades(super().get_queryset(request))
+
     def unidad_hint(self, instance):
-        if not instance.unidades_de_temario.exists():
+        # Las filas nuevas no tienen num_unidades y se quedan sin aviso
+        if not instance.num_unidades:
             return "⚠️ Recuerda añadir Unidades de Trabajo después de guardar el módulo."
         return "✅"
 
@@ -86,17 +156,24 @@ class ModuloInline(admin.TabularInline):
 
 @admin.register(AñoAcademico)
 class AñoAcademicoAdmin(admin.ModelAdmin):
-    list_display = ("año_academico", "actual", "get_clonar_button")
+    list_display = ("año_academico", "actual", "get_acciones")
 
-    def get_clonar_button(self, obj):
-        """Añade un botón para clonar en cada fila"""
+    def get_acciones(self, obj):
+        """Añade un botón para clonar en cada fila y otro para archivar si no es el año actual"""
         url = reverse("admin:clonar_opciones", args=[obj.año_academico])
+        if obj.actual:
+            return format_html(
+                '<a class="btn btn-primary btn-sm" href="{}">Clonar</a>',
+                url,
+            )
         return format_html(
-            '<a class="btn btn-primary btn-sm" href="{}">Clonar</a>',
+            '<a class="btn btn-primary btn-sm" href="{}">Clonar</a> '
+            '<a class="btn btn-secondary btn-sm" href="{}">Archivar</a>',
             url,
+            reverse("admin:archivar_año", args=[obj.año_academico]),
         )
 
-    get_clonar_button.short_description = "Acciones"
+    get_acciones.short_description = "Acciones"
 
     def get_urls(self):
         """Añade URLs personalizadas al admin"""
@@ -112,6 +189,31 @@ class AñoAcademicoAdmin(admin.ModelAdmin):
                 self.admin_site.admin_view(self.ejecutar_clonacion_view),
                 name="ejecutar_clonacion",
             ),
+            path(
+                "clonaciones/<int:clonacion_id>/",
+                self.admin_site.admin_view(self.progreso_clonacion_view),
+                name="progreso_clonacion",
+            ),
+            path(
+                "clonaciones/<int:clonacion_id>/cancelar/",
+                self.admin_site.admin_view(self.cancelar_clonacion_view),
+                name="cancelar_clonacion",
+            ),
+            path(
+                "<path:object_id>/purgar/",
+                self.admin_site.admin_view(self.purgar_view),
+                name="purgar_año",
+            ),
+            path(
+                "purgas/<int:purga_id>/",
+                self.admin_site.admin_view(self.progreso_purga_view),
+                name="progreso_purga",
+            ),
+            path(
+                "<path:object_id>/archivar/",
+                self.admin_site.admin_view(self.archivar_view),
+                name="archivar_año",
+            ),
         ]
         return custom_urls + urls
 
@@ -119,8 +221,14 @@ class AñoAcademicoAdmin(admin.ModelAdmin):
         """Vista que muestra el formulario con opciones de clonación"""
         try:
             año_academico = AñoAcademico.objects.get(pk=object_id)
+            # Lo que crearía la opción más completa, cada opción incluye las anteriores
+            previsualizacion, docencias_omitidas = previsualizar_clonacion(
+                año_academico, "docencias"
+            )
             context = {
                 "año_academico": año_academico,
+                "previsualizacion": previsualizacion,
+                "docencias_omitidas": docencias_omitidas,
                 "opts": self.model._meta,
                 "title": f"Clonar año académico: {año_academico}",
                 **self.admin_site.each_context(request),
@@ -155,10 +263,32 @@ class AñoAcademicoAdmin(admin.ModelAdmin):
                     reverse("admin:clonar_opciones", args=[object_id])
                 )
 
-            # Crear el nuevo año académico
-            nuevo_año = AñoAcademico(año_academico=nuevo_año_valor, actual=True)
+            # Validar que no haya ya una clonación en marcha hacia ese año,
+            # sin contar las que se han quedado colgadas
+            marcar_clonaciones_abandonadas()
+            if ClonacionAño.objects.filter(
+                nuevo_año=nuevo_año_valor,
+                estado__in=[EstadoClonacion.PENDIENTE, EstadoClonacion.EN_CURSO],
+            ).exists():
+                self.message_user(
+                    request,
+                    f"Ya hay una clonación en curso al año académico {nuevo_año_valor}",
+                    level="error",
+                )
+                return HttpResponseRedirect(
+                    reverse("admin:clonar_opciones", args=[object_id])
+                )
+
+            if opcion_clonacion not in OPCIONES_CLONACION:
+                self.message_user(
+                    request, "Opción de clonación no válida", level="error"
+                )
+                return HttpResponseRedirect(
+                    reverse("admin:clonar_opciones", args=[object_id])
+                )
+
             try:
-                nuevo_año.full_clean()
+                AñoAcademico(año_academico=nuevo_año_valor).full_clean()
             except ValidationError as err:
                 self.message_user(
                     request,
@@ -168,25 +298,16 @@ class AñoAcademicoAdmin(admin.ModelAdmin):
                 return HttpResponseRedirect(
                     reverse("admin:clonar_opciones", args=[object_id])
                 )
-            else:
-                nuevo_año.save()
-
-            # Lógica de clonación según la opción seleccionada
-            if opcion_clonacion == "ciclos":
-                self.clonar_ciclos(año_academico_original, nuevo_año)
-                mensaje = f"Ciclos clonados al año académico {nuevo_año_valor}"
-            elif opcion_clonacion == "modulos":
-                self.clonar_modulos_y_grupos(año_academico_original, nuevo_año)
-                mensaje = (
-                    f"Ciclos y módulos clonados al año académico {nuevo_año_valor}"
-                )
-            elif opcion_clonacion == "docencias":
-                self.clonar_docencias(año_academico_original, nuevo_año)
-                mensaje = f"Ciclos, módulos y docencias clonados al año académico {nuevo_año_valor}"
 
-            self.message_user(request, mensaje)
+            # La clonación sigue en segundo plano y se consulta en su página de progreso
+            clonacion = ClonacionAño.objects.create(
+                año_original=año_academico_original,
+                nuevo_año=nuevo_año_valor,
+                opcion=opcion_clonacion,
+            )
+            lanzar_clonacion(clonacion)
             return HttpResponseRedirect(
-                reverse("admin:seguimientos_añoacademico_changelist")
+                reverse("admin:progreso_clonacion", args=[clonacion.pk])
             )
 
         except AñoAcademico.DoesNotExist:
@@ -202,82 +323,217 @@ class AñoAcademicoAdmin(admin.ModelAdmin):
                 reverse("admin:clonar_opciones", args=[object_id])
             )
 
-    def clonar_ciclos(self, año_original, año_nuevo):
-        """Clona los ciclos del año original al año nuevo"""
-        ciclos_mapeados = {}
-        ciclos_originales = Ciclo.objects.filter(año_academico=año_original)
-
-        for ciclo in ciclos_originales:
-            nuevo_ciclo = Ciclo.objects.create(
-                nombre=ciclo.nombre, año_academico=año_nuevo
+    def get_actions(self, request):
+        # El borrado en bloque de Django carga todo el año en memoria
+        actions = super().get_actions(request)
+        actions.pop("delete_selected", None)
+        return actions
+
+    def delete_view(self, request, object_id, extra_context=None):
+        """El borrado de un año se hace siempre con la purga"""
+        return HttpResponseRedirect(reverse("admin:purgar_año", args=[object_id]))
+
+    def purgar_view(self, request, object_id):
+        """Vista que confirma el borrado de un año con los recuentos y lo ejecuta"""
+        if not self.has_delete_permission(request):
+            raise PermissionDenied
+        año_academico = get_object_or_404(AñoAcademico, pk=object_id)
+
+        if request.method == "POST":
+            if request.POST.get("en_segundo_plano"):
+                # El borrado sigue en segundo plano y se consulta en su página de progreso
+                purga = PurgaAño.objects.create(año_academico=año_academico.pk)
+                lanzar_purga(purga)
+                return HttpResponseRedirect(
+                    reverse("admin:progreso_purga", args=[purga.pk])
+                )
+            borradas = purgar_año_academico(año_academico)
+            self.message_user(
+                request,
+                f"Año académico {año_academico} borrado junto con "
+                f"{sum(borradas.values())} filas relacionadas",
             )
-            ciclos_mapeados[ciclo.id] = nuevo_ciclo
-
-        return ciclos_mapeados
-
-    def clonar_modulos_y_grupos(self, año_original, año_nuevo):
-        """Clona ciclos y módulos"""
-        ciclos_mapeados = self.clonar_ciclos(año_original, año_nuevo)
-        modulos_mapeados = {}
-        grupos_mapeados = {}
-        # Clonar módulos
-        modulos_originales = Modulo.objects.filter(ciclo__año_academico=año_original)
-        for modulo in modulos_originales:
-            nuevo_modulo = Modulo.objects.create(
-                nombre=modulo.nombre,
-                curso=modulo.curso,
-                ciclo=ciclos_mapeados[modulo.ciclo_id],
+            return HttpResponseRedirect(
+                reverse("admin:seguimientos_añoacademico_changelist")
             )
-            modulos_mapeados[modulo.id] = nuevo_modulo
-
-            # Clonar unidades de trabajo para cada módulo
-            unidades = UnidadDeTrabajo.objects.filter(modulo=modulo)
-            for unidad in unidades:
-                UnidadDeTrabajo.objects.create(
-                    numero_tema=unidad.numero_tema,
-                    titulo=unidad.titulo,
-                    modulo=nuevo_modulo,
-                )
 
-        # Clonar grupos
-        for ciclo_original_id, ciclo_nuevo in ciclos_mapeados.items():
-            grupos = Grupo.objects.filter(ciclo_id=ciclo_original_id)
-            for grupo in grupos:
-                grupo_nuevo = Grupo.objects.create(
-                    nombre=grupo.nombre, ciclo=ciclo_nuevo, curso=grupo.curso
+        context = {
+            "año_academico": año_academico,
+            "recuentos": contar_año(año_academico),
+            "opts": self.model._meta,
+            "title": f"Borrar año académico: {año_academico}",
+            **self.admin_site.each_context(request),
+        }
+        return render(request, "admin/purgar_año.html", context)
+
+    def progreso_purga_view(self, request, purga_id):
+        """Vista que muestra el progreso y el resultado de un borrado en segundo plano"""
+        if not self.has_delete_permission(request):
+            raise PermissionDenied
+        purga = get_object_or_404(PurgaAño, pk=purga_id)
+        context = {
+            "purga": purga,
+            "opts": self.model._meta,
+            "title": str(purga),
+            **self.admin_site.each_context(request),
+        }
+        return render(request, "admin/progreso_purga.html", context)
+
+    def archivar_view(self, request, object_id):
+        """
+        Vista que confirma el archivo de un año con los recuentos de lo que
+        sale de las tablas de trabajo y lo ejecuta
+        """
+        if not self.has_delete_permission(request):
+            raise PermissionDenied
+        año_academico = get_object_or_404(AñoAcademico, pk=object_id)
+
+        if request.method == "POST":
+            try:
+                archivado = archivar_año(año_academico)
+            except ValidationError as err:
+                self.message_user(request, err.messages[0], level="error")
+                return HttpResponseRedirect(
+                    reverse("admin:seguimientos_añoacademico_changelist")
                 )
-                grupos_mapeados[grupo.id] = grupo_nuevo
+            self.message_user(
+                request,
+                f"Año académico {archivado} archivado con "
+                f"{archivado.num_seguimientos} seguimientos",
+            )
+            return HttpResponseRedirect(
+                reverse("admin:seguimientos_añoarchivado_change", args=[archivado.pk])
+            )
 
-        return modulos_mapeados, grupos_mapeados
+        context = {
+            "año_academico": año_academico,
+            "recuentos": contar_año(año_academico),
+            "opts": self.model._meta,
+            "title": f"Archivar año académico: {año_academico}",
+            **self.admin_site.each_context(request),
+        }
+        return render(request, "admin/archivar_año.html", context)
 
-    def clonar_docencias(self, año_original, año_nuevo):
-        """Clona ciclos, módulos y docencias"""
-        modulos_mapeados, grupos_mapeados = self.clonar_modulos_y_grupos(
-            año_original, año_nuevo
+    def progreso_clonacion_view(self, request, clonacion_id):
+        """Vista que muestra el progreso y el resultado de una clonación"""
+        marcar_clonaciones_abandonadas()
+        clonacion = get_object_or_404(ClonacionAño, pk=clonacion_id)
+        context = {
+            "clonacion": clonacion,
+            "opts": self.model._meta,
+            "title": str(clonacion),
+            **self.admin_site.each_context(request),
+        }
+        return render(request, "admin/progreso_clonacion.html", context)
+
+    def cancelar_clonacion_view(self, request, clonacion_id):
+        """Vista que pide cancelar una clonación en marcha"""
+        if request.method == "POST":
+            ClonacionAño.objects.filter(
+                pk=clonacion_id,
+                estado__in=[EstadoClonacion.PENDIENTE, EstadoClonacion.EN_CURSO],
+            ).update(cancelacion_solicitada=True)
+            self.message_user(
+                request,
+                "Se ha pedido cancelar la clonación, se deshará al terminar el paso actual",
+            )
+        return HttpResponseRedirect(
+            reverse("admin:progreso_clonacion", args=[clonacion_id])
         )
 
-        # Clonar docencias
-        docencias = Docencia.objects.filter(modulo__ciclo__año_academico=año_original)
 
-        for docencia in docencias:
-            if (
-                docencia.modulo_id in modulos_mapeados
-                and docencia.grupo_id in grupos_mapeados
-            ):
-                try:
-                    Docencia.objects.create(
-                        profesor=docencia.profesor,
-                        grupo=grupos_mapeados[docencia.grupo_id],
-                        modulo=modulos_mapeados[docencia.modulo_id],
-                    )
-                except Exception:
-                    # Ignora errores de clave única si ya existe una docencia similar
-                    pass
+@admin.register(AñoArchivado)
+class AñoArchivadoAdmin(admin.ModelAdmin):
+    """
+    Años archivados, de solo lectura. Los seguimientos se muestran desde la
+    copia comprimida del año y se pueden descargar tal cual.
+    """
+
+    list_display = (
+        "año_academico",
+        "archivado",
+        "num_seguimientos",
+        "get_descargar_button",
+    )
+    fields = ("año_academico", "archivado", "num_seguimientos", "seguimientos")
+    readonly_fields = fields
+
+    def get_queryset(self, request):
+        # La copia solo se lee al ver un año, no en el listado
+        return super().get_queryset(request).defer("datos")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_descargar_button(self, obj):
+        """Añade un botón para descargar la copia en cada fila"""
+        return format_html(
+            '<a class="btn btn-secondary btn-sm" href="{}">Descargar</a>',
+            reverse("admin:descargar_año_archivado", args=[obj.pk]),
+        )
+
+    get_descargar_button.short_description = "Acciones"
+
+    @admin.display(description="Seguimientos")
+    def seguimientos(self, obj):
+        """Tabla con los seguimientos archivados del año"""
+        filas = format_html_join(
+            "\n",
+            "<tr>" + "<td>{}</td>" * 9 + "</tr>",
+            (
+                (
+                    registro["ciclo"],
+                    registro["grupo"],
+                    registro["modulo"],
+                    registro["profesor"],
+                    calendar.month_name[registro["mes"]].capitalize(),
+                    registro["evaluacion"].capitalize(),
+                    registro["temario_actual"],
+                    EstadoSeguimiento(registro["estado"]).label,
+                    "Sí" if registro["cumple_programacion"] else "No",
+                )
+                for registro in leer_seguimientos(obj)
+            ),
+        )
+        return format_html(
+            '<table class="table table-sm"><thead><tr><th>Ciclo</th><th>Grupo</th>'
+            "<th>Módulo</th><th>Profesor</th><th>Mes</th><th>Evaluación</th>"
+            "<th>Temario alcanzado</th><th>Estado</th><th>Cumple programación</th>"
+            "</tr></thead><tbody>{}</tbody></table>",
+            filas,
+        )
+
+    def get_urls(self):
+        """Añade URLs personalizadas al admin"""
+        urls = super().get_urls()
+        custom_urls = [
+            path(
+                "<path:object_id>/descargar/",
+                self.admin_site.admin_view(self.descargar_view),
+                name="descargar_año_archivado",
+            ),
+        ]
+        return custom_urls + urls
+
+    def descargar_view(self, request, object_id):
+        """Descarga la copia del año como JSON por líneas comprimido con gzip"""
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        archivado = get_object_or_404(AñoArchivado, pk=object_id)
+        response = HttpResponse(bytes(archivado.datos), content_type="application/gzip")
+        response["Content-Disposition"] = (
+            f'attachment; filename="seguimientos_{archivado.pk}.jsonl.gz"'
+        )
+        return response
 
 
 @admin.register(Ciclo)
 class CicloAdmin(admin.ModelAdmin):
     list_display = ["nombre", "año_academico"]
+    list_select_related = ["año_academico"]
     search_fields = ["nombre", "año_academico__año_academico"]
     list_filter = [CicloAñoAcademicoFilter]
     inlines = [GrupoInline, ModuloInline]
@@ -286,11 +542,15 @@ class CicloAdmin(admin.ModelAdmin):
         super().save_related(request, form, formsets, change)
 
         ciclo = form.instance
-        modulos_sin_unidades = ciclo.modulos.filter(unidades_de_temario__isnull=True)
+        nombres_sin_unidades = list(
+            anotar_num_unidades(ciclo.modulos.all())
+            .filter(num_unidades=0)
+            .values_list("nombre", flat=True)
+        )
         # Este código mira los modulos creados a partir de un ciclo y avisa que se tienen
         # que crear unidades de temario para que funcione correctamente
-        if modulos_sin_unidades.exists():
-            names = ", ".join(modulos_sin_unidades.values_list("nombre", flat=True))
+        if nombres_sin_unidades:
+            names = ", ".join(nombres_sin_unidades)
             messages.warning(
                 request,
                 f"Los siguientes módulos no tienen Unidades de Trabajo: {names}. "
@@ -327,18 +587,23 @@ class UnidadDeTrabajoInline(admin.TabularInline):
 @admin.register(Grupo)
 class GrupoAdmin(admin.ModelAdmin):
     list_display = ["nombre", "ciclo", "curso"]
+    list_select_related = ["ciclo"]
     list_filter = [GrupoAndModuloAñoAcademicoFilter, "ciclo", "curso"]
     search_fields = ["nombre", "ciclo__nombre"]
 
 
 @admin.register(Modulo)
-class ModuloAdmin(admin.ModelAdmin):
+class ModuloAdmin(BusquedaTextoMixin, admin.ModelAdmin):
     list_display = [
         "nombre",
         "curso",
         "año_academico",
         "ciclo",
     ]
+    list_select_related = ["ciclo__año_academico"]
+    # Recuento estimado en listados grandes y sin el recuento total de "Mostrar todo"
+    paginator = PaginadorConteoEstimado
+    show_full_result_count = False
     list_filter = [
         GrupoAndModuloAñoAcademicoFilter,
         "ciclo",
@@ -349,14 +614,25 @@ class ModuloAdmin(admin.ModelAdmin):
 
 
 @admin.register(UnidadDeTrabajo)
-class UnidadDeTrabajoAdmin(admin.ModelAdmin):
+class UnidadDeTrabajoAdmin(AutocompleteFilterMixin, admin.ModelAdmin):
     list_display = [
         "numero_tema",
         "titulo",
         "modulo",
         "año_academico",
     ]
-    list_filter = ["modulo"]
+    list_select_related = ["modulo__ciclo__año_academico"]
+
+    class ModuloFilter(AutocompleteFilter):
+        title = "módulo"
+        parameter_name = "modulo"
+        model = Modulo
+        search_fields = ["nombre", "ciclo__nombre"]
+        select_related = ["ciclo"]
+        # Este listado no tiene filtro de año, se busca entre todos
+        default_to_current_year = False
+
+    list_filter = [ModuloFilter]
     search_fields = ["titulo", "modulo__nombre"]
 
     def get_model_perms(self, request):
@@ -400,7 +676,7 @@ class ProfesorForm(ModelForm):
         return instance
 
 
-class ProfesorAdmin(admin.ModelAdmin):
+class ProfesorAdmin(BusquedaTextoMixin, admin.ModelAdmin):
     form = ProfesorForm
     list_display = ["nombre", "email", "activo", "es_admin"]
     list_filter = ["activo", "is_admin"]
@@ -424,22 +700,38 @@ admin.site.register(Profesor, ProfesorAdmin)
 
 
 @admin.register(Docencia)
-class DocenciaAdmin(admin.ModelAdmin):
+class DocenciaAdmin(BusquedaTextoMixin, AutocompleteFilterMixin, admin.ModelAdmin):
     list_display = ["profesor", "modulo", "grupo", "get_año_academico"]
-    list_filter = ["modulo__ciclo__año_academico", "grupo"]
+    list_select_related = ["profesor", "modulo__ciclo", "grupo__ciclo"]
+    paginator = PaginadorConteoEstimado
+    show_full_result_count = False
+
+    class GrupoFilter(AutocompleteFilter):
+        title = "grupo"
+        parameter_name = "grupo"
+        model = Grupo
+        search_fields = ["nombre", "ciclo__nombre"]
+        select_related = ["ciclo"]
+        year_lookup = "ciclo__año_academico"
+        # Parámetro del filtro de año de este listado, que por defecto muestra todos
+        year_parameter = "año_academico__año_academico__exact"
+        default_to_current_year = False
+
+    list_filter = ["año_academico", GrupoFilter]
     search_fields = [
         "profesor__nombre",
         "modulo__nombre",
-        "modulo__ciclo__año_academico__año_academico",
+        "año_academico__año_academico",
         "grupo__nombre",
     ]
     autocomplete_fields = ["profesor", "grupo", "modulo"]
 
     def get_año_academico(self, obj):
-        return obj.año_academico
+        # El id del año es el propio año, así no hace falta cargarlo
+        return obj.año_academico_id
 
     get_año_academico.short_description = "Año Académico"
-    get_año_academico.admin_order_field = "modulo__ciclo__año_academico"
+    get_año_academico.admin_order_field = "año_academico"
 
     def get_model_perms(self, request):
         """
@@ -469,6 +761,8 @@ class SeguimientoResource(resources.ModelResource):
 
     class Meta:
         model = Seguimiento
+        # Filas que se leen de la base de datos en cada viaje al exportar
+        chunk_size = 2000
         fields = [
             "profesor",
             "ciclo",
@@ -487,6 +781,23 @@ class SeguimientoResource(resources.ModelResource):
             "justificacion_cumple_programacion",
         ]
 
+    def filter_export(self, queryset, **kwargs):
+        # Carga de una vez todo lo que se exporta de cada seguimiento
+        return queryset.select_related(
+            "docencia__profesor",
+            "docencia__grupo",
+            "docencia__modulo__ciclo",
+            "temario_actual",
+        )
+
+    def iter_queryset(self, queryset):
+        # Se recorre con iterator() en vez de paginar con OFFSET como hace import_export
+        # por defecto, y las unidades completadas se cargan con una consulta por lote
+        yield from recorrer_con_unidades_completadas(
+            queryset.iterator(chunk_size=self.get_chunk_size()),
+            self.get_chunk_size(),
+        )
+
     def dehydrate_mes(self, obj):
         return calendar.month_name[obj.mes].capitalize()
 
@@ -504,7 +815,7 @@ class SeguimientoResource(resources.ModelResource):
         )
 
     def dehydrate_temario_completado(self, obj):
-        return ";".join([str(unidad) for unidad in obj.temario_completado.all()])
+        return ";".join([str(unidad) for unidad in obj.unidades_completadas])
 
 
 class SeguimientoForm(forms.ModelForm):
@@ -512,6 +823,23 @@ class SeguimientoForm(forms.ModelForm):
     Form to show only Unidades de Trabajo from the selected docencia in a Seguimiento
     """
 
+    # Se guardan los ids de las unidades, ordenados por número de tema
+    temario_completado = forms.ModelMultipleChoiceField(
+        queryset=UnidadDeTrabajo.objects.all(),
+        required=False,
+        label="Temario completado",
+        widget=autocomplete.ModelSelect2Multiple(
+            url="/admin/seguimientos/seguimiento/temario-autocomplete",
+            forward=["docencia"],
+        ),
+    )
+
+    def clean_temario_completado(self):
+        unidades = sorted(
+            self.cleaned_data["temario_completado"], key=lambda u: u.numero_tema
+        )
+        return [unidad.pk for unidad in unidades]
+
     class Meta:
         model = Seguimiento
         fields = "__all__"
@@ -523,54 +851,14 @@ class SeguimientoForm(forms.ModelForm):
         }
 
 
-# Create an inline for UnidadDeTrabajo within the Seguimiento admin
-class TemarioCompletadoInline(admin.TabularInline):
-    """
-    Inline for temario completado, a list of Unidades de trabajo that were completed in the seguimiento
-    """
-
-    class TemarioCompletadoInlineForm(forms.ModelForm):
-        class Meta:
-            model = Seguimiento.temario_completado.through
-            fields = "__all__"
-
-        def __init__(self, *args, **kwargs):
-            super().__init__(*args, **kwargs)
-            self.fields["unidaddetrabajo"].label = "Unidad de Trabajo"
-
-    model = Seguimiento.temario_completado.through  # Use the through model
-    extra = 1
-    form = TemarioCompletadoInlineForm
-    verbose_name = "Temario Completado"
-    verbose_name_plural = "Temarios Completados"
-    ordering = ("unidaddetrabajo__numero_tema",)
-
-    def formfield_for_foreignkey(self, db_field, request, **kwargs):
-        # Filter temario based on docencia's modulo
-        if (
-            db_field.name == "unidaddetrabajo"
-            and hasattr(self, "parent_obj")
-            and self.parent_obj
-        ):
-            kwargs["queryset"] = UnidadDeTrabajo.objects.filter(
-                modulo=self.parent_obj.docencia.modulo
-            )
-        return super().formfield_for_foreignkey(db_field, request, **kwargs)
-
-    def get_formset(self, request, obj=None, **kwargs):
-        # Store the parent object (modulo) for use in formfield_for_foreignkey
-        self.parent_obj = obj
-        formset = super().get_formset(request, obj, **kwargs)
-        # Remove buttons to edit, add or view unidades de trabajos
-        formset.form.base_fields["unidaddetrabajo"].widget.can_add_related = False
-        formset.form.base_fields["unidaddetrabajo"].widget.can_change_related = False
-        formset.form.base_fields["unidaddetrabajo"].widget.can_view_related = False
-
-        return formset
-
-
 @admin.register(Seguimiento)
-class SeguimientoAdmin(ExportMixin, admin.ModelAdmin):
+class SeguimientoAdmin(
+    BusquedaTextoMixin,
+    AutocompleteFilterMixin,
+    StreamingExportMixin,
+    ExportMixin,
+    admin.ModelAdmin,
+):
     form = SeguimientoForm
     list_display = [
         "docencia",
@@ -578,31 +866,31 @@ class SeguimientoAdmin(ExportMixin, admin.ModelAdmin):
         "get_estado_colored",
         "cumple_programacion",
     ]
-    inlines = [TemarioCompletadoInline]
+    # Lo que pinta Docencia.__str__ en la columna docencia
+    list_select_related = [
+        "docencia__profesor",
+        "docencia__modulo__ciclo",
+        "docencia__grupo",
+    ]
+    paginator = PaginadorConteoEstimado
+    show_full_result_count = False
 
-    # Custom filter for Modulo that depends on año_academico
-    class ModuloFilter(SimpleListFilter):
+    # Filtros de módulo y profesor que buscan en el servidor dentro del año seleccionado
+    class ModuloFilter(AutocompleteFilter):
         title = "módulo"
         parameter_name = "docencia__modulo"
-
-        def lookups(self, request, model_admin):
-            # Get the current año_academico filter value from the request
-            año_academico = request.GET.get("año_academico", None)
-
-            # Filter modules based on the selected año_academico
-            if año_academico:
-                modulos = Modulo.objects.filter(
-                    ciclo__año_academico=año_academico
-                ).distinct()
-            else:
-                modulos = Modulo.objects.all().distinct()
-
-            return [(modulo.id, modulo) for modulo in modulos]
-
-        def queryset(self, request, queryset):
-            if self.value():
-                return queryset.filter(docencia__modulo=self.value())
-            return queryset
+        model = Modulo
+        search_fields = ["nombre", "ciclo__nombre"]
+        select_related = ["ciclo"]
+        year_lookup = "ciclo__año_academico"
+
+    class ProfesorFilter(AutocompleteFilter):
+        title = "profesor"
+        parameter_name = "docencia__profesor"
+        model = Profesor
+        search_fields = ["nombre", "email"]
+        ordering = ["nombre"]
+        year_lookup = "docencias__año_academico"
 
     class MesFilter(SimpleListFilter):
         title = "mes"
@@ -622,13 +910,13 @@ class SeguimientoAdmin(ExportMixin, admin.ModelAdmin):
         BaseAñoAcademicoFilter,
         MesFilter,
         ModuloFilter,
-        "docencia__profesor",
+        ProfesorFilter,
     ]
     search_fields = [
         "docencia__profesor__nombre",
         "docencia__modulo__nombre",
         "docencia__grupo__nombre",
-        "docencia__modulo__ciclo__año_academico__año_academico",
+        "año_academico__año_academico",
     ]
     autocomplete_fields = ["docencia", "temario_actual"]
     resource_classes = [SeguimientoResource]
@@ -640,6 +928,7 @@ class SeguimientoAdmin(ExportMixin, admin.ModelAdmin):
                     "docencia",
                     "mes",
                     "temario_actual",
+                    "temario_completado",
                     "evaluacion",
                     "ultimo_contenido_impartido",
                 )
@@ -658,28 +947,6 @@ class SeguimientoAdmin(ExportMixin, admin.ModelAdmin):
         ),
     )
 
-    def get_queryset(self, request):
-        qs = super().get_queryset(request)
-        # Adds a calculated column to be able to order the months by academic order (Starting in september)
-        from django.db.models import Case, When, IntegerField
-
-        academic_order = Case(
-            When(mes=9, then=1),  # Septiembre
-            When(mes=10, then=2),  # Octubre
-            When(mes=11, then=3),  # Noviembre
-            When(mes=12, then=4),  # Diciembre
-            When(mes=1, then=5),  # Enero
-            When(mes=2, then=6),  # Febrero
-            When(mes=3, then=7),  # Marzo
-            When(mes=4, then=8),  # Abril
-            When(mes=5, then=9),  # Mayo
-            When(mes=6, then=10),  # Junio
-            When(mes=7, then=11),  # Julio
-            When(mes=8, then=12),  # Agosto
-            output_field=IntegerField(),
-        )
-        return qs.annotate(academic_month_order=academic_order)
-
     def get_estado_colored(self, obj):
         colors = {"ATRASADO": "red", "AL_DIA": "green", "ADELANTADO": "blue"}
         return format_html(
@@ -695,7 +962,7 @@ class SeguimientoAdmin(ExportMixin, admin.ModelAdmin):
         return calendar.month_name[obj.mes].capitalize()
 
     get_mes.short_description = "Mes"
-    get_mes.admin_order_field = "academic_month_order"
+    get_mes.admin_order_field = "orden_mes_academico"
 
     def get_form(self, request, obj=None, **kwargs):
         form = super(SeguimientoAdmin, self).get_form(request, obj, **kwargs)
@@ -715,21 +982,27 @@ class SeguimientoAdmin(ExportMixin, admin.ModelAdmin):
 
     class TemarioAutocomplete(autocomplete.Select2QuerySetView):
         def get_queryset(self):
-            qs = UnidadDeTrabajo.objects.all().order_by("numero_tema")
-
             # Get the docencia from the forwarded value
             docencia = self.forwarded.get("docencia", None)
-            if docencia:
-                try:
-                    # Filter by the selected docencia's modulo
-                    docencia_obj = Docencia.objects.get(pk=docencia)
-                    qs = qs.filter(modulo=docencia_obj.modulo)
-                except Docencia.DoesNotExist:
-                    return UnidadDeTrabajo.objects.none()
-            else:
+            if not docencia:
                 return UnidadDeTrabajo.objects.none()
+            modulo_id = get_modulo_de_docencia(docencia)
+            if modulo_id is None:
+                return UnidadDeTrabajo.objects.none()
+
+            # El temario del módulo suele ser corto, se filtra en memoria
+            temario = get_temario_modulo(modulo_id)
+            if temario is not None:
+                if self.q:
+                    q = self.q.casefold()
+                    temario = [u for u in temario if q in u.titulo.casefold()]
+                return temario
 
+            qs = UnidadDeTrabajo.objects.filter(modulo_id=modulo_id).order_by(
+                "numero_tema"
+            )
             if self.q:
+                # UPPER(titulo) LIKE '%...%', lo resuelve el índice de trigramas
                 qs = qs.filter(titulo__icontains=self.q)
 
             return qs
@@ -751,33 +1024,9 @@ class SeguimientoAdmin(ExportMixin, admin.ModelAdmin):
     actions = ["export_as_pdf"]
 
     def export_as_pdf(self, request, queryset):
-        # Create a context with data for the template
-        seguimientos = {}
-        queryset_list = list(queryset)
-        queryset_list.sort(key=lambda s: (str(s.año_academico), (s.mes + 3) % 12))
-        for seguimiento in queryset_list:
-            año = str(seguimiento.año_academico)
-            mes = calendar.month_name[seguimiento.mes].title()
-
-            if año not in seguimientos:
-                seguimientos[año] = {}
-
-            if mes not in seguimientos[año]:
-                seguimientos[año][mes] = []
-            seguimientos[año][mes].append(seguimiento)
-
-        context = {
-            "seguimientos": seguimientos,
-            "count": len(queryset_list),
-            "title": "Informe de Seguimientos",
-        }
-
-        # Render the template to HTML
-        html_string = render_to_string("admin/seguimiento_pdf_export.html", context)
-
-        # Generate PDF from HTML
-        html = HTML(string=html_string)
-        pdf_file = html.write_pdf()
+        # El informe se renderiza por bloques (año, mes) para acotar la memoria
+        # y se reutiliza de la caché si los seguimientos no han cambiado
+        pdf_file = obtener_informe_pdf(queryset)
 
         # Create HTTP response with appropriate PDF headers
         response = HttpResponse(pdf_file, content_type="application/pdf")
@@ -1,8 +1,11 @@
+from dal import autocomplete
+from django import forms
 from django.contrib import admin
-from .utils import get_año_academico_actual
-from .models import (
-    AñoAcademico,
-)
+from django.core.exceptions import ValidationError
+from django.urls import path, reverse
+from django.utils.http import urlencode
+
+from .utils import get_año_academico_actual, get_años_academicos
 
 
 class BaseAñoAcademicoFilter(admin.SimpleListFilter):
@@ -22,9 +25,8 @@ class BaseAñoAcademicoFilter(admin.SimpleListFilter):
     parameter_name = "año_academico"
 
     def lookups(self, request, model_admin):
-        # Get all distinct academic years
-        años_academicos = AñoAcademico.objects.all().order_by("-año_academico")
-        return [("todos", "Todos")] + [(año, año) for año in años_academicos]
+        # Get all academic years from the cache
+        return [("todos", "Todos")] + [(año, año) for año in get_años_academicos()]
 
     def choices(self, changelist):
         choices = list(super().choices(changelist))
@@ -52,23 +54,20 @@ class BaseAñoAcademicoFilter(admin.SimpleListFilter):
 
         Args:
             queryset: The original queryset to filter
-            año_academico: The AñoAcademico instance to filter by
+            año_academico: The AñoAcademico primary key, which is the year itself
 
         Returns:
             Filtered queryset
         """
-        return queryset.filter(docencia__modulo__ciclo__año_academico=año_academico)
+        return queryset.filter(año_academico=año_academico)
 
     def queryset(self, request, queryset):
         if self.value():
             if self.value() == "todos":
                 return queryset
-            # User has selected a value, get the corresponding AñoAcademico
-            try:
-                año_selected = AñoAcademico.objects.get(año_academico=self.value())
-                return self.get_filtered_queryset(queryset, año_selected)
-            except AñoAcademico.DoesNotExist:
-                return queryset
+            # User has selected a value, filter by it directly. A year that
+            # does not exist lists nothing instead of every year
+            return self.get_filtered_queryset(queryset, self.value())
         else:
             # No value selected, use current year
             año_actual = get_año_academico_actual()
@@ -88,3 +87,133 @@ class GrupoAndModuloAñoAcademicoFilter(BaseAñoAcademicoFilter):
 class CicloAñoAcademicoFilter(BaseAñoAcademicoFilter):
     def get_filtered_queryset(self, queryset, año_academico):
         return queryset.filter(año_academico=año_academico)
+
+
+class AutocompleteFilter(admin.SimpleListFilter):
+    """
+    Filter whose options are searched on the server with select2 instead of
+    being rendered in the changelist. Only the selected object is loaded, to
+    show its label, so the changelist does not grow with the related table.
+
+    parameter_name is also the lookup applied to the changelist queryset.
+    Options are scoped by the year selected in the changelist through
+    year_lookup. The ModelAdmin must inherit AutocompleteFilterMixin, which
+    registers the endpoint of each filter.
+
+    Example:
+        class ProfesorFilter(AutocompleteFilter):
+            title = "profesor"
+            parameter_name = "docencia__profesor"
+            model = Profesor
+            search_fields = ["nombre"]
+            year_lookup = "docencias__año_academico"
+    """
+
+    template = "admin/autocomplete_filter.html"
+    model = None
+    search_fields = []
+    select_related = []
+    # Needed by the pagination of the endpoint if the model has no default ordering
+    ordering = None
+    year_lookup = None
+    # Changelist parameter with the selected year
+    year_parameter = BaseAñoAcademicoFilter.parameter_name
+    # Without a selected year use the current one, as BaseAñoAcademicoFilter does
+    default_to_current_year = True
+
+    def __init__(self, request, params, model, model_admin):
+        self.year = self.get_year(request)
+        self.autocomplete_url = reverse(
+            f"admin:{autocomplete_url_name(model_admin, self.parameter_name)}"
+        )
+        if self.year:
+            self.autocomplete_url += "?" + urlencode({"year": self.year})
+        super().__init__(request, params, model, model_admin)
+
+    def get_year(self, request):
+        year = request.GET.get(self.year_parameter)
+        if year == "todos":
+            return ""
+        if not year and self.default_to_current_year:
+            return get_año_academico_actual()
+        return year or ""
+
+    @classmethod
+    def get_options(cls, year):
+        """Objects that can be selected in the filter for the given year"""
+        queryset = cls.model._default_manager.select_related(*cls.select_related)
+        if year and cls.year_lookup:
+            queryset = queryset.filter(
+                pk__in=cls.model._default_manager.filter(
+                    **{cls.year_lookup: year}
+                ).values("pk")
+            )
+        if cls.ordering:
+            queryset = queryset.order_by(*cls.ordering)
+        return queryset
+
+    def lookups(self, request, model_admin):
+        if not self.value():
+            return []
+        try:
+            selected = (
+                self.model._default_manager.select_related(*self.select_related)
+                .filter(pk=self.value())
+                .first()
+            )
+        except (ValueError, ValidationError):
+            return []
+        return [(str(selected.pk), str(selected))] if selected else []
+
+    def has_output(self):
+        return True
+
+    def choices(self, changelist):
+        for value, label in self.lookup_choices:
+            yield {"selected": True, "value": value, "display": label}
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(**{self.parameter_name: self.value()})
+        return queryset
+
+
+def autocomplete_url_name(model_admin, parameter_name):
+    opts = model_admin.model._meta
+    return f"{opts.app_label}_{opts.model_name}_{parameter_name}_autocomplete"
+
+
+class AutocompleteFilterView(autocomplete.Select2QuerySetView):
+    filter_class = None
+
+    def get_search_fields(self):
+        return self.filter_class.search_fields
+
+    def get_queryset(self):
+        options = self.filter_class.get_options(self.request.GET.get("year", ""))
+        return self.get_search_results(options, self.q)
+
+
+class AutocompleteFilterMixin:
+    """Registers the endpoints and the script of the AutocompleteFilters in list_filter"""
+
+    def get_urls(self):
+        autocomplete_urls = [
+            path(
+                f"autocomplete-filter/{list_filter.parameter_name}/",
+                self.admin_site.admin_view(
+                    AutocompleteFilterView.as_view(filter_class=list_filter)
+                ),
+                name=autocomplete_url_name(self, list_filter.parameter_name),
+            )
+            for list_filter in self.list_filter
+            if isinstance(list_filter, type)
+            and issubclass(list_filter, AutocompleteFilter)
+        ]
+        return autocomplete_urls + super().get_urls()
+
+    @property
+    def media(self):
+        return super().media + forms.Media(
+            js=["seguimientos/js/autocomplete_filter.js"]
+        )
@@ -0,0 +1,181 @@
+"""
+Archivo de años académicos cerrados.
+
+Un año cerrado ya no se modifica pero hay que poder consultarlo en las
+inspecciones. Al archivarlo sus seguimientos se guardan en un AñoArchivado
+como JSON por líneas comprimido con gzip, cada línea con todo lo que se
+muestra del seguimiento (ciclo, grupo, módulo, profesor, temario...), y el
+año se borra de las tablas de trabajo con la purga. La API y el admin leen los
+años archivados de esa copia.
+
+Se archiva todo lo que borra la purga: los seguimientos son los mismos que
+borra ella, también los de docencias de otro año con un grupo de este, y el
+resto de filas (ciclos, grupos, módulos, unidades, asignaciones y docencias,
+también las que no tienen seguimientos) se guardan tal cual en el catálogo
+del AñoArchivado. Solo se descartan las clonaciones hechas desde el año.
+"""
+
+import gzip
+import io
+import json
+from collections import defaultdict
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from .clonacion import marcar_clonaciones_abandonadas
+from .models import AñoAcademico, AñoArchivado, Docencia, EstadoClonacion, Seguimiento
+from .purga import purgar_año_academico, querysets_año
+from .utils import recorrer_con_unidades_completadas
+
+# Seguimientos que se leen de la base de datos en cada viaje al archivar
+TAMAÑO_LOTE = 2000
+# Tablas de la purga que no van al catálogo: los seguimientos tienen su propia
+# copia y las clonaciones solo son el registro de las copias hechas del año
+TABLAS_FUERA_DEL_CATALOGO = {"seguimientos", "clonaciones"}
+
+
+def registro_seguimiento(seguimiento, docentes):
+    """Diccionario con lo que se guarda del seguimiento en el archivo"""
+    docencia = seguimiento.docencia
+    return {
+        "id": seguimiento.pk,
+        "ciclo": docencia.modulo.ciclo.nombre,
+        "curso": docencia.modulo.curso,
+        "grupo": docencia.grupo.nombre,
+        "modulo": docencia.modulo.nombre,
+        "profesor": docencia.profesor.nombre,
+        "email_profesor": docencia.profesor.email,
+        # Profesores con docencia en el grupo y módulo, que podían ver el seguimiento
+        "docentes": docentes[seguimiento.asignacion_id],
+        "mes": seguimiento.mes,
+        "evaluacion": seguimiento.evaluacion,
+        "temario_actual": str(seguimiento.temario_actual),
+        "temario_completado": [
+            str(unidad) for unidad in seguimiento.unidades_completadas
+        ],
+        "ultimo_contenido_impartido": seguimiento.ultimo_contenido_impartido,
+        "estado": seguimiento.estado,
+        "justificacion_estado": seguimiento.justificacion_estado,
+        "cumple_programacion": seguimiento.cumple_programacion,
+        "motivo_no_cumple_programacion": seguimiento.motivo_no_cumple_programacion,
+        "justificacion_cumple_programacion": seguimiento.justificacion_cumple_programacion,
+    }
+
+
+def comprimir_seguimientos(año):
+    """
+    Devuelve los seguimientos que borra la purga del año como JSON por líneas
+    con gzip y cuántos son
+    """
+    seguimientos = dict(querysets_año(año))["seguimientos"]
+    docentes = defaultdict(list)
+    for asignacion, email in (
+        Docencia.objects.filter(asignacion__in=seguimientos.values("asignacion"))
+        .order_by("profesor__email")
+        .values_list("asignacion", "profesor__email")
+    ):
+        docentes[asignacion].append(email)
+
+    seguimientos = seguimientos.select_related(
+        "docencia__profesor",
+        "docencia__grupo",
+        "docencia__modulo__ciclo",
+        "temario_actual",
+    ).order_by(
+        "docencia__modulo__ciclo__nombre",
+        "docencia__grupo__nombre",
+        "docencia__modulo__nombre",
+        "orden_mes_academico",
+    )
+    datos = io.BytesIO()
+    num_seguimientos = 0
+    with gzip.GzipFile(fileobj=datos, mode="wb") as archivo:
+        for seguimiento in recorrer_con_unidades_completadas(
+            seguimientos.iterator(chunk_size=TAMAÑO_LOTE), TAMAÑO_LOTE
+        ):
+            linea = json.dumps(
+                registro_seguimiento(seguimiento, docentes), ensure_ascii=False
+            )
+            archivo.write(f"{linea}\n".encode())
+            num_seguimientos += 1
+    return datos.getvalue(), num_seguimientos
+
+
+def comprimir_catalogo(año):
+    """
+    Devuelve el resto de filas que borra la purga del año como JSON por líneas
+    con gzip, de los ciclos a las docencias, cada línea con su tabla y la fila
+    con sus campos y los ids de sus relaciones
+    """
+    datos = io.BytesIO()
+    with gzip.GzipFile(fileobj=datos, mode="wb") as archivo:
+        # La purga borra de abajo arriba, aquí se guardan de arriba abajo
+        for tabla, queryset in reversed(querysets_año(año)):
+            if tabla in TABLAS_FUERA_DEL_CATALOGO:
+                continue
+            for fila in (
+                queryset.order_by("pk").values().iterator(chunk_size=TAMAÑO_LOTE)
+            ):
+                linea = json.dumps(
+                    {"tabla": tabla, "fila": fila},
+                    cls=DjangoJSONEncoder,
+                    ensure_ascii=False,
+                )
+                archivo.write(f"{linea}\n".encode())
+    return datos.getvalue()
+
+
+@transaction.atomic
+def archivar_año(año):
+    """
+    Guarda los seguimientos y el catálogo del año en un AñoArchivado y borra
+    el año de las tablas de trabajo. El año actual no se puede archivar.
+    """
+    if AñoAcademico.objects.filter(pk=año.pk, actual=True).exists():
+        raise ValidationError("No se puede archivar el año académico actual")
+    marcar_clonaciones_abandonadas()
+    if año.clonaciones.filter(
+        estado__in=[EstadoClonacion.PENDIENTE, EstadoClonacion.EN_CURSO]
+    ).exists():
+        raise ValidationError(
+            f"Hay una clonación en curso del año académico {año}, "
+            "hay que esperar a que termine"
+        )
+    if AñoArchivado.objects.filter(pk=año.pk).exists():
+        raise ValidationError(f"El año académico {año} ya está archivado")
+
+    datos, num_seguimientos = comprimir_seguimientos(año)
+    archivado = AñoArchivado.objects.create(
+        año_academico=año.pk,
+        num_seguimientos=num_seguimientos,
+        datos=datos,
+        catalogo=comprimir_catalogo(año),
+    )
+    purgar_año_academico(año)
+    return archivado
+
+
+def leer_seguimientos(archivado, mes=None, email_docente=None):
+    """
+    Recorre los seguimientos archivados del año, opcionalmente solo los de un
+    mes o los que podía ver un profesor.
+    """
+    with gzip.GzipFile(fileobj=io.BytesIO(archivado.datos)) as archivo:
+        for linea in archivo:
+            registro = json.loads(linea)
+            if mes is not None and registro["mes"] != mes:
+                continue
+            if email_docente is not None and email_docente not in registro["docentes"]:
+                continue
+            yield registro
+
+
+def leer_catalogo(archivado, tabla):
+    """Recorre las filas archivadas de una tabla del año: ciclos, grupos, modulos..."""
+    with gzip.GzipFile(fileobj=io.BytesIO(archivado.catalogo)) as archivo:
+        for linea in archivo:
+            registro = json.loads(linea)
+            if registro["tabla"] == tabla:
+                yield registro["fila"]
@@ -0,0 +1,84 @@
+"""
+Claves de caché del catálogo: años académicos y temario.
+
+Los años académicos se guardan en la caché con la versión de su grupo, al
+incrementarla quedan todas sus claves invalidadas a la vez sin tener que
+conocer cada una. El temario de cada módulo y el módulo de cada docencia
+tienen su propia clave y se invalida solo la del que cambia.
+Está aparte de utils para poder usarse desde los modelos.
+
+La caché tiene que ser compartida por todos los procesos (ver CACHES en
+settings): con una caché local cada proceso solo ve sus propias invalidaciones.
+"""
+
+from django.core.cache import cache
+from django.db import transaction
+
+CLAVE_VERSION_AÑOS = "años_academicos_version"
+
+
+def version_cache(clave_version):
+    """Versión actual de las claves de caché que dependen de clave_version"""
+    version = cache.get(clave_version)
+    if version is None:
+        cache.add(clave_version, 1, None)
+        version = cache.get(clave_version, 1)
+    return version
+
+
+def invalidar_version(clave_version):
+    """
+    Incrementa la versión ya y otra vez al confirmar la transacción, por si
+    otra petición ha vuelto a guardar los datos antiguos mientras tanto.
+    """
+    _incrementar_version(clave_version)
+    transaction.on_commit(lambda: _incrementar_version(clave_version))
+
+
+def version_cache_años():
+    """Versión actual de las claves de caché de los años académicos"""
+    return version_cache(CLAVE_VERSION_AÑOS)
+
+
+def invalidar_cache_años():
+    """Se llama siempre que se crea, modifica o borra un año académico"""
+    invalidar_version(CLAVE_VERSION_AÑOS)
+
+
+def clave_temario(modulo_id):
+    """Clave de caché del temario del módulo"""
+    return f"temario_modulo:{modulo_id}"
+
+
+def clave_modulo_docencia(docencia_id):
+    """Clave de caché del id del módulo de la docencia"""
+    return f"docencia_modulo:{docencia_id}"
+
+
+def invalidar_claves(claves):
+    """
+    Borra las claves ya y otra vez al confirmar la transacción, por si otra
+    petición ha vuelto a guardar los datos antiguos mientras tanto.
+    """
+    claves = list(claves)
+    if not claves:
+        return
+    cache.delete_many(claves)
+    transaction.on_commit(lambda: cache.delete_many(claves))
+
+
+def invalidar_cache_temario(*modulo_ids):
+    """Se llama siempre que se crea, modifica o borra una unidad de los módulos"""
+    invalidar_claves(clave_temario(modulo_id) for modulo_id in modulo_ids)
+
+
+def invalidar_cache_docencias(*docencia_ids):
+    """Se llama siempre que una docencia cambia de módulo o se borra"""
+    invalidar_claves(clave_modulo_docencia(docencia_id) for docencia_id in docencia_ids)
+
+
+def _incrementar_version(clave_version):
+    try:
+        cache.incr(clave_version)
+    except ValueError:
+        cache.add(clave_version, 2, None)
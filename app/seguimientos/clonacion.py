@@ -0,0 +1,327 @@
+"""
+Clonación de un año académico en otro nuevo.
+
+Cada nivel del año original (ciclos, módulos, unidades de trabajo, grupos y
+docencias) se lee con una sola consulta y se escribe con un solo bulk_create,
+usando las claves que devuelve la base de datos para traducir las relaciones
+del nivel siguiente. Todo ocurre en una transacción, si algo falla no queda
+ningún año a medias.
+
+La clonación se puede lanzar en segundo plano con un ClonacionAño, que guarda
+el progreso por entidad y permite cancelarla entre un nivel y el siguiente.
+El progreso se escribe por la conexión "progreso", fuera de la transacción de
+la clonación, y cada escritura renueva ClonacionAño.actualizada. Si el hilo
+muere la clonación deja de actualizarse y se marca con error pasados
+CLONACION_MINUTOS_SIN_PROGRESO, para que no bloquee otra al mismo año.
+"""
+
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import (
+    Asignacion,
+    AñoAcademico,
+    Ciclo,
+    ClonacionAño,
+    Docencia,
+    EstadoClonacion,
+    Grupo,
+    Modulo,
+    UnidadDeTrabajo,
+)
+
+# Cada opción incluye las anteriores
+OPCIONES_CLONACION = ["ciclos", "modulos", "docencias"]
+
+BATCH_SIZE = 1000
+
+MENSAJES_CLONACION = {
+    "ciclos": "Ciclos clonados al año académico {}",
+    "modulos": "Ciclos y módulos clonados al año académico {}",
+    "docencias": "Ciclos, módulos y docencias clonados al año académico {}",
+}
+
+
+class ClonacionCancelada(Exception):
+    pass
+
+
+@transaction.atomic
+def clonar_año_academico(
+    año_original, nuevo_año_valor, opcion_clonacion, al_avanzar=None
+):
+    """
+    Crea el año nuevo como año actual y clona en él lo que indique la opción.
+
+    Lanza ValidationError si el año nuevo no es válido. Devuelve el año creado
+    y un resumen con el número de filas copiadas de cada entidad.
+    al_avanzar(resumen) se llama tras clonar cada entidad, si lanza una
+    excepción se deshace toda la clonación.
+    """
+    if opcion_clonacion not in OPCIONES_CLONACION:
+        raise ValueError(f"Opción de clonación no válida: {opcion_clonacion}")
+    nivel = OPCIONES_CLONACION.index(opcion_clonacion)
+
+    nuevo_año = AñoAcademico(año_academico=nuevo_año_valor, actual=True)
+    nuevo_año.full_clean()
+    nuevo_año.save()
+
+    resumen = {}
+
+    def avanzar(entidad, filas):
+        resumen[entidad] = filas
+        if al_avanzar:
+            al_avanzar(dict(resumen))
+
+    ciclos = clonar_ciclos(año_original, nuevo_año)
+    avanzar("ciclos", len(ciclos))
+    if nivel >= 1:
+        modulos = clonar_modulos(año_original, ciclos)
+        avanzar("modulos", len(modulos))
+        avanzar("unidades", clonar_unidades(año_original, modulos))
+        grupos = clonar_grupos(año_original, ciclos)
+        avanzar("grupos", len(grupos))
+    if nivel >= 2:
+        avanzar("docencias", clonar_docencias(año_original, nuevo_año, modulos, grupos))
+    return nuevo_año, resumen
+
+
+def previsualizar_clonacion(año_original, opcion_clonacion):
+    """
+    Simula la clonación sin escribir nada, con una consulta de recuento por
+    entidad. Devuelve las filas que se crearían de cada entidad y cuántas
+    docencias se quedarían sin clonar porque su grupo es de otro año.
+    """
+    if opcion_clonacion not in OPCIONES_CLONACION:
+        raise ValueError(f"Opción de clonación no válida: {opcion_clonacion}")
+    nivel = OPCIONES_CLONACION.index(opcion_clonacion)
+
+    previsualizacion = {
+        "ciclos": Ciclo.objects.filter(año_academico=año_original).count()
+    }
+    if nivel >= 1:
+        previsualizacion["modulos"] = Modulo.objects.filter(
+            ciclo__año_academico=año_original
+        ).count()
+        previsualizacion["unidades"] = UnidadDeTrabajo.objects.filter(
+            modulo__ciclo__año_academico=año_original
+        ).count()
+        previsualizacion["grupos"] = Grupo.objects.filter(
+            ciclo__año_academico=año_original
+        ).count()
+    omitidas = 0
+    if nivel >= 2:
+        docencias = Docencia.objects.filter(año_academico=año_original).aggregate(
+            total=Count("pk"),
+            clonables=Count("pk", filter=Q(grupo__ciclo__año_academico=año_original)),
+        )
+        previsualizacion["docencias"] = docencias["clonables"]
+        omitidas = docencias["total"] - docencias["clonables"]
+    return previsualizacion, omitidas
+
+
+def _mapear(originales, nuevos):
+    """Relaciona el id de cada original con el id de su copia"""
+    return {original.id: nuevo.id for original, nuevo in zip(originales, nuevos)}
+
+
+def clonar_ciclos(año_original, año_nuevo):
+    """Clona los ciclos y devuelve {id original: id nuevo}"""
+    originales = list(
+        Ciclo.objects.filter(año_academico=año_original)
+        .only("id", "nombre")
+        .order_by("pk")
+    )
+    nuevos = Ciclo.objects.bulk_create(
+        [Ciclo(nombre=ciclo.nombre, año_academico=año_nuevo) for ciclo in originales],
+        batch_size=BATCH_SIZE,
+    )
+    return _mapear(originales, nuevos)
+
+
+def clonar_modulos(año_original, ciclos):
+    """Clona los módulos de los ciclos clonados y devuelve {id original: id nuevo}"""
+    originales = list(
+        Modulo.objects.filter(ciclo__año_academico=año_original)
+        .only("id", "nombre", "curso", "ciclo_id")
+        .order_by("pk")
+    )
+    nuevos = Modulo.objects.bulk_create(
+        [
+            Modulo(
+                nombre=modulo.nombre,
+                curso=modulo.curso,
+                ciclo_id=ciclos[modulo.ciclo_id],
+            )
+            for modulo in originales
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    return _mapear(originales, nuevos)
+
+
+def clonar_unidades(año_original, modulos):
+    """Clona las unidades de trabajo de los módulos clonados y devuelve cuántas"""
+    unidades = UnidadDeTrabajo.objects.filter(
+        modulo__ciclo__año_academico=año_original
+    ).values_list("numero_tema", "titulo", "modulo_id")
+    nuevas = UnidadDeTrabajo.objects.bulk_create(
+        [
+            UnidadDeTrabajo(
+                numero_tema=numero_tema, titulo=titulo, modulo_id=modulos[modulo_id]
+            )
+            for numero_tema, titulo, modulo_id in unidades.order_by("pk")
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    return len(nuevas)
+
+
+def clonar_grupos(año_original, ciclos):
+    """Clona los grupos de los ciclos clonados y devuelve {id original: id nuevo}"""
+    originales = list(
+        Grupo.objects.filter(ciclo__año_academico=año_original)
+        .only("id", "nombre", "curso", "ciclo_id")
+        .order_by("pk")
+    )
+    nuevos = Grupo.objects.bulk_create(
+        [
+            Grupo(
+                nombre=grupo.nombre, curso=grupo.curso, ciclo_id=ciclos[grupo.ciclo_id]
+            )
+            for grupo in originales
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    return _mapear(originales, nuevos)
+
+
+def clonar_docencias(año_original, año_nuevo, modulos, grupos):
+    """
+    Clona las docencias cuyo módulo y grupo se han clonado y devuelve cuántas.
+    Solo se copia el id del profesor, no hace falta cargarlo. bulk_create no
+    pasa por Docencia.save, así que el año y las asignaciones se crean aquí.
+    """
+    docencias = [
+        (profesor_id, grupos[grupo_id], modulos[modulo_id])
+        for profesor_id, grupo_id, modulo_id in Docencia.objects.filter(
+            año_academico=año_original
+        )
+        .values_list("profesor_id", "grupo_id", "modulo_id")
+        .order_by("pk")
+        if modulo_id in modulos and grupo_id in grupos
+    ]
+    pares = list(
+        dict.fromkeys((grupo_id, modulo_id) for _, grupo_id, modulo_id in docencias)
+    )
+    asignaciones = Asignacion.objects.bulk_create(
+        [
+            Asignacion(grupo_id=grupo_id, modulo_id=modulo_id)
+            for grupo_id, modulo_id in pares
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    asignacion_de = {par: asignacion.pk for par, asignacion in zip(pares, asignaciones)}
+    nuevas = Docencia.objects.bulk_create(
+        [
+            Docencia(
+                profesor_id=profesor_id,
+                grupo_id=grupo_id,
+                modulo_id=modulo_id,
+                año_academico=año_nuevo,
+                asignacion_id=asignacion_de[grupo_id, modulo_id],
+            )
+            for profesor_id, grupo_id, modulo_id in docencias
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    return len(nuevas)
+
+
+def lanzar_clonacion(clonacion):
+    """
+    Ejecuta la clonación en un hilo aparte cuando se confirme la transacción
+    que la ha creado, o en el momento si CLONACION_EN_SEGUNDO_PLANO es False.
+    """
+    if not settings.CLONACION_EN_SEGUNDO_PLANO:
+        ejecutar_clonacion(clonacion.pk)
+        return
+    transaction.on_commit(
+        lambda: threading.Thread(
+            target=_ejecutar_en_hilo, args=(clonacion.pk,), daemon=True
+        ).start()
+    )
+
+
+def _ejecutar_en_hilo(clonacion_id):
+    try:
+        ejecutar_clonacion(clonacion_id)
+    finally:
+        connections.close_all()
+
+
+def marcar_clonaciones_abandonadas():
+    """
+    Marca con error las clonaciones en marcha que llevan más de
+    CLONACION_MINUTOS_SIN_PROGRESO sin actualizarse, porque su hilo ha muerto
+    (p. ej. al reiniciar el servidor). Devuelve cuántas se han marcado.
+    """
+    ahora = timezone.now()
+    return ClonacionAño.objects.filter(
+        estado__in=[EstadoClonacion.PENDIENTE, EstadoClonacion.EN_CURSO],
+        actualizada__lt=ahora
+        - timedelta(minutes=settings.CLONACION_MINUTOS_SIN_PROGRESO),
+    ).update(
+        estado=EstadoClonacion.ERROR,
+        progreso=[],
+        mensaje="La clonación dejó de responder y se ha dado por terminada, "
+        "no se ha creado nada",
+        terminada=ahora,
+        actualizada=ahora,
+    )
+
+
+def ejecutar_clonacion(clonacion_id):
+    """Ejecuta una clonación pendiente guardando su progreso y su resultado"""
+    clonacion = ClonacionAño.objects.select_related("año_original").get(pk=clonacion_id)
+    clonacion.estado = EstadoClonacion.EN_CURSO
+    clonacion.save(update_fields=["estado", "actualizada"])
+    pendiente = ClonacionAño.objects.filter(pk=clonacion_id)
+
+    def al_avanzar(resumen):
+        # Por la otra conexión se confirma ya y no al terminar la transacción
+        pendiente.using("progreso").update(
+            progreso=list(resumen.items()), actualizada=timezone.now()
+        )
+        # La transacción ve los cambios confirmados por otras peticiones
+        if pendiente.filter(cancelacion_solicitada=True).exists():
+            raise ClonacionCancelada
+
+    try:
+        _, resumen = clonar_año_academico(
+            clonacion.año_original, clonacion.nuevo_año, clonacion.opcion, al_avanzar
+        )
+    except ClonacionCancelada:
+        clonacion.estado = EstadoClonacion.CANCELADA
+        clonacion.progreso = []
+        clonacion.mensaje = "Clonación cancelada, no se ha creado nada"
+    except Exception as e:
+        clonacion.estado = EstadoClonacion.ERROR
+        clonacion.progreso = []
+        clonacion.mensaje = f"Error durante la clonación: {str(e)}"
+    else:
+        clonacion.estado = EstadoClonacion.COMPLETADA
+        clonacion.progreso = list(resumen.items())
+        clonacion.mensaje = MENSAJES_CLONACION[clonacion.opcion].format(
+            clonacion.nuevo_año
+        )
+    clonacion.terminada = timezone.now()
+    clonacion.save(
+        update_fields=["estado", "progreso", "mensaje", "terminada", "actualizada"]
+    )
+    return clonacion
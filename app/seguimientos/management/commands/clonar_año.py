@@ -0,0 +1,65 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from seguimientos.clonacion import (
+    OPCIONES_CLONACION,
+    clonar_año_academico,
+    previsualizar_clonacion,
+)
+from seguimientos.models import AñoAcademico
+
+
+class Command(BaseCommand):
+    help = "Clona un año académico en otro nuevo, igual que la acción del admin"
+
+    def add_arguments(self, parser):
+        parser.add_argument("año_original", help="Año a clonar, p. ej. 2024-25")
+        parser.add_argument("nuevo_año", help="Año a crear, p. ej. 2025-26")
+        parser.add_argument(
+            "--opcion",
+            choices=OPCIONES_CLONACION,
+            default="docencias",
+            help="Qué se clona, cada opción incluye las anteriores",
+        )
+        parser.add_argument(
+            "--simular",
+            action="store_true",
+            help="Muestra lo que se crearía sin escribir nada",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            año_original = AñoAcademico.objects.get(pk=options["año_original"])
+        except AñoAcademico.DoesNotExist:
+            raise CommandError(f"El año académico {options['año_original']} no existe")
+        if AñoAcademico.objects.filter(pk=options["nuevo_año"]).exists():
+            raise CommandError(f"El año académico {options['nuevo_año']} ya existe")
+
+        if options["simular"]:
+            previsualizacion, omitidas = previsualizar_clonacion(
+                año_original, options["opcion"]
+            )
+            for entidad, filas in previsualizacion.items():
+                self.stdout.write(f"{entidad}: {filas}")
+            if omitidas:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"{omitidas} docencias no se clonarían porque su grupo es de otro año"
+                    )
+                )
+            return
+
+        try:
+            nuevo_año, resumen = clonar_año_academico(
+                año_original, options["nuevo_año"], options["opcion"]
+            )
+        except ValidationError as err:
+            raise CommandError(err.messages[0])
+
+        for entidad, filas in resumen.items():
+            self.stdout.write(f"{entidad}: {filas}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Año académico {nuevo_año} creado a partir de {año_original}"
+            )
+        )
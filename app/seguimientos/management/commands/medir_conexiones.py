@@ -0,0 +1,97 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from rest_framework.authtoken.models import Token
+
+from seguimientos.models import Profesor
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide la latencia de las peticiones a la API con la configuración de "
+        "conexiones a la base de datos en uso. Para comparar se ejecuta con "
+        "DB_POOL=True y con DB_POOL=False DB_CONN_MAX_AGE=0"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--ruta",
+            default="/api/year-actual/",
+            help="Ruta a la que se hacen las peticiones",
+        )
+        parser.add_argument(
+            "--email",
+            help="Profesor con cuyo token se autentican las peticiones, si no van sin autenticar",
+        )
+        parser.add_argument(
+            "--peticiones", type=int, default=200, help="Peticiones que se miden"
+        )
+        parser.add_argument(
+            "--calentamiento",
+            type=int,
+            default=10,
+            help="Peticiones que se hacen antes de medir y no cuentan",
+        )
+
+    def handle(self, *args, **options):
+        cabeceras = {"HTTP_HOST": settings.ALLOWED_HOSTS[0]}
+        if options["email"]:
+            try:
+                profesor = Profesor.objects.get(email=options["email"])
+            except Profesor.DoesNotExist:
+                raise CommandError(f"El profesor {options['email']} no existe")
+            token, _ = Token.objects.get_or_create(user=profesor)
+            cabeceras["HTTP_AUTHORIZATION"] = f"Token {token.key}"
+        # Se empieza sin conexión abierta, como un worker recién arrancado
+        connection.close()
+
+        # Las peticiones pasan por el mismo handler WSGI que usa gunicorn, que
+        # abre y cierra o devuelve al pool la conexión en cada una
+        handler = WSGIHandler()
+        factory = RequestFactory()
+        tiempos = []
+        for i in range(options["calentamiento"] + options["peticiones"]):
+            environ = factory.get(options["ruta"], **cabeceras).environ
+            inicio = time.perf_counter()
+            respuesta = handler(environ, lambda status, headers: None)
+            respuesta.close()
+            if i >= options["calentamiento"]:
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+            if respuesta.status_code >= 400:
+                raise CommandError(
+                    f"La petición a {options['ruta']} ha devuelto {respuesta.status_code}"
+                )
+        connection.close()
+
+        if not tiempos:
+            return
+        tiempos.sort()
+        self.stdout.write(f"Conexiones: {self.describir_conexiones()}")
+        self.stdout.write(f"Peticiones: {len(tiempos)} a {options['ruta']}")
+        self.stdout.write(
+            f"Latencia (ms): media {statistics.mean(tiempos):.2f}, "
+            f"p50 {self.percentil(tiempos, 50):.2f}, "
+            f"p95 {self.percentil(tiempos, 95):.2f}, "
+            f"máx {tiempos[-1]:.2f}"
+        )
+
+    @staticmethod
+    def percentil(tiempos, percentil):
+        return tiempos[min(len(tiempos) - 1, len(tiempos) * percentil // 100)]
+
+    @staticmethod
+    def describir_conexiones():
+        pool = connection.settings_dict["OPTIONS"].get("pool")
+        if pool:
+            return (
+                f"pool de psycopg (min_size={pool.get('min_size', 4)}, "
+                f"max_size={pool.get('max_size', pool.get('min_size', 4))})"
+            )
+        if connection.settings_dict["CONN_MAX_AGE"]:
+            return f"persistentes (CONN_MAX_AGE={connection.settings_dict['CONN_MAX_AGE']})"
+        return "una conexión nueva por petición"
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.2 on 2026-10-19 17:18
+
+import django.db.models.deletion
+import seguimientos.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seguimientos', '0015_alter_añoacademico_actual'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClonacionAño',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nuevo_año', models.CharField(max_length=7, validators=[seguimientos.validators.validate_año])),
+                ('opcion', models.CharField(max_length=10)),
+                ('estado', models.CharField(choices=[('PENDIENTE', 'Pendiente'), ('EN_CURSO', 'En curso'), ('COMPLETADA', 'Completada'), ('CANCELADA', 'Cancelada'), ('ERROR', 'Error')], default='PENDIENTE', max_length=10)),
+                ('progreso', models.JSONField(blank=True, default=list)),
+                ('cancelacion_solicitada', models.BooleanField(default=False)),
+                ('mensaje', models.CharField(blank=True)),
+                ('creada', models.DateTimeField(auto_now_add=True)),
+                ('terminada', models.DateTimeField(blank=True, null=True)),
+                ('año_original', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='clonaciones', to='seguimientos.añoacademico')),
+            ],
+            options={
+                'verbose_name': 'Clonación de Año Academico',
+                'verbose_name_plural': 'Clonaciones de Años Academicos',
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.2 on 2026-10-19 17:33
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seguimientos', '0016_clonacionaño'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='seguimiento',
+            name='orden_mes_academico',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('mes'), '+', models.Value(3)), '%%', models.Value(12)), '+', models.Value(1)), output_field=models.IntegerField()),
+        ),
+        migrations.AddIndex(
+            model_name='seguimiento',
+            index=models.Index(fields=['orden_mes_academico'], name='seguimiento_orden_m_5d9dcf_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.2 on 2026-10-19 17:39
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('seguimientos', '0017_seguimiento_orden_mes_academico'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ciclo',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('nombre', config='simple'), name='ciclo_busqueda_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grupo',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('nombre', config='simple'), name='grupo_busqueda_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='modulo',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('nombre', config='simple'), name='modulo_busqueda_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='profesor',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('nombre', config='simple'), name='profesor_busqueda_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='profesor',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('nombre', 'email', config='simple'), name='profesor_busqueda_email_idx'),
+        ),
+    ]
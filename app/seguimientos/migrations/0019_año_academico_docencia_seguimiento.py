@@ -0,0 +1,24 @@
+# Generated by Django 5.2.2 on 2026-10-19 17:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seguimientos', '0018_indices_busqueda'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='docencia',
+            name='año_academico',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='docencias', to='seguimientos.añoacademico'),
+        ),
+        migrations.AddField(
+            model_name='seguimiento',
+            name='año_academico',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='seguimientos', to='seguimientos.añoacademico'),
+        ),
+    ]
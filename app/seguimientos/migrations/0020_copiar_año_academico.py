@@ -0,0 +1,39 @@
+# Generated by Django 5.2.2 on 2026-10-19 17:53
+
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def copiar_años(apps, schema_editor):
+    Modulo = apps.get_model("seguimientos", "Modulo")
+    Docencia = apps.get_model("seguimientos", "Docencia")
+    Seguimiento = apps.get_model("seguimientos", "Seguimiento")
+    Docencia.objects.update(
+        año_academico=Subquery(
+            Modulo.objects.filter(pk=OuterRef("modulo")).values(
+                "ciclo__año_academico"
+            )[:1]
+        )
+    )
+    Seguimiento.objects.update(
+        año_academico=Subquery(
+            Docencia.objects.filter(pk=OuterRef("docencia")).values(
+                "año_academico"
+            )[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    # Los datos se copian en una migración aparte y los campos pasan a ser
+    # obligatorios en la siguiente. En la misma transacción Postgres no deja
+    # alterar la tabla con las comprobaciones diferidas de las claves ajenas
+    # actualizadas pendientes
+
+    dependencies = [
+        ('seguimientos', '0019_año_academico_docencia_seguimiento'),
+    ]
+
+    operations = [
+        migrations.RunPython(copiar_años, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.2 on 2026-10-19 17:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seguimientos', '0020_copiar_año_academico'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='docencia',
+            name='año_academico',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='docencias', to='seguimientos.añoacademico'),
+        ),
+        migrations.AlterField(
+            model_name='seguimiento',
+            name='año_academico',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='seguimientos', to='seguimientos.añoacademico'),
+        ),
+        migrations.AddIndex(
+            model_name='seguimiento',
+            index=models.Index(fields=['año_academico', 'mes'], name='seguimiento_año_aca_afec2d_idx'),
+        ),
+    ]
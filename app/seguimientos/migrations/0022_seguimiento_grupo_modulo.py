@@ -0,0 +1,24 @@
+# Generated by Django 5.2.2 on 2026-10-19 17:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seguimientos', '0021_año_academico_obligatorio'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='seguimiento',
+            name='grupo',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='seguimientos', to='seguimientos.grupo'),
+        ),
+        migrations.AddField(
+            model_name='seguimiento',
+            name='modulo',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='seguimientos', to='seguimientos.modulo'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.2 on 2026-10-19 17:57
+
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery
+
+
+def copiar_grupo_y_modulo(apps, schema_editor):
+    Docencia = apps.get_model("seguimientos", "Docencia")
+    Seguimiento = apps.get_model("seguimientos", "Seguimiento")
+    docencia = Docencia.objects.filter(pk=OuterRef("docencia"))
+    Seguimiento.objects.update(
+        grupo=Subquery(docencia.values("grupo")[:1]),
+        modulo=Subquery(docencia.values("modulo")[:1]),
+    )
+    # Hasta ahora solo lo comprobaba la API, los creados desde el admin pueden estar repetidos
+    repetidos = list(
+        Seguimiento.objects.values("grupo", "modulo", "mes")
+        .annotate(ids=ArrayAgg("pk"), total=Count("pk"))
+        .filter(total__gt=1)
+        .values_list("ids", flat=True)
+    )
+    if repetidos:
+        raise RuntimeError(
+            "Hay seguimientos repetidos para el mismo mes, grupo y módulo, "
+            f"hay que borrar los sobrantes antes de migrar: {repetidos}"
+        )
+
+
+class Migration(migrations.Migration):
+    # Migración de datos aparte de la que hace obligatorios los campos, ver 0020
+
+    dependencies = [
+        ('seguimientos', '0022_seguimiento_grupo_modulo'),
+    ]
+
+    operations = [
+        migrations.RunPython(copiar_grupo_y_modulo, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.2 on 2026-10-19 17:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seguimientos', '0023_copiar_grupo_modulo'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='seguimiento',
+            name='grupo',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='seguimientos', to='seguimientos.grupo'),
+        ),
+        migrations.AlterField(
+            model_name='seguimiento',
+            name='modulo',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='seguimientos', to='seguimientos.modulo'),
+        ),
+        migrations.AddConstraint(
+            model_name='seguimiento',
+            constraint=models.UniqueConstraint(fields=('grupo', 'modulo', 'mes'), name='grupo_modulo_mes_unicos', violation_error_message='Ya existe un seguimiento para este mes, grupo y módulo.'),
+        ),
+    ]
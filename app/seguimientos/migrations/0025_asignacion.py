@@ -0,0 +1,37 @@
+# Generated by Django 5.2.2 on 2026-10-19 18:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seguimientos', '0024_grupo_modulo_obligatorios'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Asignacion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('grupo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='asignaciones', to='seguimientos.grupo')),
+                ('modulo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='asignaciones', to='seguimientos.modulo')),
+            ],
+            options={
+                'verbose_name': 'Asignación',
+                'verbose_name_plural': 'Asignaciones',
+                'constraints': [models.UniqueConstraint(fields=('grupo', 'modulo'), name='asignacion_grupo_modulo_unicos')],
+            },
+        ),
+        migrations.AddField(
+            model_name='docencia',
+            name='asignacion',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='docencias', to='seguimientos.asignacion'),
+        ),
+        migrations.AddField(
+            model_name='seguimiento',
+            name='asignacion',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='seguimientos', to='seguimientos.asignacion'),
+        ),
+    ]
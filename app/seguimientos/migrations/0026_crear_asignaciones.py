@@ -0,0 +1,43 @@
+# Generated by Django 5.2.2 on 2026-10-19 18:02
+
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def crear_asignaciones(apps, schema_editor):
+    Asignacion = apps.get_model("seguimientos", "Asignacion")
+    Docencia = apps.get_model("seguimientos", "Docencia")
+    Seguimiento = apps.get_model("seguimientos", "Seguimiento")
+    Asignacion.objects.bulk_create(
+        [
+            Asignacion(grupo_id=grupo_id, modulo_id=modulo_id)
+            for grupo_id, modulo_id in Docencia.objects.values_list("grupo", "modulo")
+            .distinct()
+            .order_by()
+        ],
+        batch_size=1000,
+    )
+    Docencia.objects.update(
+        asignacion=Subquery(
+            Asignacion.objects.filter(
+                grupo=OuterRef("grupo"), modulo=OuterRef("modulo")
+            ).values("pk")[:1]
+        )
+    )
+    Seguimiento.objects.update(
+        asignacion=Subquery(
+            Docencia.objects.filter(pk=OuterRef("docencia")).values("asignacion")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    # Migración de datos aparte de la que hace obligatorios los campos, ver 0020
+
+    dependencies = [
+        ('seguimientos', '0025_asignacion'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_asignaciones, migrations.RunPython.noop),
+    ]
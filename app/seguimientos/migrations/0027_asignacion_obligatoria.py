@@ -0,0 +1,40 @@
+# Generated by Django 5.2.2 on 2026-10-19 18:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seguimientos', '0026_crear_asignaciones'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='docencia',
+            name='asignacion',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='docencias', to='seguimientos.asignacion'),
+        ),
+        migrations.AlterField(
+            model_name='seguimiento',
+            name='asignacion',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='seguimientos', to='seguimientos.asignacion'),
+        ),
+        migrations.RemoveConstraint(
+            model_name='seguimiento',
+            name='grupo_modulo_mes_unicos',
+        ),
+        migrations.RemoveField(
+            model_name='seguimiento',
+            name='grupo',
+        ),
+        migrations.RemoveField(
+            model_name='seguimiento',
+            name='modulo',
+        ),
+        migrations.AddConstraint(
+            model_name='seguimiento',
+            constraint=models.UniqueConstraint(fields=('asignacion', 'mes'), name='asignacion_mes_unicos', violation_error_message='Ya existe un seguimiento para este mes, grupo y módulo.'),
+        ),
+    ]
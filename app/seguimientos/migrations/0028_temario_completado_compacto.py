@@ -0,0 +1,83 @@
+# Generated by Django 5.2.2 on 2026-10-19 18:06
+
+from itertools import islice
+
+import django.contrib.postgres.fields
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db import migrations, models
+from django.db.models import OuterRef
+
+TAMAÑO_LOTE = 2000
+
+
+def copiar_temario_completado(apps, schema_editor):
+    """
+    Copia las unidades completadas de la tabla intermedia al array, ordenadas
+    por número de tema. Solo las del módulo de la docencia del seguimiento.
+    """
+    Seguimiento = apps.get_model("seguimientos", "Seguimiento")
+    TemarioCompletado = Seguimiento.temario_completado.through
+    Seguimiento.objects.filter(temario_completado__isnull=False).update(
+        temario_completado_nuevo=ArraySubquery(
+            TemarioCompletado.objects.filter(
+                seguimiento=OuterRef("pk"),
+                unidaddetrabajo__modulo__docencias=OuterRef("docencia"),
+            )
+            .order_by("unidaddetrabajo__numero_tema", "unidaddetrabajo")
+            .values("unidaddetrabajo")
+        )
+    )
+
+
+def restaurar_temario_completado(apps, schema_editor):
+    """Vuelve a crear las filas de la tabla intermedia a partir del array"""
+    Seguimiento = apps.get_model("seguimientos", "Seguimiento")
+    UnidadDeTrabajo = apps.get_model("seguimientos", "UnidadDeTrabajo")
+    TemarioCompletado = Seguimiento.temario_completado.through
+    seguimientos = (
+        Seguimiento.objects.exclude(temario_completado_nuevo=[])
+        .order_by("pk")
+        .values_list("pk", "temario_completado_nuevo")
+        .iterator(chunk_size=TAMAÑO_LOTE)
+    )
+    while lote := list(islice(seguimientos, TAMAÑO_LOTE)):
+        # Los ids de unidades que ya no existen se saltan
+        existentes = set(
+            UnidadDeTrabajo.objects.filter(
+                pk__in={pk for _, ids in lote for pk in ids}
+            ).values_list("pk", flat=True)
+        )
+        TemarioCompletado.objects.bulk_create(
+            [
+                TemarioCompletado(seguimiento_id=seguimiento_id, unidaddetrabajo_id=pk)
+                for seguimiento_id, ids in lote
+                for pk in dict.fromkeys(ids)
+                if pk in existentes
+            ],
+            batch_size=TAMAÑO_LOTE,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seguimientos', '0027_asignacion_obligatoria'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='seguimiento',
+            name='temario_completado_nuevo',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), blank=True, default=list, size=None),
+        ),
+        migrations.RunPython(copiar_temario_completado, restaurar_temario_completado),
+        migrations.RemoveField(
+            model_name='seguimiento',
+            name='temario_completado',
+        ),
+        migrations.RenameField(
+            model_name='seguimiento',
+            old_name='temario_completado_nuevo',
+            new_name='temario_completado',
+        ),
+    ]
@@ -0,0 +1,194 @@
+# Generated by Django 5.2.2 on 2026-10-19 18:11
+
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+TABLA = "seguimientos_seguimiento"
+TABLA_ANTIGUA = "seguimientos_seguimiento_sin_particionar"
+TABLA_PARTICIONADA = "seguimientos_seguimiento_particionada"
+
+
+def particionar_seguimientos(apps, schema_editor):
+    """
+    Rehace la tabla de seguimientos particionada por año académico: renombra la
+    actual, crea la particionada con las mismas columnas y una partición por
+    año, copia las filas y vuelve a crear la secuencia del id, las claves
+    ajenas y los índices. La clave primaria pasa a ser (id, año), Postgres
+    exige que incluya la clave de partición.
+    """
+    AñoAcademico = apps.get_model("seguimientos", "AñoAcademico")
+    quote = schema_editor.quote_name
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {TABLA} RENAME TO {TABLA_ANTIGUA}")
+        cursor.execute(
+            f"ALTER TABLE {TABLA_ANTIGUA} RENAME CONSTRAINT {TABLA}_pkey "
+            f"TO {TABLA_ANTIGUA}_pkey"
+        )
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype <> 'p'",
+            [TABLA_ANTIGUA],
+        )
+        restricciones = cursor.fetchall()
+        cursor.execute(
+            "SELECT pg_get_indexdef(indexrelid) FROM pg_index "
+            "WHERE indrelid = %s::regclass AND NOT EXISTS ("
+            "SELECT 1 FROM pg_constraint WHERE conindid = indexrelid)",
+            [TABLA_ANTIGUA],
+        )
+        indices = [fila[0] for fila in cursor.fetchall()]
+        cursor.execute(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_name = %s AND is_generated = 'NEVER' "
+            "ORDER BY ordinal_position",
+            [TABLA_ANTIGUA],
+        )
+        columnas = ", ".join(quote(fila[0]) for fila in cursor.fetchall())
+
+        # Postgres 16 no admite columnas identity en tablas particionadas, el
+        # id pasa a tomar su valor de una secuencia normal
+        cursor.execute(
+            f"CREATE TABLE {TABLA} (LIKE {TABLA_ANTIGUA} INCLUDING DEFAULTS "
+            f'INCLUDING GENERATED, '
+            f'CONSTRAINT {TABLA}_pkey PRIMARY KEY (id, "año_academico_id")) '
+            f'PARTITION BY LIST ("año_academico_id")'
+        )
+        for año in AñoAcademico.objects.values_list("año_academico", flat=True):
+            cursor.execute(
+                f"CREATE TABLE {quote(TABLA + '_' + año.replace('-', '_'))} "
+                f"PARTITION OF {TABLA} FOR VALUES IN (%s)",
+                [año],
+            )
+        cursor.execute(
+            f"INSERT INTO {TABLA} ({columnas}) SELECT {columnas} FROM {TABLA_ANTIGUA}"
+        )
+        cursor.execute(f"SELECT coalesce(max(id), 0) FROM {TABLA_ANTIGUA}")
+        ultimo_id = cursor.fetchone()[0]
+        cursor.execute(f"DROP TABLE {TABLA_ANTIGUA}")
+
+        cursor.execute(f"CREATE SEQUENCE {TABLA}_id_seq OWNED BY {TABLA}.id")
+        cursor.execute(
+            f"ALTER TABLE {TABLA} ALTER COLUMN id SET DEFAULT nextval('{TABLA}_id_seq')"
+        )
+        cursor.execute(
+            "SELECT setval(%s, %s, %s)",
+            [f"{TABLA}_id_seq", max(ultimo_id, 1), ultimo_id > 0],
+        )
+        for nombre, definicion in restricciones:
+            cursor.execute(
+                f"ALTER TABLE {TABLA} ADD CONSTRAINT {quote(nombre)} {definicion}"
+            )
+        for definicion in indices:
+            cursor.execute(
+                re.sub(
+                    rf" ON (\S+\.)?{TABLA_ANTIGUA} ",
+                    rf" ON \g<1>{TABLA} ",
+                    definicion,
+                )
+            )
+
+
+
+def desparticionar_seguimientos(apps, schema_editor):
+    """
+    Deshace particionar_seguimientos: vuelve a una tabla normal con todas las
+    filas, el id como columna identity y la clave primaria solo en el id.
+    """
+    quote = schema_editor.quote_name
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {TABLA} RENAME TO {TABLA_PARTICIONADA}")
+        cursor.execute(
+            f"ALTER TABLE {TABLA_PARTICIONADA} RENAME CONSTRAINT {TABLA}_pkey "
+            f"TO {TABLA_PARTICIONADA}_pkey"
+        )
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype <> 'p'",
+            [TABLA_PARTICIONADA],
+        )
+        restricciones = cursor.fetchall()
+        cursor.execute(
+            "SELECT pg_get_indexdef(indexrelid) FROM pg_index "
+            "WHERE indrelid = %s::regclass AND NOT EXISTS ("
+            "SELECT 1 FROM pg_constraint WHERE conindid = indexrelid)",
+            [TABLA_PARTICIONADA],
+        )
+        indices = [fila[0] for fila in cursor.fetchall()]
+        cursor.execute(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_name = %s AND is_generated = 'NEVER' "
+            "ORDER BY ordinal_position",
+            [TABLA_PARTICIONADA],
+        )
+        columnas = ", ".join(quote(fila[0]) for fila in cursor.fetchall())
+
+        cursor.execute(
+            f"CREATE TABLE {TABLA} (LIKE {TABLA_PARTICIONADA} INCLUDING DEFAULTS "
+            f"INCLUDING GENERATED, CONSTRAINT {TABLA}_pkey PRIMARY KEY (id))"
+        )
+        cursor.execute(
+            f"INSERT INTO {TABLA} ({columnas}) SELECT {columnas} FROM {TABLA_PARTICIONADA}"
+        )
+        cursor.execute(f"SELECT coalesce(max(id), 0) FROM {TABLA}")
+        ultimo_id = cursor.fetchone()[0]
+        # La secuencia es de la tabla particionada y se borra con ella, el id
+        # vuelve a ser identity como lo crea Django
+        cursor.execute(f"ALTER TABLE {TABLA} ALTER COLUMN id DROP DEFAULT")
+        cursor.execute(f"DROP TABLE {TABLA_PARTICIONADA}")
+        cursor.execute(
+            f"ALTER TABLE {TABLA} ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY"
+        )
+        cursor.execute(
+            "SELECT setval(pg_get_serial_sequence(%s, 'id'), %s, %s)",
+            [TABLA, max(ultimo_id, 1), ultimo_id > 0],
+        )
+        for nombre, definicion in restricciones:
+            cursor.execute(
+                f"ALTER TABLE {TABLA} ADD CONSTRAINT {quote(nombre)} {definicion}"
+            )
+        for definicion in indices:
+            cursor.execute(
+                re.sub(
+                    rf" ON ONLY (\S+\.)?{TABLA_PARTICIONADA} ",
+                    rf" ON \g<1>{TABLA} ",
+                    definicion,
+                )
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seguimientos', '0028_temario_completado_compacto'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='seguimiento',
+            name='docencia_mes_unicos',
+        ),
+        migrations.RemoveConstraint(
+            model_name='seguimiento',
+            name='asignacion_mes_unicos',
+        ),
+        migrations.RemoveIndex(
+            model_name='seguimiento',
+            name='seguimiento_año_aca_afec2d_idx',
+        ),
+        migrations.AlterField(
+            model_name='seguimiento',
+            name='año_academico',
+            field=models.ForeignKey(db_index=False, editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='seguimientos', to='seguimientos.añoacademico'),
+        ),
+        migrations.RunPython(particionar_seguimientos, desparticionar_seguimientos),
+        migrations.AddConstraint(
+            model_name='seguimiento',
+            constraint=models.UniqueConstraint(fields=('docencia', 'mes', 'año_academico'), name='docencia_mes_unicos'),
+        ),
+        migrations.AddConstraint(
+            model_name='seguimiento',
+            constraint=models.UniqueConstraint(fields=('asignacion', 'mes', 'año_academico'), name='asignacion_mes_unicos', violation_error_message='Ya existe un seguimiento para este mes, grupo y módulo.'),
+        ),
+    ]
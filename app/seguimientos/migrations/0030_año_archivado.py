@@ -0,0 +1,27 @@
+# Generated by Django 5.2.2 on 2026-10-19 18:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seguimientos', '0029_particionar_seguimientos'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AñoArchivado',
+            fields=[
+                ('año_academico', models.CharField(max_length=7, primary_key=True, serialize=False)),
+                ('archivado', models.DateTimeField(auto_now_add=True)),
+                ('num_seguimientos', models.PositiveIntegerField(default=0)),
+                ('datos', models.BinaryField()),
+            ],
+            options={
+                'verbose_name': 'Año Académico Archivado',
+                'verbose_name_plural': 'Años Académicos Archivados',
+                'ordering': ['-año_academico'],
+            },
+        ),
+    ]
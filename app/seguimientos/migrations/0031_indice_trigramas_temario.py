@@ -0,0 +1,21 @@
+# Generated by Django 5.2.2 on 2026-10-19 18:32
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seguimientos', '0030_año_archivado'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='unidaddetrabajo',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('titulo'), name='gin_trgm_ops'), name='unidad_titulo_trgm_idx'),
+        ),
+    ]
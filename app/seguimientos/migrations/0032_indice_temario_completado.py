@@ -0,0 +1,18 @@
+# Generated by Django 5.2.2 on 2026-10-19 18:35
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seguimientos', '0031_indice_trigramas_temario'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='seguimiento',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['temario_completado'], name='seguimiento_temario_gin_idx'),
+        ),
+    ]
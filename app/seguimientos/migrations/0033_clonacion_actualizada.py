@@ -0,0 +1,20 @@
+# Generated by Django 5.2.2 on 2026-10-19 19:02
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seguimientos', '0032_indice_temario_completado'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='clonacionaño',
+            name='actualizada',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
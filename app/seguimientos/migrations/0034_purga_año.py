@@ -0,0 +1,29 @@
+# Generated by Django 5.2.2 on 2026-10-19 18:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seguimientos', '0033_clonacion_actualizada'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PurgaAño',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('año_academico', models.CharField(max_length=7)),
+                ('estado', models.CharField(choices=[('PENDIENTE', 'Pendiente'), ('EN_CURSO', 'En curso'), ('COMPLETADA', 'Completada'), ('ERROR', 'Error')], default='PENDIENTE', max_length=10)),
+                ('progreso', models.JSONField(blank=True, default=list)),
+                ('mensaje', models.CharField(blank=True)),
+                ('creada', models.DateTimeField(auto_now_add=True)),
+                ('terminada', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Borrado de Año Academico',
+                'verbose_name_plural': 'Borrados de Años Academicos',
+            },
+        ),
+    ]
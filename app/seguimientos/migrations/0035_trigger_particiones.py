@@ -0,0 +1,49 @@
+# Generated by Django 5.2.2 on 2026-10-19 19:40
+
+from django.db import migrations
+
+# La partición de seguimientos de un año la crea la base de datos al insertar
+# el año, así existe se cree como se cree: save(), bulk_create, loaddata o SQL
+CREAR_TRIGGER = """
+CREATE FUNCTION crear_particion_seguimientos(año text) RETURNS void AS $$
+BEGIN
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS %I PARTITION OF seguimientos_seguimiento '
+        'FOR VALUES IN (%L)',
+        'seguimientos_seguimiento_' || replace(año, '-', '_'),
+        año
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION crear_particion_año_academico() RETURNS trigger AS $$
+BEGIN
+    PERFORM crear_particion_seguimientos(NEW.año_academico);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER crear_particion_seguimientos
+AFTER INSERT OR UPDATE OF año_academico ON "seguimientos_añoacademico"
+FOR EACH ROW EXECUTE FUNCTION crear_particion_año_academico();
+
+-- Años que ya se crearon sin pasar por AñoAcademico.save()
+SELECT crear_particion_seguimientos(año_academico) FROM "seguimientos_añoacademico";
+"""
+
+BORRAR_TRIGGER = """
+DROP TRIGGER crear_particion_seguimientos ON "seguimientos_añoacademico";
+DROP FUNCTION crear_particion_año_academico();
+DROP FUNCTION crear_particion_seguimientos(text);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seguimientos', '0034_purga_año'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREAR_TRIGGER, BORRAR_TRIGGER),
+    ]
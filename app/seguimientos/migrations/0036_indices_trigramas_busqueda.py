@@ -0,0 +1,56 @@
+# Generated by Django 5.2.2 on 2026-10-19 18:59
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('seguimientos', '0035_trigger_particiones'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='ciclo',
+            name='ciclo_busqueda_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='grupo',
+            name='grupo_busqueda_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='modulo',
+            name='modulo_busqueda_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='profesor',
+            name='profesor_busqueda_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='profesor',
+            name='profesor_busqueda_email_idx',
+        ),
+        migrations.AddIndex(
+            model_name='ciclo',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('nombre'), name='gin_trgm_ops'), name='ciclo_nombre_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grupo',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('nombre'), name='gin_trgm_ops'), name='grupo_nombre_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='modulo',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('nombre'), name='gin_trgm_ops'), name='modulo_nombre_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='profesor',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('nombre'), name='gin_trgm_ops'), name='profesor_nombre_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='profesor',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('email'), name='gin_trgm_ops'), name='profesor_email_trgm_idx'),
+        ),
+    ]
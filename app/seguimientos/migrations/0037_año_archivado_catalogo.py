@@ -0,0 +1,18 @@
+# Generated by Django 5.2.2 on 2026-10-19 19:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seguimientos', '0036_indices_trigramas_busqueda'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='añoarchivado',
+            name='catalogo',
+            field=models.BinaryField(default=bytes),
+        ),
+    ]
@@ -1,12 +1,22 @@
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import AbstractUser, BaseUserManager
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import connection, models
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 from django.utils.functional import cached_property
-from django.core.cache import cache
 from solo.models import SingletonModel
 from django.core.exceptions import ValidationError
 
+from .busqueda import indice_trigramas
+from .cache_catalogo import (
+    invalidar_cache_años,
+    invalidar_cache_docencias,
+    invalidar_cache_temario,
+)
+from .particiones import borrar_particion
 from .validators import validate_año
 
 
@@ -22,8 +32,26 @@ class AñoAcademico(models.Model):
     def __str__(self):
         return self.año_academico
 
+    def clean(self):
+        super().clean()
+        # Un año archivado ya no está en las tablas de trabajo, si se volviera
+        # a crear convivirían las dos versiones
+        if (
+            self._state.adding
+            and AñoArchivado.objects.filter(pk=self.año_academico).exists()
+        ):
+            raise ValidationError(
+                {
+                    "año_academico": f"El año académico {self.año_academico} está archivado, no se puede volver a crear."
+                }
+            )
+
     def save(self, *args, **kwargs):
-        """Invalidamos el cache de años si se ha registrado un nuevo año actual"""
+        """
+        Invalidamos el cache de años si se ha registrado un nuevo año actual.
+        La partición de seguimientos del año la crea la base de datos al
+        insertarlo (ver particiones).
+        """
         # Comprobamos si este es el primer registro creado
         if not AñoAcademico.objects.exists():
             self.actual = True
@@ -31,15 +59,20 @@ class AñoAcademico(models.Model):
             # Si esta instancia se establece como actual, ponemos todas las demás como False
             AñoAcademico.objects.exclude(pk=self.pk).update(actual=False)
 
-        cache.delete("año_academico_actual")
         super().save(*args, **kwargs)
+        invalidar_cache_años()
 
     def delete(self, *args, **kwargs):
         """Si eliminamos el año actual, establecemos el año más alto como actual"""
         is_actual = self.actual
 
-        # Llamamos primero al método delete del padre
+        # Llamamos primero al método delete del padre, la partición ya está vacía
+        año = self.año_academico
         super().delete(*args, **kwargs)
+        # Las claves ajenas diferidas se comprueban antes de borrar la partición
+        connection.check_constraints()
+        borrar_particion(año)
+        invalidar_cache_años()
 
         # Después de la eliminación, si este era el año actual, establecemos el año más alto como actual
         if is_actual and AñoAcademico.objects.exists():
@@ -63,10 +96,27 @@ class Ciclo(models.Model):
     )
 
     def __str__(self):
-        return f"{self.nombre} - {self.año_academico}"
+        # El id del año es el propio año, así no hace falta cargarlo
+        return f"{self.nombre} - {self.año_academico_id}"
+
+    def save(self, *args, **kwargs):
+        """Si el ciclo cambia de año se lo lleva a sus docencias y seguimientos"""
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if not adding:
+            año = self.año_academico_id
+            Docencia.objects.filter(modulo__ciclo=self).exclude(
+                año_academico=año
+            ).update(año_academico=año)
+            Seguimiento.objects.filter(docencia__modulo__ciclo=self).exclude(
+                año_academico=año
+            ).update(año_academico=año)
 
     class Meta:
         ordering = ["-año_academico", "nombre"]
+        indexes = [
+            indice_trigramas("nombre", name="ciclo_nombre_trgm_idx"),
+        ]
 
 
 class Grupo(models.Model):
@@ -83,6 +133,9 @@ class Grupo(models.Model):
 
     class Meta:
         ordering = ["-ciclo__año_academico", "nombre"]
+        indexes = [
+            indice_trigramas("nombre", name="grupo_nombre_trgm_idx"),
+        ]
 
 
 class Modulo(models.Model):
@@ -97,9 +150,21 @@ class Modulo(models.Model):
     def __str__(self):
         return f"{self.nombre} - {self.ciclo}"
 
+    def save(self, *args, **kwargs):
+        """Si el módulo cambia de ciclo se lleva su año a sus docencias y seguimientos"""
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if not adding:
+            año = self.ciclo.año_academico_id
+            self.docencias.exclude(año_academico=año).update(año_academico=año)
+            Seguimiento.objects.filter(docencia__modulo=self).exclude(
+                año_academico=año
+            ).update(año_academico=año)
+
     class Meta:
         indexes = [
             models.Index(fields=["ciclo"]),
+            indice_trigramas("nombre", name="modulo_nombre_trgm_idx"),
         ]
         ordering = ["-ciclo__año_academico", "ciclo", "curso", "nombre"]
 
@@ -118,6 +183,23 @@ class UnidadDeTrabajo(models.Model):
     def __str__(self):
         return f"UT{self.numero_tema} - {self.titulo}"
 
+    # Módulo con el que se cargó la unidad, si cambia también se invalida su temario
+    _modulo_guardado = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        unidad = super().from_db(db, field_names, values)
+        unidad._modulo_guardado = unidad.__dict__.get("modulo_id")
+        return unidad
+
+    def save(self, *args, **kwargs):
+        """El temario de los módulos está cacheado para el autocompletado"""
+        super().save(*args, **kwargs)
+        invalidar_cache_temario(
+            *{self.modulo_id, self._modulo_guardado or self.modulo_id}
+        )
+        self._modulo_guardado = self.modulo_id
+
     class Meta:
         verbose_name = "Unidad de Trabajo"
         verbose_name_plural = "Unidades de Trabajo"
@@ -125,6 +207,30 @@ class UnidadDeTrabajo(models.Model):
         constraints = [
             models.UniqueConstraint(fields=["numero_tema", "modulo"], name="tema_unico")
         ]
+        indexes = [
+            # Trigramas de UPPER(titulo), que es lo que compara titulo__icontains,
+            # para que el autocompletado del temario no recorra toda la tabla
+            indice_trigramas("titulo", name="unidad_titulo_trgm_idx"),
+        ]
+
+
+@receiver(post_delete, sender=UnidadDeTrabajo)
+def quitar_unidad_borrada(sender, instance, **kwargs):
+    """
+    Quita la unidad del temario completado de los seguimientos. Va en la señal
+    y no en delete() para que también se haga al borrar un queryset o en
+    cascada al borrar el módulo. La purga borra sin señales, pero borra a la
+    vez los seguimientos del año, y aun así al leer se saltan los ids que ya
+    no existen (ver Seguimiento.unidades_completadas).
+    """
+    Seguimiento.objects.filter(temario_completado__contains=[instance.pk]).update(
+        temario_completado=models.Func(
+            models.F("temario_completado"),
+            models.Value(instance.pk),
+            function="array_remove",
+        )
+    )
+    invalidar_cache_temario(instance.modulo_id)
 
 
 class ProfesorManager(BaseUserManager):
@@ -194,6 +300,43 @@ class Profesor(AbstractUser):
     class Meta:
         verbose_name = "Profesor"
         verbose_name_plural = "Profesores"
+        # Búsqueda por nombre desde otros listados y por nombre y email en el suyo
+        indexes = [
+            indice_trigramas("nombre", name="profesor_nombre_trgm_idx"),
+            indice_trigramas("email", name="profesor_email_trgm_idx"),
+        ]
+
+
+class Asignacion(models.Model):
+    """
+    Un módulo impartido a un grupo. Las docencias de los profesores que lo
+    comparten cuelgan de la misma asignación y los seguimientos son de ella,
+    así que basta un seguimiento al mes para todos.
+    """
+
+    grupo = models.ForeignKey(
+        Grupo, on_delete=models.CASCADE, related_name="asignaciones"
+    )
+    modulo = models.ForeignKey(
+        Modulo, on_delete=models.CASCADE, related_name="asignaciones"
+    )
+
+    def __str__(self):
+        return f"{self.modulo.nombre} - {self.grupo.nombre}"
+
+    @classmethod
+    def borrar_sin_docencias(cls, pk):
+        """Borra la asignación si ya no le queda ninguna docencia"""
+        cls.objects.filter(pk=pk, docencias__isnull=True).delete()
+
+    class Meta:
+        verbose_name = "Asignación"
+        verbose_name_plural = "Asignaciones"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["grupo", "modulo"], name="asignacion_grupo_modulo_unicos"
+            )
+        ]
 
 
 class Docencia(models.Model):
@@ -204,10 +347,22 @@ class Docencia(models.Model):
     modulo = models.ForeignKey(
         Modulo, on_delete=models.CASCADE, related_name="docencias"
     )
-
-    @cached_property
-    def año_academico(self):
-        return self.modulo.ciclo.año_academico
+    # Año del módulo, copiado para filtrar por año sin pasar por módulo y ciclo.
+    # Lo mantienen los save() de Docencia, Modulo y Ciclo
+    año_academico = models.ForeignKey(
+        AñoAcademico,
+        on_delete=models.CASCADE,
+        to_field="año_academico",
+        related_name="docencias",
+        editable=False,
+    )
+    # Asignación del grupo y módulo, la crea o la busca Docencia.save
+    asignacion = models.ForeignKey(
+        Asignacion,
+        on_delete=models.CASCADE,
+        related_name="docencias",
+        editable=False,
+    )
 
     class Meta:
         # Garantizar que un profesor no sea asignado al mismo módulo y grupo dos veces en el mismo curso académico.
@@ -218,7 +373,78 @@ class Docencia(models.Model):
         ]
 
     def __str__(self):
-        return f"{self.profesor.nombre} - {self.modulo.nombre} ({self.modulo.ciclo.año_academico}) - {self.grupo.nombre}"
+        return f"{self.profesor.nombre} - {self.modulo.nombre} ({self.modulo.ciclo.año_academico_id}) - {self.grupo.nombre}"
+
+    # Grupo y módulo con los que se cargó la docencia, save() solo busca el año
+    # y la asignación si cambian
+    _grupo_modulo_guardados = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        docencia = super().from_db(db, field_names, values)
+        docencia._grupo_modulo_guardados = (
+            docencia.__dict__.get("grupo_id"),
+            docencia.__dict__.get("modulo_id"),
+        )
+        return docencia
+
+    def clean(self):
+        super().clean()
+        # Al cambiar de grupo o módulo los seguimientos de la docencia pasan a
+        # la otra asignación, que no puede tener ya seguimientos en esos meses
+        if (
+            self._grupo_modulo_guardados is not None
+            and self._grupo_modulo_guardados != (self.grupo_id, self.modulo_id)
+            and self.seguimientos.filter(
+                mes__in=Seguimiento.objects.filter(
+                    asignacion__grupo_id=self.grupo_id,
+                    asignacion__modulo_id=self.modulo_id,
+                ).values("mes")
+            ).exists()
+        ):
+            raise ValidationError(
+                "Ya hay seguimientos de ese grupo y módulo en los mismos meses que los de esta docencia, no se puede cambiar."
+            )
+
+    def save(self, *args, **kwargs):
+        """
+        Copia el año del módulo, asigna la docencia a su grupo y módulo y lleva
+        a los seguimientos el año y la asignación si han cambiado. La
+        asignación anterior se borra si se queda sin docencias. El módulo de
+        cada docencia está cacheado para el autocompletado.
+        """
+        adding = self._state.adding
+        guardados = self._grupo_modulo_guardados
+        asignacion_anterior = None
+        if self.asignacion_id is None or guardados != (self.grupo_id, self.modulo_id):
+            asignacion_anterior = self.asignacion_id
+            self.año_academico_id = (
+                Modulo.objects.filter(pk=self.modulo_id)
+                .values_list("ciclo__año_academico", flat=True)
+                .first()
+            )
+            self.asignacion_id = Asignacion.objects.get_or_create(
+                grupo_id=self.grupo_id, modulo_id=self.modulo_id
+            )[0].pk
+        super().save(*args, **kwargs)
+        self._grupo_modulo_guardados = (self.grupo_id, self.modulo_id)
+        if asignacion_anterior not in (None, self.asignacion_id):
+            copiados = {
+                "año_academico": self.año_academico_id,
+                "asignacion": self.asignacion_id,
+            }
+            self.seguimientos.exclude(**copiados).update(**copiados)
+            Asignacion.borrar_sin_docencias(asignacion_anterior)
+        if not adding and (guardados is None or guardados[1] != self.modulo_id):
+            invalidar_cache_docencias(self.pk)
+
+    def delete(self, *args, **kwargs):
+        docencia_id = self.pk
+        asignacion = self.asignacion_id
+        resultado = super().delete(*args, **kwargs)
+        Asignacion.borrar_sin_docencias(asignacion)
+        invalidar_cache_docencias(docencia_id)
+        return resultado
 
 
 class EstadoSeguimiento(models.TextChoices):
@@ -244,7 +470,9 @@ class MotivoNoCumpleSeguimiento(models.TextChoices):
 
 
 class Seguimiento(models.Model):
-    temario_completado = models.ManyToManyField(UnidadDeTrabajo, blank=True)
+    # Ids de las unidades de trabajo completadas, ordenados por número de tema.
+    # Se leen con la propia fila, sin tabla intermedia, ver unidades_completadas
+    temario_completado = ArrayField(models.IntegerField(), default=list, blank=True)
     temario_actual = models.ForeignKey(
         UnidadDeTrabajo, on_delete=models.RESTRICT, related_name="seguimientos"
     )
@@ -264,13 +492,35 @@ class Seguimiento(models.Model):
     docencia = models.ForeignKey(
         Docencia, on_delete=models.CASCADE, related_name="seguimientos"
     )
+    # Año de la docencia, copiado para filtrar por año sin pasar por docencia,
+    # módulo y ciclo. Lo mantienen los save() de Seguimiento, Docencia, Modulo y Ciclo.
+    # La tabla está particionada por él (ver particiones), no necesita índice
+    año_academico = models.ForeignKey(
+        AñoAcademico,
+        on_delete=models.CASCADE,
+        to_field="año_academico",
+        related_name="seguimientos",
+        editable=False,
+        db_index=False,
+    )
+    # Asignación de la docencia, para que la base de datos garantice un seguimiento
+    # al mes por grupo y módulo aunque lo impartan varios profesores
+    asignacion = models.ForeignKey(
+        Asignacion,
+        on_delete=models.CASCADE,
+        related_name="seguimientos",
+        editable=False,
+    )
     evaluacion = models.CharField(
         choices=EvaluacionSeguimiento.choices, blank=False, null=False
     )
-
-    @cached_property
-    def año_academico(self):
-        return self.docencia.modulo.ciclo.año_academico
+    # Orden del mes en el curso (septiembre es 1 y agosto 12), lo mantiene la
+    # base de datos para poder ordenar por él usando un índice
+    orden_mes_academico = models.GeneratedField(
+        expression=(models.F("mes") + 3) % 12 + 1,
+        output_field=models.IntegerField(),
+        db_persist=True,
+    )
 
     @cached_property
     def profesor(self):
@@ -278,15 +528,41 @@ class Seguimiento(models.Model):
 
     @cached_property
     def modulo(self):
-        return self.docencia.modulo
+        return self.asignacion.modulo
 
     @cached_property
     def grupo(self):
-        return self.docencia.grupo
+        return self.asignacion.grupo
+
+    @cached_property
+    def unidades_completadas(self):
+        """
+        Unidades de trabajo de temario_completado. Para muchos seguimientos
+        utils.cargar_unidades_completadas las trae con una sola consulta.
+        Los ids de unidades que ya no existen se saltan.
+        """
+        unidades = UnidadDeTrabajo.objects.in_bulk(self.temario_completado)
+        return [unidades[pk] for pk in self.temario_completado if pk in unidades]
 
     def __str__(self):
         return f"Seguimiento {self.docencia} - Mes {self.mes}"
 
+    def copiar_de_docencia(self):
+        self.año_academico_id = self.docencia.año_academico_id
+        self.asignacion_id = self.docencia.asignacion_id
+
+    def save(self, *args, **kwargs):
+        self.copiar_de_docencia()
+        super().save(*args, **kwargs)
+
+    def validate_constraints(self, exclude=None):
+        # La asignación no está en los formularios pero sale de la docencia,
+        # así el admin avisa del seguimiento repetido en vez de fallar al guardar
+        if exclude is not None and self.docencia_id and "docencia" not in exclude:
+            self.copiar_de_docencia()
+            exclude = set(exclude) - {"asignacion", "año_academico"}
+        super().validate_constraints(exclude=exclude)
+
     def get_motivo_display(self):
         return MotivoNoCumpleSeguimiento(self.motivo_no_cumple_programacion).label
 
@@ -315,15 +591,27 @@ class Seguimiento(models.Model):
                 )
 
     class Meta:
-        # Garantizar un seguimiento al mes por docencia
+        # Garantizar un seguimiento al mes por docencia y por asignación. En una
+        # tabla particionada las restricciones únicas tienen que incluir el año,
+        # la docencia y la asignación ya son de un solo año
         constraints = [
             models.UniqueConstraint(
-                fields=["docencia", "mes"], name="docencia_mes_unicos"
-            )
+                fields=["docencia", "mes", "año_academico"],
+                name="docencia_mes_unicos",
+            ),
+            models.UniqueConstraint(
+                fields=["asignacion", "mes", "año_academico"],
+                name="asignacion_mes_unicos",
+                violation_error_message="Ya existe un seguimiento para este mes, grupo y módulo.",
+            ),
         ]
         indexes = [
             models.Index(fields=["mes"]),
             models.Index(fields=["docencia", "mes"]),
+            models.Index(fields=["orden_mes_academico"]),
+            # Para buscar los seguimientos con una unidad completada
+            # (temario_completado__contains), p. ej. al borrar la unidad
+            GinIndex(fields=["temario_completado"], name="seguimiento_temario_gin_idx"),
         ]
 
 
@@ -380,3 +668,112 @@ Este es un correo automático, por favor no responda a esta dirección.""",
 
     class Meta:
         verbose_name = "Configuración de Email de Recordatorio"
+
+
+class EstadoClonacion(models.TextChoices):
+    PENDIENTE = "PENDIENTE", "Pendiente"
+    EN_CURSO = "EN_CURSO", "En curso"
+    COMPLETADA = "COMPLETADA", "Completada"
+    CANCELADA = "CANCELADA", "Cancelada"
+    ERROR = "ERROR", "Error"
+
+
+class ClonacionAño(models.Model):
+    """
+    Clonación de un año académico que se ejecuta en segundo plano.
+    Guarda las filas copiadas de cada entidad, como lista de pares
+    [entidad, filas] en el orden en que se clonan, para la página de progreso.
+    """
+
+    año_original = models.ForeignKey(
+        AñoAcademico,
+        on_delete=models.CASCADE,
+        to_field="año_academico",
+        related_name="clonaciones",
+    )
+    nuevo_año = models.CharField(max_length=7, validators=[validate_año])
+    opcion = models.CharField(max_length=10)
+    estado = models.CharField(
+        max_length=10,
+        choices=EstadoClonacion.choices,
+        default=EstadoClonacion.PENDIENTE,
+    )
+    progreso = models.JSONField(default=list, blank=True)
+    cancelacion_solicitada = models.BooleanField(default=False)
+    mensaje = models.CharField(blank=True)
+    creada = models.DateTimeField(auto_now_add=True)
+    # Última vez que la clonación dio señales de vida, se actualiza con cada
+    # paso. Si pasa mucho sin cambiar es que el hilo murió (ver clonacion)
+    actualizada = models.DateTimeField(auto_now=True)
+    terminada = models.DateTimeField(null=True, blank=True)
+
+    @property
+    def en_marcha(self):
+        return self.estado in (EstadoClonacion.PENDIENTE, EstadoClonacion.EN_CURSO)
+
+    def __str__(self):
+        return f"Clonación {self.año_original} → {self.nuevo_año}"
+
+    class Meta:
+        verbose_name = "Clonación de Año Academico"
+        verbose_name_plural = "Clonaciones de Años Academicos"
+
+
+class EstadoPurga(models.TextChoices):
+    PENDIENTE = "PENDIENTE", "Pendiente"
+    EN_CURSO = "EN_CURSO", "En curso"
+    COMPLETADA = "COMPLETADA", "Completada"
+    ERROR = "ERROR", "Error"
+
+
+class PurgaAño(models.Model):
+    """
+    Borrado de un año académico que se ejecuta en segundo plano. Guarda las
+    filas borradas de cada tabla, como lista de pares [entidad, filas], para
+    la página de progreso. El año se guarda como texto porque se borra.
+    """
+
+    año_academico = models.CharField(max_length=7)
+    estado = models.CharField(
+        max_length=10,
+        choices=EstadoPurga.choices,
+        default=EstadoPurga.PENDIENTE,
+    )
+    progreso = models.JSONField(default=list, blank=True)
+    mensaje = models.CharField(blank=True)
+    creada = models.DateTimeField(auto_now_add=True)
+    terminada = models.DateTimeField(null=True, blank=True)
+
+    @property
+    def en_marcha(self):
+        return self.estado in (EstadoPurga.PENDIENTE, EstadoPurga.EN_CURSO)
+
+    def __str__(self):
+        return f"Borrado del año académico {self.año_academico}"
+
+    class Meta:
+        verbose_name = "Borrado de Año Academico"
+        verbose_name_plural = "Borrados de Años Academicos"
+
+
+class AñoArchivado(models.Model):
+    """
+    Copia de solo lectura de un año académico cerrado, que ya no está en las
+    tablas de trabajo. Los seguimientos del año se guardan en datos como JSON
+    por líneas comprimido con gzip, uno por línea, y el resto de filas que se
+    borraron con el año en catalogo, con el mismo formato (ver archivo).
+    """
+
+    año_academico = models.CharField(max_length=7, primary_key=True)
+    archivado = models.DateTimeField(auto_now_add=True)
+    num_seguimientos = models.PositiveIntegerField(default=0)
+    datos = models.BinaryField()
+    catalogo = models.BinaryField(default=bytes)
+
+    def __str__(self):
+        return self.año_academico
+
+    class Meta:
+        verbose_name = "Año Académico Archivado"
+        verbose_name_plural = "Años Académicos Archivados"
+        ordering = ["-año_academico"]
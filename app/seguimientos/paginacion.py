@@ -0,0 +1,72 @@
+"""
+Paginación del admin con recuentos aproximados.
+
+Contar exactamente las filas de un listado grande obliga a recorrer todo el
+join en cada página. Por encima de un umbral basta con la estimación del
+planificador de Postgres, que se obtiene sin leer la tabla: pg_class.reltuples
+(sumado por particiones si la tabla está particionada) si el listado es la
+tabla tal cual y el EXPLAIN de la consulta si tiene filtros, joins o GROUP BY.
+"""
+
+import json
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+def estimar_filas(queryset):
+    """
+    Devuelve las filas que el planificador estima para el queryset, o None si
+    la base de datos no es Postgres o la tabla no se ha analizado nunca.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        query = queryset.query
+        # Solo sin filtros, DISTINCT, joins ni GROUP BY las filas del listado son
+        # las de la tabla. Django guarda las condiciones del HAVING en el where
+        # hasta compilar la consulta, así que también van por el EXPLAIN
+        if (
+            not query.where
+            and not query.distinct
+            and len(query.alias_map) <= 1
+            and not query.group_by
+        ):
+            # Una tabla particionada no tiene filas propias, las suyas son la
+            # suma de las de sus particiones. reltuples es -1 hasta el primer
+            # ANALYZE o VACUUM de la tabla
+            cursor.execute(
+                "SELECT CASE WHEN tabla.relkind = 'p' THEN ("
+                "SELECT sum(particion.reltuples) FROM pg_inherits "
+                "JOIN pg_class particion ON particion.oid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = tabla.oid AND particion.reltuples >= 0"
+                ") ELSE nullif(tabla.reltuples, -1) END "
+                "FROM pg_class tabla WHERE tabla.oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            fila = cursor.fetchone()
+            return int(fila[0]) if fila and fila[0] is not None else None
+        sql, params = queryset.order_by().query.sql_with_params()
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class PaginadorConteoEstimado(Paginator):
+    """
+    Paginator que usa la estimación del planificador cuando pasa de
+    ADMIN_CONTEO_EXACTO_HASTA filas y el COUNT(*) exacto por debajo.
+    Con la estimación el número de páginas es aproximado.
+    """
+
+    @cached_property
+    def count(self):
+        estimadas = estimar_filas(self.object_list)
+        if estimadas is None or estimadas <= settings.ADMIN_CONTEO_EXACTO_HASTA:
+            return super().count
+        return estimadas
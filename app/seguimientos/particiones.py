@@ -0,0 +1,45 @@
+"""
+Particiones por año académico de la tabla de seguimientos.
+
+La tabla de seguimientos está particionada en Postgres por LIST del año
+académico, con una partición por año. Casi todas las consultas filtran por
+el año actual, así que Postgres solo lee la partición de ese año y sus
+índices, que son pequeños, y lo que se inserta cada mes solo toca los índices
+de la partición del año en curso. Un año viejo se borra entero sin recorrer
+sus filas.
+
+La partición de un año la crea un trigger de la base de datos al insertar el
+AñoAcademico (migración 0035_trigger_particiones), así existe aunque el año
+no pase por save(): bulk_create, loaddata o SQL. Se borra con el año.
+"""
+
+from django.db import connection
+
+TABLA_SEGUIMIENTOS = "seguimientos_seguimiento"
+
+
+def nombre_particion(año):
+    """Nombre de la tabla de la partición del año, p. ej. seguimientos_seguimiento_2024_25"""
+    return f"{TABLA_SEGUIMIENTOS}_{año.replace('-', '_')}"
+
+
+def borrar_particion(año):
+    """
+    Borra la partición del año con todos sus seguimientos, sin recorrerlos
+    fila a fila. Devuelve cuántos tenía.
+
+    Bloquea la tabla de seguimientos entera hasta el final de la transacción.
+    Postgres no deja borrarla si tiene comprobaciones de claves ajenas
+    diferidas pendientes, quien llama tiene que haberlas hecho antes.
+    """
+    if connection.vendor != "postgresql":
+        return 0
+    particion = connection.ops.quote_name(nombre_particion(año))
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s)", [particion])
+        if cursor.fetchone()[0] is None:
+            return 0
+        cursor.execute(f"SELECT count(*) FROM {particion}")
+        filas = cursor.fetchone()[0]
+        cursor.execute(f"DROP TABLE {particion}")
+    return filas
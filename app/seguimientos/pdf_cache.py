@@ -0,0 +1,132 @@
+"""
+Caché en disco de los informes PDF de seguimientos.
+
+Los informes se guardan con el nombre de la huella de la selección, que
+incluye todos los datos que se pintan en el informe y la versión de la
+plantilla, así que cualquier cambio en un seguimiento (o en su profesor,
+módulo, grupo o temario) genera una huella distinta y el informe se vuelve
+a generar. El tamaño total se limita expulsando los informes menos usados.
+"""
+
+import hashlib
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db.models import BooleanField, F, Func, OuterRef
+from django.template.loader import get_template
+
+from .models import UnidadDeTrabajo
+
+# Campos que pinta la plantilla, si cambia alguno el informe es distinto
+CAMPOS_HUELLA = [
+    "pk",
+    "mes",
+    "evaluacion",
+    "estado",
+    "justificacion_estado",
+    "cumple_programacion",
+    "motivo_no_cumple_programacion",
+    "justificacion_cumple_programacion",
+    "ultimo_contenido_impartido",
+    "temario_actual__numero_tema",
+    "temario_actual__titulo",
+    "docencia__profesor__nombre",
+    "docencia__grupo__nombre",
+    "docencia__grupo__ciclo__nombre",
+    "docencia__modulo__nombre",
+    "docencia__modulo__ciclo__nombre",
+    "año_academico",
+]
+
+
+class EnArray(Func):
+    """valor = ANY(array), Postgres busca cada elemento con el índice del valor"""
+
+    template = "%(expressions)s)"
+    arg_joiner = " = ANY("
+    output_field = BooleanField()
+
+
+@lru_cache
+def version_plantilla(*nombres_plantillas):
+    """Hash del código de las plantillas, se calcula una vez por proceso"""
+    version = hashlib.sha256()
+    for nombre in nombres_plantillas:
+        version.update(get_template(nombre).template.source.encode())
+    return version.hexdigest()
+
+
+def huella_informe(queryset, version, title):
+    """
+    Calcula la huella de un informe con una sola consulta que trae los datos
+    que se pintan de cada seguimiento, sin instanciar los modelos.
+    """
+    # Las unidades del temario completado, por si se renombran
+    unidades_completadas = UnidadDeTrabajo.objects.filter(
+        EnArray(F("pk"), OuterRef("temario_completado"))
+    ).order_by("numero_tema")
+    filas = (
+        queryset.order_by("pk")
+        .values_list(*CAMPOS_HUELLA)
+        .annotate(
+            temas=ArraySubquery(unidades_completadas.values("numero_tema")),
+            titulos=ArraySubquery(unidades_completadas.values("titulo")),
+        )
+    )
+    huella = hashlib.sha256()
+    huella.update(version.encode())
+    huella.update(title.encode())
+    for fila in filas.iterator(chunk_size=2000):
+        huella.update(repr(fila).encode())
+    return huella.hexdigest()
+
+
+def _directorio():
+    directorio = Path(settings.PDF_CACHE_DIR)
+    directorio.mkdir(parents=True, exist_ok=True)
+    return directorio
+
+
+def leer_informe(huella):
+    """Devuelve el PDF cacheado o None, marcándolo como usado recientemente"""
+    ruta = _directorio() / f"{huella}.pdf"
+    try:
+        contenido = ruta.read_bytes()
+    except FileNotFoundError:
+        return None
+    # La fecha de modificación sirve como marca de último uso para el LRU
+    os.utime(ruta)
+    return contenido
+
+
+def guardar_informe(huella, contenido):
+    """Guarda el PDF de forma atómica y expulsa los menos usados si hace falta"""
+    if settings.PDF_CACHE_MAX_BYTES <= 0:
+        return
+    directorio = _directorio()
+    descriptor, ruta_temporal = tempfile.mkstemp(dir=directorio, suffix=".tmp")
+    with os.fdopen(descriptor, "wb") as fichero:
+        fichero.write(contenido)
+    os.replace(ruta_temporal, directorio / f"{huella}.pdf")
+    _expulsar(directorio, settings.PDF_CACHE_MAX_BYTES)
+
+
+def _expulsar(directorio, max_bytes):
+    """Borra los informes menos usados hasta que la caché quepa en max_bytes"""
+    informes = []
+    for ruta in directorio.glob("*.pdf"):
+        try:
+            stat = ruta.stat()
+        except FileNotFoundError:
+            continue
+        informes.append((stat.st_mtime, stat.st_size, ruta))
+    total = sum(tamaño for _, tamaño, _ in informes)
+    for _, tamaño, ruta in sorted(informes, key=lambda informe: informe[0]):
+        if total <= max_bytes:
+            break
+        ruta.unlink(missing_ok=True)
+        total -= tamaño
@@ -0,0 +1,317 @@
+import atexit
+import calendar
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from itertools import groupby
+
+from django.conf import settings
+from django.db.models import F
+from django.template.loader import get_template, render_to_string
+from django.utils import timezone
+from pypdf import PdfReader, PdfWriter
+from weasyprint import CSS, HTML
+from weasyprint.text.fonts import FontConfiguration
+
+from .pdf_cache import (
+    guardar_informe,
+    huella_informe,
+    leer_informe,
+    version_plantilla,
+)
+from .utils import recorrer_con_unidades_completadas
+
+PLANTILLA_PDF = "admin/seguimiento_pdf_export.html"
+HOJA_ESTILOS_PDF = "admin/seguimiento_pdf_export.css"
+TITULO_INFORME = "Informe de Seguimientos"
+# Filas que se leen de la base de datos en cada viaje al recorrer el queryset
+ITERATOR_CHUNK_SIZE = 500
+
+
+def preparar_queryset(queryset):
+    """
+    Prepara el queryset del informe: carga de una vez toda la cadena de
+    relaciones que pinta la plantilla y ordena por año y mes académico en
+    la base de datos.
+    """
+    return (
+        queryset.select_related(
+            "docencia__profesor",
+            "asignacion__grupo__ciclo",
+            "asignacion__modulo__ciclo",
+            "temario_actual",
+            "año_academico",
+        )
+        .annotate(año=F("año_academico"))
+        .order_by("año", "orden_mes_academico", "pk")
+    )
+
+
+def agrupar_por_año_y_mes(queryset):
+    """
+    Recorre el queryset ordenado y va devolviendo bloques
+    (año, mes, seguimientos) en orden académico (empezando en septiembre).
+    Solo hay en memoria los seguimientos del bloque actual.
+    """
+    seguimientos = recorrer_con_unidades_completadas(
+        preparar_queryset(queryset).iterator(chunk_size=ITERATOR_CHUNK_SIZE),
+        ITERATOR_CHUNK_SIZE,
+    )
+    for (año, num_mes), bloque in groupby(seguimientos, key=lambda s: (s.año, s.mes)):
+        yield año, calendar.month_name[num_mes].title(), list(bloque)
+
+
+class RenderizadorPDF:
+    """
+    Renderiza fragmentos HTML del informe a PDF reutilizando entre llamadas
+    la hoja de estilos ya parseada y la configuración de fuentes, en lugar de
+    volver a parsear el CSS y resolver las fuentes en cada render.
+    """
+
+    def __init__(self, hoja_estilos):
+        self.font_config = FontConfiguration()
+        self.css = CSS(string=hoja_estilos, font_config=self.font_config)
+
+    def calentar(self):
+        """Renderiza un documento mínimo para que se carguen las fuentes"""
+        self.renderizar("<p>.</p>")
+
+    def renderizar(self, html_string):
+        return HTML(string=html_string).write_pdf(
+            stylesheets=[self.css], font_config=self.font_config
+        )
+
+
+# Cada proceso (el del servidor o los workers del pool) tiene su renderizador
+_renderizador = None
+
+
+def leer_hoja_estilos():
+    return get_template(HOJA_ESTILOS_PDF).template.source
+
+
+def obtener_renderizador(hoja_estilos=None):
+    """Devuelve el renderizador del proceso, creándolo y calentándolo la primera vez"""
+    global _renderizador
+    if _renderizador is None:
+        _renderizador = RenderizadorPDF(hoja_estilos or leer_hoja_estilos())
+        _renderizador.calentar()
+    return _renderizador
+
+
+def _iniciar_worker(hoja_estilos):
+    obtener_renderizador(hoja_estilos)
+
+
+def renderizar_parte(html_string):
+    """Renderiza un fragmento HTML del informe a PDF, se ejecuta en los workers"""
+    return obtener_renderizador().renderizar(html_string)
+
+
+def html_numeracion(paginas):
+    """HTML de `paginas` páginas en blanco con solo el número de página en el pie"""
+    return '<div class="numeracion"></div>' * paginas
+
+
+def numerar_paginas(writer):
+    """
+    Pone "Página X de N" en cada página del informe ya unido. Las partes se
+    renderizan por separado y cada una numeraría desde 1, así que los números
+    se renderizan aparte, con el total de páginas del informe, y se
+    superponen página a página.
+    """
+    numeracion = PdfReader(
+        BytesIO(obtener_renderizador().renderizar(html_numeracion(len(writer.pages))))
+    )
+    for pagina, numero in zip(writer.pages, numeracion.pages):
+        pagina.merge_page(numero)
+
+
+def _htmls_por_bloque(bloques, total, title, fecha_datos):
+    """
+    Genera el HTML de cada bloque de forma perezosa, así solo hay en memoria
+    el HTML de los bloques que se están renderizando.
+    La cabecera se pinta en el primer bloque y el pie en el último, por eso
+    se mira un bloque por delante.
+    """
+    bloques = iter(bloques)
+    siguiente = next(bloques, (None, None, []))
+    año_anterior = None
+    indice = 0
+    while siguiente is not None:
+        año, mes, seguimientos = siguiente
+        siguiente = next(bloques, None)
+        context = {
+            "seguimientos": {año: {mes: seguimientos}} if seguimientos else {},
+            "count": total,
+            "title": title,
+            "fecha_datos": fecha_datos,
+            "cabecera": indice == 0,
+            "pie": siguiente is None,
+            "nuevo_año": año != año_anterior,
+        }
+        año_anterior = año
+        indice += 1
+        yield render_to_string(PLANTILLA_PDF, context)
+
+
+# Pool de procesos compartido por todas las exportaciones del proceso. Se crea
+# la primera vez que hace falta, así los workers arrancan y calientan el
+# renderizador una sola vez y no en cada informe
+_pool = None
+_pool_clave = None
+_pool_lock = threading.Lock()
+
+
+def obtener_pool(workers):
+    """
+    Devuelve el pool de procesos del servidor, creándolo si no existe o si
+    cambió el número de workers o la hoja de estilos con la que se inician.
+    Si se rompe (p. ej. porque murió un worker) lo descarta quien lo usa al
+    recibir BrokenProcessPool.
+    """
+    global _pool, _pool_clave
+    hoja_estilos = leer_hoja_estilos()
+    clave = (workers, hoja_estilos)
+    with _pool_lock:
+        if _pool is not None and _pool_clave != clave:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_iniciar_worker,
+                initargs=(hoja_estilos,),
+            )
+            _pool_clave = clave
+        return _pool
+
+
+def descartar_pool(pool=None):
+    """
+    Cierra el pool de procesos para que la siguiente exportación cree otro.
+    Si se pasa `pool` solo se cierra si sigue siendo el actual.
+    """
+    global _pool, _pool_clave
+    with _pool_lock:
+        if _pool is None or (pool is not None and pool is not _pool):
+            return
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+        _pool_clave = None
+
+
+atexit.register(descartar_pool)
+
+
+def _renderizar_en_paralelo(htmls, workers):
+    """
+    Renderiza las partes en el pool de procesos manteniendo como mucho
+    `workers` partes en vuelo, y las devuelve en orden. Si el pool está roto,
+    al enviar una parte o al recoger su resultado, se cambia por uno nuevo y
+    se vuelven a enviar las partes en vuelo. Solo se reintenta una vez por
+    exportación, si el pool nuevo también se rompe se lanza BrokenProcessPool.
+    """
+    executor = obtener_pool(workers)
+    # Partes en vuelo en orden, (html, futuro)
+    pendientes = deque()
+    reiniciado = False
+
+    def reiniciar_pool():
+        nonlocal executor, reiniciado
+        descartar_pool(executor)
+        if reiniciado:
+            return False
+        reiniciado = True
+        executor = obtener_pool(workers)
+        for i, (html_string, _) in enumerate(pendientes):
+            pendientes[i] = (
+                html_string,
+                executor.submit(renderizar_parte, html_string),
+            )
+        return True
+
+    def enviar(html_string):
+        try:
+            futuro = executor.submit(renderizar_parte, html_string)
+        except BrokenProcessPool:
+            if not reiniciar_pool():
+                raise
+            futuro = executor.submit(renderizar_parte, html_string)
+        pendientes.append((html_string, futuro))
+
+    def recoger():
+        while True:
+            try:
+                resultado = pendientes[0][1].result()
+            except BrokenProcessPool:
+                if not reiniciar_pool():
+                    raise
+                continue
+            pendientes.popleft()
+            return resultado
+
+    try:
+        for html_string in htmls:
+            enviar(html_string)
+            if len(pendientes) >= workers:
+                yield recoger()
+        while pendientes:
+            yield recoger()
+    finally:
+        # Si la exportación se corta no se dejan partes en cola en el pool
+        for _, futuro in pendientes:
+            futuro.cancel()
+
+
+def generar_informe_pdf(queryset, title=TITULO_INFORME, workers=None):
+    """
+    Genera el informe PDF de los seguimientos del queryset.
+
+    En vez de maquetar un único documento con toda la selección, cada bloque
+    (año académico, mes) se renderiza como un PDF independiente y después se
+    concatenan, de forma que la memoria de WeasyPrint es proporcional a un
+    bloque y no al informe completo. Si `workers` (o `PDF_EXPORT_WORKERS`)
+    es mayor que 1 los bloques se renderizan en paralelo en varios procesos.
+    Los números de página se ponen al final, sobre el informe ya unido.
+    """
+    if workers is None:
+        workers = settings.PDF_EXPORT_WORKERS
+    # El informe se guarda en la caché y se sirve mientras los datos no
+    # cambien, así que no lleva la hora a la que se descarga sino la de los
+    # datos que contiene, que es la de cuando se generó
+    fecha_datos = timezone.localtime()
+    total = queryset.count()
+    htmls = _htmls_por_bloque(
+        agrupar_por_año_y_mes(queryset), total, title, fecha_datos
+    )
+
+    if workers > 1:
+        partes = _renderizar_en_paralelo(htmls, workers)
+    else:
+        partes = (renderizar_parte(html_string) for html_string in htmls)
+
+    writer = PdfWriter()
+    for parte in partes:
+        writer.append(BytesIO(parte))
+    numerar_paginas(writer)
+    salida = BytesIO()
+    writer.write(salida)
+    return salida.getvalue()
+
+
+def obtener_informe_pdf(queryset, title=TITULO_INFORME):
+    """
+    Devuelve el informe PDF del queryset, sirviéndolo desde la caché en disco
+    si ya se generó un informe con los mismos datos y la misma plantilla.
+    """
+    huella = huella_informe(
+        queryset, version_plantilla(PLANTILLA_PDF, HOJA_ESTILOS_PDF), title
+    )
+    pdf_file = leer_informe(huella)
+    if pdf_file is None:
+        pdf_file = generar_informe_pdf(queryset, title)
+        guardar_informe(huella, pdf_file)
+    return pdf_file
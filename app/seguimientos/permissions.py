@@ -26,17 +26,13 @@ class TieneDocenciaConMismoGrupoModulo(permissions.BasePermission):
             if not docencia_id:
                 return False
 
+            # Comprueba si el profesor tiene alguna docencia en la asignación
+            # (grupo y módulo) de la docencia para la que se crea el seguimiento
             try:
-                # Obtiene la docencia para la que se está creando el seguimiento
-                docencia_objetivo = Docencia.objects.get(id=docencia_id)
-
-                # Comprueba si el profesor tiene alguna docencia con el mismo grupo y módulo
                 return Docencia.objects.filter(
-                    profesor=request.user,
-                    grupo=docencia_objetivo.grupo,
-                    modulo=docencia_objetivo.modulo,
+                    profesor=request.user, asignacion__docencias=docencia_id
                 ).exists()
-            except Docencia.DoesNotExist:
+            except (TypeError, ValueError):
                 return False
 
         # Para operaciones de listado, permite el acceso (se filtrará en get_queryset)
@@ -48,11 +44,7 @@ class TieneDocenciaConMismoGrupoModulo(permissions.BasePermission):
         Asegura que el profesor tenga una docencia con el mismo grupo y módulo
         que la docencia del seguimiento.
         """
-        # Obtiene el grupo y módulo de la docencia del seguimiento
-        grupo = obj.docencia.grupo
-        modulo = obj.docencia.modulo
-
-        # Comprueba si el profesor tiene una docencia con el mismo grupo y módulo
+        # El seguimiento es de la asignación (grupo y módulo) de su docencia
         return Docencia.objects.filter(
-            profesor=request.user, grupo=grupo, modulo=modulo
+            profesor=request.user, asignacion=obj.asignacion_id
         ).exists()
@@ -0,0 +1,189 @@
+"""
+Borrado de un año académico completo.
+
+El borrado normal de Django carga en memoria todos los objetos que cuelgan del
+año para enviar señales y pintar la página de confirmación. Aquí cada tabla se
+borra de abajo arriba con un único DELETE ... WHERE id IN (SELECT ...), sin
+cargar nada, y todo en una transacción. No se envían señales de borrado: la
+única que hay, la que quita las unidades borradas del temario completado, no
+hace falta porque los seguimientos se borran con ellas.
+
+Los seguimientos del año no se borran fila a fila, se borra su partición al
+final. Borrarla bloquea la tabla de seguimientos entera hasta que se confirma
+la transacción, así que se deja para el último momento y el bloqueo dura solo
+lo que tarda el commit. Las claves ajenas son diferidas y no se comprueban
+hasta entonces, cuando las filas de la partición ya no existen.
+
+El borrado se puede lanzar en segundo plano con un PurgaAño, que guarda las
+filas borradas de cada tabla y el error si falla, para la página de progreso.
+"""
+
+import logging
+import threading
+
+from django.db import connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .cache_catalogo import (
+    invalidar_cache_años,
+    invalidar_cache_docencias,
+    invalidar_cache_temario,
+)
+from .models import (
+    Asignacion,
+    AñoAcademico,
+    Ciclo,
+    ClonacionAño,
+    Docencia,
+    EstadoPurga,
+    Grupo,
+    Modulo,
+    PurgaAño,
+    Seguimiento,
+    UnidadDeTrabajo,
+)
+from .particiones import borrar_particion
+
+logger = logging.getLogger(__name__)
+
+
+def querysets_año(año):
+    """Querysets de lo que se borra con el año, en el orden en que se borra"""
+    docencias = Docencia.objects.filter(
+        Q(año_academico=año) | Q(grupo__ciclo__año_academico=año)
+    )
+    seguimientos = Seguimiento.objects.filter(docencia__in=docencias)
+    # El temario completado va en la fila de cada seguimiento, si queda el id de
+    # una unidad borrada en un seguimiento de otro año se ignora al leerlo
+    return [
+        ("seguimientos", seguimientos),
+        ("docencias", docencias),
+        (
+            "asignaciones",
+            Asignacion.objects.filter(
+                Q(modulo__ciclo__año_academico=año) | Q(grupo__ciclo__año_academico=año)
+            ),
+        ),
+        (
+            "unidades",
+            UnidadDeTrabajo.objects.filter(modulo__ciclo__año_academico=año),
+        ),
+        ("modulos", Modulo.objects.filter(ciclo__año_academico=año)),
+        ("grupos", Grupo.objects.filter(ciclo__año_academico=año)),
+        ("ciclos", Ciclo.objects.filter(año_academico=año)),
+        ("clonaciones", ClonacionAño.objects.filter(año_original=año)),
+    ]
+
+
+def contar_año(año):
+    """Filas que se borrarían de cada tabla, con una consulta de recuento por tabla"""
+    return {entidad: queryset.count() for entidad, queryset in querysets_año(año)}
+
+
+def _borrar(queryset):
+    """
+    Borra las filas del queryset con un DELETE, sin cargarlas ni enviar
+    señales. Devuelve cuántas ha borrado.
+    """
+    modelo = queryset.model
+    conexion = connections[queryset.db]
+    subconsulta, params = queryset.values("pk").query.sql_with_params()
+    tabla = conexion.ops.quote_name(modelo._meta.db_table)
+    clave = conexion.ops.quote_name(modelo._meta.pk.column)
+    with conexion.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {tabla} WHERE {clave} IN ({subconsulta})", params)
+        return cursor.rowcount
+
+
+@transaction.atomic
+def purgar_año_academico(año, al_avanzar=None):
+    """
+    Borra el año y todo lo que depende de él. Si era el año actual, pasa a
+    serlo el año más alto que quede. Devuelve las filas borradas de cada tabla.
+    al_avanzar(borradas) se llama tras borrar cada tabla.
+    """
+    # Postgres no deja borrar la partición si tiene comprobaciones de claves
+    # ajenas pendientes de antes de la purga, se hacen ya. Las que deje la
+    # purga se comprueban al confirmar, con la partición ya borrada
+    connections[Seguimiento.objects.db].check_constraints()
+    querysets = querysets_año(año)
+    # Ids de lo que tiene claves propias en la caché del temario, para invalidarlas
+    cacheados = dict(querysets)
+    modulos = list(cacheados["modulos"].values_list("pk", flat=True))
+    docencias = list(cacheados["docencias"].values_list("pk", flat=True))
+    borradas = {}
+    for entidad, queryset in querysets:
+        if entidad == "seguimientos":
+            # Los del año se van con su partición, aquí solo los de docencias
+            # de otro año con un grupo de este
+            queryset = queryset.exclude(año_academico=año)
+        borradas[entidad] = _borrar(queryset)
+        if al_avanzar:
+            al_avanzar(dict(borradas))
+
+    era_actual = AñoAcademico.objects.filter(pk=año.pk, actual=True).exists()
+    _borrar(AñoAcademico.objects.filter(pk=año.pk))
+    if era_actual:
+        siguiente = AñoAcademico.objects.order_by("-año_academico").first()
+        if siguiente:
+            AñoAcademico.objects.filter(pk=siguiente.pk).update(actual=True)
+    borradas["seguimientos"] += borrar_particion(año.pk)
+    if al_avanzar:
+        al_avanzar(dict(borradas))
+    invalidar_cache_años()
+    invalidar_cache_temario(*modulos)
+    invalidar_cache_docencias(*docencias)
+    return borradas
+
+
+def lanzar_purga(purga):
+    """Ejecuta el borrado en un hilo aparte cuando se confirme la transacción actual"""
+    transaction.on_commit(
+        lambda: threading.Thread(
+            target=_purgar_en_hilo, args=(purga.pk,), daemon=True
+        ).start()
+    )
+
+
+def _purgar_en_hilo(purga_id):
+    try:
+        ejecutar_purga(purga_id)
+    finally:
+        connections.close_all()
+
+
+def ejecutar_purga(purga_id):
+    """Ejecuta un borrado pendiente guardando su progreso y su resultado"""
+    purga = PurgaAño.objects.get(pk=purga_id)
+    purga.estado = EstadoPurga.EN_CURSO
+    purga.save(update_fields=["estado"])
+    pendiente = PurgaAño.objects.filter(pk=purga_id)
+
+    def al_avanzar(borradas):
+        # Por la otra conexión se confirma ya y no al terminar la transacción
+        pendiente.using("progreso").update(progreso=list(borradas.items()))
+
+    try:
+        año = AñoAcademico.objects.get(pk=purga.año_academico)
+        borradas = purgar_año_academico(año, al_avanzar)
+    except AñoAcademico.DoesNotExist:
+        purga.estado = EstadoPurga.ERROR
+        purga.progreso = []
+        purga.mensaje = f"El año académico {purga.año_academico} ya no existe"
+    except Exception as e:
+        # Si falla no se borra nada y el año sigue apareciendo en el admin
+        logger.exception("Error al borrar el año académico %s", purga.año_academico)
+        purga.estado = EstadoPurga.ERROR
+        purga.progreso = []
+        purga.mensaje = f"Error al borrar el año académico, no se ha borrado nada: {e}"
+    else:
+        purga.estado = EstadoPurga.COMPLETADA
+        purga.progreso = list(borradas.items())
+        purga.mensaje = (
+            f"Año académico {purga.año_academico} borrado junto con "
+            f"{sum(borradas.values())} filas relacionadas"
+        )
+    purga.terminada = timezone.now()
+    purga.save(update_fields=["estado", "progreso", "mensaje", "terminada"])
+    return purga
@@ -1,3 +1,4 @@
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 from .models import (
     Seguimiento,
@@ -7,6 +8,7 @@ from .models import (
     UnidadDeTrabajo,
     Grupo,
     AñoAcademico,
+    AñoArchivado,
     Ciclo,
 )
 
@@ -17,6 +19,12 @@ class AñoAcademicoSerializer(serializers.ModelSerializer):
         fields = "año_academico"
 
 
+class AñoArchivadoSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AñoArchivado
+        fields = ["año_academico", "archivado", "num_seguimientos"]
+
+
 class CicloSerializer(serializers.ModelSerializer):
     class Meta:
         model = Ciclo
@@ -60,14 +68,31 @@ class DocenciaSerializer(serializers.ModelSerializer):
 
 
 class SeguimientoSerializer(serializers.ModelSerializer):
-    profesor = ProfesorSerializer(required=False)
-    modulo = ModuloSerializer(required=False)
-    grupo = GrupoSerializer(required=False)
+    # Salen de la docencia. Al ser de solo lectura DRF no comprueba con una consulta
+    # la restricción asignacion_mes_unicos antes de guardar, ver create
+    profesor = ProfesorSerializer(read_only=True)
+    modulo = ModuloSerializer(read_only=True)
+    grupo = GrupoSerializer(read_only=True)
 
     class Meta:
         model = Seguimiento
         fields = "__all__"
-        read_only_fields = ["profesor", "modulo", "grupo"]
+
+    def validate_temario_completado(self, value):
+        # Ids de unidades existentes, se guardan ordenados por número de tema
+        unidades = list(
+            UnidadDeTrabajo.objects.filter(pk__in=value)
+            .order_by("numero_tema", "pk")
+            .values_list("pk", flat=True)
+        )
+        inexistentes = [pk for pk in value if pk not in unidades]
+        if inexistentes:
+            raise serializers.ValidationError(
+                serializers.PrimaryKeyRelatedField.default_error_messages[
+                    "does_not_exist"
+                ].format(pk_value=inexistentes[0])
+            )
+        return unidades
 
     def validate(self, data):
         # Comprobar que el temario sea del modulo de la docencia
@@ -85,20 +110,8 @@ class SeguimientoSerializer(serializers.ModelSerializer):
             return data
         request = self.context["request"]
         if request.method == "POST":
-            # Comprobar que no existe un seguimiento para esa combinacion de mes - grupo - modulo
-            if docencia and mes:
-                existing_seguimiento = Seguimiento.objects.filter(
-                    docencia__grupo=docencia.grupo,
-                    docencia__modulo=docencia.modulo,
-                    mes=mes,
-                ).exists()
-
-                if existing_seguimiento:
-                    raise serializers.ValidationError(
-                        {
-                            "docencia": "Ya existe un seguimiento para este mes, grupo y módulo."
-                        }
-                    )
+            # Que no haya otro seguimiento del mes para el grupo y módulo lo garantiza
+            # la restricción asignacion_mes_unicos al guardar, ver create
             return data
         elif request.method in ["PUT", "PATCH"]:
             seguimiento = self.instance
@@ -110,6 +123,27 @@ class SeguimientoSerializer(serializers.ModelSerializer):
                 )
             return data
 
+    def create(self, validated_data):
+        # Si dos profesores del mismo grupo y módulo lo envían a la vez solo entra uno
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            # En la tabla particionada el error nombra el índice de la partición,
+            # no la restricción, así que se comprueba si ya existe el seguimiento
+            if not Seguimiento.objects.filter(
+                asignacion=validated_data["docencia"].asignacion_id,
+                mes=validated_data["mes"],
+            ).exists():
+                raise
+            raise serializers.ValidationError(
+                {
+                    "docencia": [
+                        "Ya existe un seguimiento para este mes, grupo y módulo."
+                    ]
+                }
+            )
+
 
 class RecordatorioSerializer(serializers.Serializer):
     docencias = serializers.ListField(
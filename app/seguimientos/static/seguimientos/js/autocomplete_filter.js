@@ -0,0 +1,34 @@
+// Convierte los filtros AutocompleteFilter del listado en select2 que buscan en el servidor.
+// Se espera a "load" porque jazzmin carga jQuery y select2 al final de la página.
+window.addEventListener("load", function () {
+  "use strict";
+  const $ = window.jQuery;
+
+  $(".autocomplete-filter").each(function () {
+    const $select = $(this);
+    $select.select2({
+      width: "100%",
+      allowClear: true,
+      placeholder: $select.data("placeholder"),
+      ajax: {
+        url: $select.data("url"),
+        dataType: "json",
+        delay: 250,
+        data: function (params) {
+          return { q: params.term, page: params.page };
+        },
+      },
+    });
+  });
+
+  // Los filtros vacíos no se envían para no dejar parámetros vacíos en la URL
+  $("#changelist-search").on("submit", function () {
+    $(this)
+      .find(".autocomplete-filter")
+      .each(function () {
+        if (!$(this).val()) {
+          $(this).prop("disabled", true);
+        }
+      });
+  });
+});
@@ -0,0 +1,94 @@
+"""Datos y comprobaciones comunes a los tests de seguimientos"""
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from seguimientos.models import (
+    AñoAcademico,
+    Ciclo,
+    Docencia,
+    Grupo,
+    Modulo,
+    Profesor,
+    Seguimiento,
+    UnidadDeTrabajo,
+)
+
+
+def entrar_como_admin(client):
+    """Crea un superusuario e inicia sesión con él en el cliente de pruebas"""
+    Profesor.objects.create_superuser(
+        email="admin@example.com", password="adminpassword", nombre="Admin User"
+    )
+    client.login(email="admin@example.com", password="adminpassword")
+
+
+def crear_docencia(
+    profesor=None,
+    año="2024-25",
+    ciclo="DAW",
+    grupo="DAW1A",
+    modulo="Programación",
+    unidades=1,
+):
+    """
+    Crea la cadena año académico → ciclo → grupo → módulo → unidades de
+    trabajo → docencia y devuelve la docencia. Lo que ya exista con esos
+    nombres se reutiliza. Las unidades de un módulo nuevo se llaman "Tema 1",
+    "Tema 2"... Sin profesor se usa profesor@example.com.
+    """
+    if profesor is None:
+        profesor, _ = Profesor.objects.get_or_create(
+            email="profesor@example.com", defaults={"nombre": "Juan Pérez"}
+        )
+    año, _ = AñoAcademico.objects.get_or_create(año_academico=año)
+    ciclo, _ = Ciclo.objects.get_or_create(nombre=ciclo, año_academico=año)
+    grupo, _ = Grupo.objects.get_or_create(
+        nombre=grupo, ciclo=ciclo, defaults={"curso": 1}
+    )
+    modulo, creado = Modulo.objects.get_or_create(
+        nombre=modulo, ciclo=ciclo, defaults={"curso": 1}
+    )
+    if creado:
+        for numero in range(1, unidades + 1):
+            UnidadDeTrabajo.objects.create(
+                numero_tema=numero, titulo=f"Tema {numero}", modulo=modulo
+            )
+    return Docencia.objects.create(profesor=profesor, grupo=grupo, modulo=modulo)
+
+
+def crear_seguimiento(docencia, mes=10, **campos):
+    """Crea un seguimiento de la docencia, por defecto en el primer tema del módulo"""
+    campos.setdefault("temario_actual", docencia.modulo.unidades_de_temario.first())
+    campos.setdefault("ultimo_contenido_impartido", "Contenido")
+    campos.setdefault("evaluacion", "PRIMERA")
+    return Seguimiento.objects.create(docencia=docencia, mes=mes, **campos)
+
+
+class ConsultasConstantesMixin:
+    """Para TestCase: comprueba que el número de consultas no depende de las filas"""
+
+    def contar_consultas(self, accion):
+        with CaptureQueriesContext(connection) as consultas:
+            accion()
+        return len(consultas)
+
+    def assertConsultasConstantes(self, crecer, *acciones, calentar=True):
+        """
+        Comprueba que cada acción hace las mismas consultas antes y después de
+        crecer(), que añade filas. Con calentar cada acción se hace una vez sin
+        contar antes de cada medida: la primera petición de la sesión o de cada
+        página hace consultas extra, y al añadir filas se invalida la caché.
+        """
+
+        def medir():
+            if calentar:
+                for accion in acciones:
+                    accion()
+            return [self.contar_consultas(accion) for accion in acciones]
+
+        pocas = medir()
+        crecer()
+        for accion, antes, despues in zip(acciones, pocas, medir()):
+            with self.subTest(accion=accion):
+                self.assertEqual(antes, despues)
@@ -1,21 +1,46 @@
-from django.test import TestCase, Client
+from datetime import timedelta
+from functools import partial
+from io import BytesIO
+
+import openpyxl
+from django.contrib.admin import site
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse
+from django.utils import timezone
 from django.contrib.messages import get_messages
 
+from seguimientos.admin import SeguimientoAdmin
+from seguimientos.clonacion import ejecutar_clonacion
+from seguimientos.purga import ejecutar_purga
+from seguimientos.tests.datos import (
+    ConsultasConstantesMixin,
+    crear_docencia,
+    crear_seguimiento,
+    entrar_como_admin,
+)
+
 from seguimientos.models import (
     AñoAcademico,
     Ciclo,
+    ClonacionAño,
     Docencia,
+    EstadoClonacion,
     Grupo,
     Modulo,
     Profesor,
+    PurgaAño,
+    Seguimiento,
     UnidadDeTrabajo,
 )
 
 
+@override_settings(CLONACION_EN_SEGUNDO_PLANO=False)
 class AñoAcademicoAdminTest(TestCase):
     """Test the AñoAcademico admin functionality, especially cloning."""
 
+    # La clonación escribe su progreso por la conexión "progreso"
+    databases = {"default", "progreso"}
+
     def setUp(self):
         self.client = Client()
         self.admin_user = Profesor.objects.create_superuser(
@@ -58,6 +83,10 @@ class AñoAcademicoAdminTest(TestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, f"Clonar año académico: {self.año_academico}")
+        self.assertEqual(
+            response.context["previsualizacion"],
+            {"ciclos": 1, "modulos": 1, "unidades": 1, "grupos": 1, "docencias": 1},
+        )
 
     def test_clone_cycles_only(self):
         """Test cloning only cycles to a new academic year."""
@@ -147,6 +176,120 @@ class AñoAcademicoAdminTest(TestCase):
             1,
         )
 
+    def test_clone_progress_page(self):
+        """Test the cloning redirects to a progress page with the summary."""
+        url = reverse(
+            "admin:ejecutar_clonacion", args=[self.año_academico.año_academico]
+        )
+        response = self.client.post(
+            url, {"nuevo_anio": "2023-24", "opcion_clonacion": "docencias"}, follow=True
+        )
+
+        clonacion = ClonacionAño.objects.get()
+        self.assertRedirects(
+            response, reverse("admin:progreso_clonacion", args=[clonacion.pk])
+        )
+        self.assertEqual(clonacion.estado, EstadoClonacion.COMPLETADA)
+        self.assertContains(
+            response, "Ciclos, módulos y docencias clonados al año académico 2023-24"
+        )
+        self.assertContains(response, "<td>Docencias</td>", html=True)
+
+    def test_cancel_clone(self):
+        """Test a cancelled clone is rolled back."""
+        clonacion = ClonacionAño.objects.create(
+            año_original=self.año_academico, nuevo_año="2023-24", opcion="docencias"
+        )
+        response = self.client.post(
+            reverse("admin:cancelar_clonacion", args=[clonacion.pk])
+        )
+        self.assertEqual(response.status_code, 302)
+
+        clonacion = ejecutar_clonacion(clonacion.pk)
+
+        self.assertEqual(clonacion.estado, EstadoClonacion.CANCELADA)
+        self.assertFalse(AñoAcademico.objects.filter(año_academico="2023-24").exists())
+        self.assertEqual(Ciclo.objects.count(), 1)
+
+    def test_stale_clone_is_marked_as_error(self):
+        """Test a clone whose thread died stops blocking new clones to the year."""
+        clonacion = ClonacionAño.objects.create(
+            año_original=self.año_academico,
+            nuevo_año="2023-24",
+            opcion="ciclos",
+            estado=EstadoClonacion.EN_CURSO,
+        )
+        ClonacionAño.objects.filter(pk=clonacion.pk).update(
+            actualizada=timezone.now() - timedelta(hours=1)
+        )
+        url = reverse(
+            "admin:ejecutar_clonacion", args=[self.año_academico.año_academico]
+        )
+        response = self.client.post(
+            url, {"nuevo_anio": "2023-24", "opcion_clonacion": "ciclos"}
+        )
+
+        clonacion.refresh_from_db()
+        self.assertEqual(clonacion.estado, EstadoClonacion.ERROR)
+        self.assertIn("dejó de responder", clonacion.mensaje)
+        nueva = ClonacionAño.objects.latest("pk")
+        self.assertRedirects(
+            response,
+            reverse("admin:progreso_clonacion", args=[nueva.pk]),
+            fetch_redirect_response=False,
+        )
+        self.assertEqual(nueva.estado, EstadoClonacion.COMPLETADA)
+
+    def test_running_clone_is_not_marked_as_error(self):
+        """Test a clone that keeps making progress still blocks the year."""
+        ClonacionAño.objects.create(
+            año_original=self.año_academico,
+            nuevo_año="2023-24",
+            opcion="ciclos",
+            estado=EstadoClonacion.EN_CURSO,
+        )
+        url = reverse(
+            "admin:ejecutar_clonacion", args=[self.año_academico.año_academico]
+        )
+        response = self.client.post(
+            url, {"nuevo_anio": "2023-24", "opcion_clonacion": "ciclos"}
+        )
+
+        messages = list(get_messages(response.wsgi_request))
+        self.assertIn("Ya hay una clonación en curso", str(messages[0]))
+
+    def test_delete_goes_through_purge(self):
+        """Test deleting a year shows the counts and purges on confirmation."""
+        url = reverse(
+            "admin:seguimientos_añoacademico_delete",
+            args=[self.año_academico.año_academico],
+        )
+        response = self.client.get(url, follow=True)
+        self.assertEqual(response.context["recuentos"]["docencias"], 1)
+
+        response = self.client.post(
+            reverse("admin:purgar_año", args=[self.año_academico.año_academico])
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(AñoAcademico.objects.exists())
+        self.assertFalse(Docencia.objects.exists())
+
+    def test_background_purge_progress_page(self):
+        """Test a background purge redirects to its progress page."""
+        response = self.client.post(
+            reverse("admin:purgar_año", args=[self.año_academico.año_academico]),
+            {"en_segundo_plano": "1"},
+        )
+
+        purga = PurgaAño.objects.get()
+        self.assertRedirects(response, reverse("admin:progreso_purga", args=[purga.pk]))
+        self.assertContains(self.client.get(response.url), "Pendiente")
+
+        ejecutar_purga(purga.pk)
+        response = self.client.get(response.url)
+        self.assertContains(response, "Completada")
+        self.assertContains(response, "<td>Ciclos</td><td>1</td>", html=True)
+
     def test_duplicate_year_validation(self):
         """Test validation prevents creating a duplicate academic year."""
         url = reverse(
@@ -219,3 +362,297 @@ class ProfesorAdminTest(TestCase):
         self.assertTrue(self.normal_profesor.is_admin)
         self.assertTrue(self.normal_profesor.is_staff)
         self.assertTrue(self.normal_profesor.is_superuser)
+
+
+class SeguimientoExportTest(ConsultasConstantesMixin, TestCase):
+    """Test the streaming CSV/XLSX export of seguimientos."""
+
+    def setUp(self):
+        self.client = Client()
+        entrar_como_admin(self.client)
+        self.profesor = Profesor.objects.create_user(
+            email="profesor@example.com", password="password", nombre="Profesor Test"
+        )
+        self.grupos = 0
+
+    def crear_seguimientos(self, cantidad):
+        for i in range(self.grupos, self.grupos + cantidad):
+            docencia = crear_docencia(self.profesor, grupo=f"1DAW{i}", unidades=3)
+            unidades = list(docencia.modulo.unidades_de_temario.all())
+            crear_seguimiento(
+                docencia,
+                temario_actual=unidades[1],
+                temario_completado=[u.pk for u in unidades[:2]],
+            )
+        self.grupos += cantidad
+
+    def exportar(self, formato):
+        url = reverse("admin:seguimientos_seguimiento_export")
+        formatos = [
+            f().get_title()
+            for f in SeguimientoAdmin(Seguimiento, site).get_export_formats()
+        ]
+        return self.client.post(
+            url,
+            {
+                "format": formatos.index(formato),
+                "resource": 0,
+                "seguimientoresource_profesor": True,
+                "seguimientoresource_grupo": True,
+                "seguimientoresource_temario_completado": True,
+            },
+        )
+
+    def test_csv_en_streaming(self):
+        self.crear_seguimientos(3)
+        response = self.exportar("csv")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        contenido = b"".join(response.streaming_content).decode()
+        lineas = contenido.splitlines()
+        self.assertEqual(len(lineas), 4)
+        self.assertIn("Profesor Test", lineas[1])
+        self.assertIn("UT1 - Tema 1;UT2 - Tema 2", lineas[1])
+
+    def test_xlsx_escrito_en_modo_write_only(self):
+        self.crear_seguimientos(3)
+        response = self.exportar("xlsx")
+
+        self.assertEqual(response.status_code, 200)
+        libro = openpyxl.load_workbook(BytesIO(b"".join(response.streaming_content)))
+        filas = list(libro.active.values)
+        self.assertEqual(len(filas), 4)
+        self.assertIn("Profesor Test", filas[1])
+
+    def test_consultas_constantes(self):
+        """Exportar no hace consultas por fila"""
+        self.crear_seguimientos(2)
+        self.assertConsultasConstantes(
+            lambda: self.crear_seguimientos(8),
+            lambda: b"".join(self.exportar("csv").streaming_content),
+        )
+
+
+class ChangelistQueriesTest(ConsultasConstantesMixin, TestCase):
+    """Test every changelist runs the same queries with 10 and 100 rows."""
+
+    changelists = [
+        "admin:seguimientos_añoacademico_changelist",
+        "admin:seguimientos_ciclo_changelist",
+        "admin:seguimientos_grupo_changelist",
+        "admin:seguimientos_modulo_changelist",
+        "admin:seguimientos_unidaddetrabajo_changelist",
+        "admin:seguimientos_profesor_changelist",
+        "admin:seguimientos_docencia_changelist",
+        "admin:seguimientos_seguimiento_changelist",
+    ]
+
+    def setUp(self):
+        self.client = Client()
+        entrar_como_admin(self.client)
+        AñoAcademico.objects.create(año_academico="2024-25")
+        self.filas = 0
+
+    def crear_filas(self, hasta):
+        """Crea una fila nueva de cada modelo, con sus propias relaciones"""
+        for i in range(self.filas, hasta):
+            AñoAcademico.objects.create(año_academico=f"{1900 + i}-{(i + 1) % 100:02}")
+            profesor = Profesor.objects.create(
+                email=f"profesor{i}@example.com", nombre=f"Profesor {i}"
+            )
+            crear_seguimiento(
+                crear_docencia(
+                    profesor,
+                    ciclo=f"Ciclo {i}",
+                    grupo=f"Grupo {i}",
+                    modulo=f"Módulo {i}",
+                )
+            )
+        self.filas = hasta
+
+    def abrir(self, url):
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_consultas_constantes(self):
+        self.crear_filas(10)
+        self.assertConsultasConstantes(
+            lambda: self.crear_filas(100),
+            *[
+                partial(self.abrir, reverse(changelist))
+                for changelist in self.changelists
+            ],
+        )
+
+
+class InlineQueriesTest(ConsultasConstantesMixin, TestCase):
+    """Test the inline selects run their choice query once, whatever the rows."""
+
+    def setUp(self):
+        self.client = Client()
+        entrar_como_admin(self.client)
+        docencia = crear_docencia()
+        self.profesor = docencia.profesor
+        self.modulo = docencia.modulo
+        self.seguimiento = crear_seguimiento(docencia)
+        self.filas = 1
+
+    def añadir_filas(self, hasta):
+        """Añade docencias al módulo y unidades completadas al seguimiento"""
+        for i in range(self.filas, hasta):
+            crear_docencia(self.profesor, grupo=f"Grupo {i}")
+            self.seguimiento.temario_completado.append(
+                UnidadDeTrabajo.objects.create(
+                    numero_tema=i + 1, titulo=f"Tema {i}", modulo=self.modulo
+                ).pk
+            )
+        self.seguimiento.save()
+        self.filas = hasta
+
+    def abrir(self, url):
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_consultas_constantes(self):
+        self.añadir_filas(3)
+        self.assertConsultasConstantes(
+            lambda: self.añadir_filas(30),
+            partial(
+                self.abrir,
+                reverse("admin:seguimientos_modulo_change", args=[self.modulo.pk]),
+            ),
+            partial(
+                self.abrir,
+                reverse(
+                    "admin:seguimientos_seguimiento_change",
+                    args=[self.seguimiento.pk],
+                ),
+            ),
+        )
+
+
+class CicloAdminTest(ConsultasConstantesMixin, TestCase):
+    """Test the Ciclo change page and the warning about modules without units."""
+
+    def setUp(self):
+        self.client = Client()
+        entrar_como_admin(self.client)
+        año = AñoAcademico.objects.create(año_academico="2024-25")
+        self.ciclo = Ciclo.objects.create(nombre="DAW", año_academico=año)
+        self.url = reverse("admin:seguimientos_ciclo_change", args=[self.ciclo.pk])
+        self.modulos = 0
+
+    def añadir_modulos(self, hasta):
+        """Añade módulos al ciclo, uno de cada dos sin unidades de trabajo"""
+        for i in range(self.modulos, hasta):
+            modulo = Modulo.objects.create(
+                nombre=f"Módulo {i}", curso=1, ciclo=self.ciclo
+            )
+            if i % 2:
+                UnidadDeTrabajo.objects.create(
+                    numero_tema=1, titulo="Introducción", modulo=modulo
+                )
+        self.modulos = hasta
+
+    def test_consultas_constantes(self):
+        self.añadir_modulos(3)
+        self.assertConsultasConstantes(
+            lambda: self.añadir_modulos(30),
+            lambda: self.assertEqual(self.client.get(self.url).status_code, 200),
+        )
+
+    def test_aviso_de_unidades(self):
+        self.añadir_modulos(2)
+        response = self.client.get(self.url)
+        self.assertContains(response, "Recuerda añadir Unidades de Trabajo", count=1)
+        self.assertContains(response, "✅", count=1)
+
+    def test_aviso_al_guardar(self):
+        self.añadir_modulos(2)
+        data = {
+            "nombre": "DAW",
+            "año_academico": "2024-25",
+            "grupos-TOTAL_FORMS": 0,
+            "grupos-INITIAL_FORMS": 0,
+            "modulos-TOTAL_FORMS": 2,
+            "modulos-INITIAL_FORMS": 2,
+        }
+        for i, modulo in enumerate(self.ciclo.modulos.order_by("nombre")):
+            data[f"modulos-{i}-id"] = modulo.pk
+            data[f"modulos-{i}-ciclo"] = self.ciclo.pk
+            data[f"modulos-{i}-nombre"] = modulo.nombre
+            data[f"modulos-{i}-curso"] = modulo.curso
+
+        response = self.client.post(self.url, data)
+        self.assertEqual(response.status_code, 302)
+        mensajes = [str(m) for m in get_messages(response.wsgi_request)]
+        self.assertIn(
+            "Los siguientes módulos no tienen Unidades de Trabajo: Módulo 0. "
+            "Recuerda agregarlas desde la página de cada módulo.",
+            mensajes,
+        )
+
+
+class AutocompleteFilterTest(TestCase):
+    """Test the changelist filters that search their options on the server."""
+
+    def setUp(self):
+        self.client = Client()
+        entrar_como_admin(self.client)
+        self.seguimientos = {}
+        for año, nombre in [("2023-24", "Ana"), ("2024-25", "Luis")]:
+            AñoAcademico.objects.create(año_academico=año, actual=True)
+            profesor = Profesor.objects.create(
+                email=f"{nombre}@example.com", nombre=nombre
+            )
+            docencia = crear_docencia(
+                profesor, año=año, grupo="1DAW", modulo=f"Programación {año}"
+            )
+            self.seguimientos[año] = crear_seguimiento(docencia)
+
+    def opciones(self, url_name, **params):
+        response = self.client.get(reverse(f"admin:{url_name}"), params)
+        self.assertEqual(response.status_code, 200)
+        return [resultado["text"] for resultado in response.json()["results"]]
+
+    def test_opciones_del_año(self):
+        url_name = "seguimientos_seguimiento_docencia__modulo_autocomplete"
+        self.assertEqual(
+            self.opciones(url_name, year="2023-24"),
+            ["Programación 2023-24 - DAW - 2023-24"],
+        )
+        self.assertEqual(len(self.opciones(url_name)), 2)
+        self.assertEqual(
+            self.opciones(
+                "seguimientos_seguimiento_docencia__profesor_autocomplete",
+                year="2024-25",
+            ),
+            ["Luis"],
+        )
+
+    def test_busqueda(self):
+        url_name = "seguimientos_seguimiento_docencia__profesor_autocomplete"
+        self.assertEqual(self.opciones(url_name, q="an"), ["Ana"])
+
+    def test_filtro_seleccionado_en_el_listado(self):
+        seguimiento = self.seguimientos["2023-24"]
+        response = self.client.get(
+            reverse("admin:seguimientos_seguimiento_changelist"),
+            {"año_academico": "todos", "docencia__modulo": seguimiento.modulo.pk},
+        )
+
+        self.assertEqual(list(response.context["cl"].result_list), [seguimiento])
+        self.assertContains(
+            response,
+            f'<option value="{seguimiento.modulo.pk}" selected>{seguimiento.modulo}</option>',
+            html=True,
+        )
+
+    def test_año_del_listado_en_la_url(self):
+        response = self.client.get(
+            reverse("admin:seguimientos_docencia_changelist"),
+            {"año_academico__año_academico__exact": "2023-24"},
+        )
+
+        self.assertEqual(response.context["cl"].result_count, 1)
+        grupo_filter = response.context["cl"].filter_specs[1]
+        self.assertTrue(grupo_filter.autocomplete_url.endswith("?year=2023-24"))
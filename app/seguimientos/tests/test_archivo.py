@@ -0,0 +1,213 @@
+import gzip
+import json
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from seguimientos.archivo import archivar_año, leer_catalogo, leer_seguimientos
+from seguimientos.models import (
+    AñoAcademico,
+    AñoArchivado,
+    Ciclo,
+    Docencia,
+    Grupo,
+    Modulo,
+    Profesor,
+    Seguimiento,
+    UnidadDeTrabajo,
+)
+
+
+class ArchivoAñoTests(TestCase):
+    """Tests para el archivo de años académicos cerrados"""
+
+    def setUp(self):
+        self.maria = Profesor.objects.create(
+            email="maria@example.com", nombre="Maria Lopez"
+        )
+        self.juan = Profesor.objects.create(
+            email="juan@example.com", nombre="Juan Garcia"
+        )
+        self.antiguo = AñoAcademico.objects.create(año_academico="2023-24")
+        self.actual = AñoAcademico.objects.create(año_academico="2024-25", actual=True)
+        for año in [self.antiguo, self.actual]:
+            ciclo = Ciclo.objects.create(nombre="DAW", año_academico=año)
+            grupo = Grupo.objects.create(nombre="DAW1A", ciclo=ciclo, curso=1)
+            for profesor, nombre_modulo in [
+                (self.maria, "Bases de Datos"),
+                (self.juan, "Programación"),
+            ]:
+                modulo = Modulo.objects.create(
+                    nombre=nombre_modulo, curso=1, ciclo=ciclo
+                )
+                unidades = [
+                    UnidadDeTrabajo.objects.create(
+                        numero_tema=numero, titulo=f"Tema {numero}", modulo=modulo
+                    )
+                    for numero in (1, 2)
+                ]
+                docencia = Docencia.objects.create(
+                    profesor=profesor, grupo=grupo, modulo=modulo
+                )
+                for mes in (10, 11):
+                    Seguimiento.objects.create(
+                        docencia=docencia,
+                        mes=mes,
+                        temario_actual=unidades[1],
+                        temario_completado=[unidades[0].pk],
+                        ultimo_contenido_impartido="Contenido",
+                        evaluacion="PRIMERA",
+                    )
+
+    def test_archivar_guarda_la_copia_y_borra_el_año(self):
+        archivado = archivar_año(self.antiguo)
+
+        self.assertEqual(archivado.num_seguimientos, 4)
+        self.assertFalse(AñoAcademico.objects.filter(pk="2023-24").exists())
+        self.assertEqual(Seguimiento.objects.count(), 4)
+        self.assertFalse(Seguimiento.objects.filter(año_academico="2023-24").exists())
+
+        archivado = AñoArchivado.objects.get(pk="2023-24")
+        registros = list(leer_seguimientos(archivado))
+        self.assertEqual(len(registros), 4)
+        self.assertEqual(
+            registros[0],
+            registros[0]
+            | {
+                "ciclo": "DAW",
+                "grupo": "DAW1A",
+                "modulo": "Bases de Datos",
+                "profesor": "Maria Lopez",
+                "docentes": ["maria@example.com"],
+                "mes": 10,
+                "temario_actual": "UT2 - Tema 2",
+                "temario_completado": ["UT1 - Tema 1"],
+            },
+        )
+
+    def test_la_copia_es_json_por_lineas_con_gzip(self):
+        archivado = archivar_año(self.antiguo)
+
+        lineas = gzip.decompress(bytes(archivado.datos)).decode().splitlines()
+        self.assertEqual(len(lineas), 4)
+        self.assertEqual(json.loads(lineas[0])["grupo"], "DAW1A")
+
+    def test_se_archiva_todo_lo_que_borra_la_purga(self):
+        """Las filas sin seguimientos y los seguimientos de docencias de otro año con un grupo del año"""
+        ciclo = Ciclo.objects.get(año_academico=self.antiguo)
+        sin_seguimientos = Modulo.objects.create(
+            nombre="Sistemas", curso=1, ciclo=ciclo
+        )
+        grupo = Grupo.objects.get(ciclo=ciclo)
+        Docencia.objects.create(
+            profesor=self.maria, grupo=grupo, modulo=sin_seguimientos
+        )
+        modulo_actual = Modulo.objects.get(
+            ciclo__año_academico=self.actual, nombre="Programación"
+        )
+        cruzada = Docencia.objects.create(
+            profesor=self.juan, grupo=grupo, modulo=modulo_actual
+        )
+        Seguimiento.objects.create(
+            docencia=cruzada,
+            mes=12,
+            temario_actual=modulo_actual.unidades_de_temario.first(),
+            ultimo_contenido_impartido="Contenido",
+            evaluacion="PRIMERA",
+        )
+
+        archivado = archivar_año(self.antiguo)
+
+        self.assertEqual(archivado.num_seguimientos, 5)
+        self.assertIn(12, [r["mes"] for r in leer_seguimientos(archivado)])
+        self.assertEqual(
+            [fila["nombre"] for fila in leer_catalogo(archivado, "ciclos")], ["DAW"]
+        )
+        self.assertEqual(
+            [fila["nombre"] for fila in leer_catalogo(archivado, "grupos")], ["DAW1A"]
+        )
+        self.assertEqual(
+            [fila["nombre"] for fila in leer_catalogo(archivado, "modulos")],
+            ["Bases de Datos", "Programación", "Sistemas"],
+        )
+        self.assertEqual(len(list(leer_catalogo(archivado, "unidades"))), 4)
+        self.assertEqual(len(list(leer_catalogo(archivado, "asignaciones"))), 4)
+        docencias = list(leer_catalogo(archivado, "docencias"))
+        self.assertEqual(len(docencias), 4)
+        self.assertIn(
+            {"profesor_id": self.maria.pk, "modulo_id": sin_seguimientos.pk},
+            [
+                {"profesor_id": d["profesor_id"], "modulo_id": d["modulo_id"]}
+                for d in docencias
+            ],
+        )
+
+    def test_no_se_vuelve_a_crear_un_año_archivado(self):
+        archivar_año(self.antiguo)
+
+        with self.assertRaises(ValidationError):
+            AñoAcademico(año_academico="2023-24").full_clean()
+        AñoAcademico(año_academico="2025-26").full_clean()
+
+    def test_no_se_archiva_el_año_actual(self):
+        with self.assertRaises(ValidationError):
+            archivar_año(self.actual)
+        self.assertFalse(AñoArchivado.objects.exists())
+
+    def test_leer_por_mes_y_docente(self):
+        archivado = archivar_año(self.antiguo)
+
+        self.assertEqual(len(list(leer_seguimientos(archivado, mes=11))), 2)
+        self.assertEqual(
+            {
+                registro["modulo"]
+                for registro in leer_seguimientos(
+                    archivado, email_docente="juan@example.com"
+                )
+            },
+            {"Programación"},
+        )
+
+    def test_api_de_solo_lectura(self):
+        archivar_año(self.antiguo)
+        client = APIClient()
+        client.force_authenticate(user=self.juan)
+
+        response = client.get(reverse("año-archivado-list"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[0]["año_academico"], "2023-24")
+        self.assertEqual(response.data[0]["num_seguimientos"], 4)
+
+        url = reverse("año-archivado-seguimientos", args=["2023-24"])
+        response = client.get(url, {"mes": 10})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(r["modulo"], r["mes"]) for r in response.data], [("Programación", 10)]
+        )
+        self.assertEqual(client.get(url, {"mes": "octubre"}).status_code, 400)
+        self.assertEqual(client.delete(url).status_code, 405)
+
+    def test_admin_archiva_y_muestra_el_año(self):
+        Profesor.objects.create_superuser(
+            email="admin@example.com", password="adminpassword", nombre="Admin User"
+        )
+        self.client.login(email="admin@example.com", password="adminpassword")
+        url = reverse("admin:archivar_año", args=["2023-24"])
+
+        self.assertContains(self.client.get(url), "Archivar el año académico 2023-24")
+        response = self.client.post(url)
+        self.assertRedirects(
+            response,
+            reverse("admin:seguimientos_añoarchivado_change", args=["2023-24"]),
+        )
+        response = self.client.get(response.url)
+        self.assertContains(response, "Bases de Datos")
+        self.assertContains(response, "Programación")
+
+        response = self.client.get(
+            reverse("admin:descargar_año_archivado", args=["2023-24"])
+        )
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertEqual(len(gzip.decompress(response.content).splitlines()), 4)
@@ -0,0 +1,101 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from seguimientos.busqueda import filtro_busqueda
+from seguimientos.models import AñoAcademico, Profesor, Seguimiento
+from seguimientos.tests.datos import (
+    crear_docencia,
+    crear_seguimiento,
+    entrar_como_admin,
+)
+
+
+class BusquedaTextoTests(TestCase):
+    """Tests para la búsqueda del admin con los índices de trigramas"""
+
+    def setUp(self):
+        entrar_como_admin(self.client)
+        self.maria = Profesor.objects.create(
+            email="maria@example.com", nombre="María Pérez"
+        )
+        self.juan = Profesor.objects.create(
+            email="juan@example.com", nombre="Juan Garcia"
+        )
+        self.seguimientos = {}
+        for año, actual in [("2023-24", False), ("2024-25", True)]:
+            AñoAcademico.objects.create(año_academico=año, actual=actual)
+            for profesor, nombre_modulo in [
+                (self.maria, "Bases de Datos"),
+                (self.juan, "Programacion"),
+            ]:
+                docencia = crear_docencia(profesor, año=año, modulo=nombre_modulo)
+                self.seguimientos[año, profesor.nombre] = crear_seguimiento(docencia)
+
+    def buscar(self, modelo, termino, **params):
+        response = self.client.get(
+            reverse(f"admin:seguimientos_{modelo}_changelist"), {"q": termino, **params}
+        )
+        self.assertEqual(response.status_code, 200)
+        return set(response.context["cl"].result_list)
+
+    def test_busca_por_el_nombre_del_profesor(self):
+        self.assertEqual(
+            self.buscar("seguimiento", "mar", año_academico="todos"),
+            {
+                self.seguimientos["2023-24", "María Pérez"],
+                self.seguimientos["2024-25", "María Pérez"],
+            },
+        )
+
+    def test_los_terminos_se_combinan(self):
+        self.assertEqual(
+            self.buscar("seguimiento", "datos 2023-24", año_academico="todos"),
+            {self.seguimientos["2023-24", "María Pérez"]},
+        )
+
+    def test_el_año_se_busca_como_subcadena(self):
+        self.assertEqual(
+            self.buscar("seguimiento", "-25", año_academico="todos"),
+            {
+                self.seguimientos["2024-25", "María Pérez"],
+                self.seguimientos["2024-25", "Juan Garcia"],
+            },
+        )
+
+    def test_busca_profesores_por_email(self):
+        self.assertEqual(self.buscar("profesor", "juan@"), {self.juan})
+
+    def test_busca_profesores_por_email_completo(self):
+        self.assertEqual(self.buscar("profesor", "juan@example.com"), {self.juan})
+
+    def test_busca_subcadenas_dentro_de_las_palabras(self):
+        self.assertEqual(self.buscar("profesor", "rez"), {self.maria})
+        self.assertEqual(
+            self.buscar("seguimiento", "gramac", año_academico="todos"),
+            {
+                self.seguimientos["2023-24", "Juan Garcia"],
+                self.seguimientos["2024-25", "Juan Garcia"],
+            },
+        )
+
+    def test_busca_docencias_y_modulos(self):
+        self.assertEqual(
+            {docencia.profesor for docencia in self.buscar("docencia", "progra")},
+            {self.juan},
+        )
+        self.assertEqual(
+            {modulo.nombre for modulo in self.buscar("modulo", "bases")},
+            {"Bases de Datos"},
+        )
+
+    def test_sin_joins_en_la_consulta(self):
+        """Las relaciones se recorren con subconsultas, sin repetir filas"""
+        consulta = Seguimiento.objects.filter(
+            filtro_busqueda(
+                Seguimiento,
+                ["docencia__profesor__nombre", "docencia__modulo__nombre"],
+                "mar",
+            )
+        )
+        self.assertNotIn("JOIN", str(consulta.query))
+        self.assertIn("LIKE UPPER", str(consulta.query))
@@ -0,0 +1,129 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from seguimientos.clonacion import clonar_año_academico, previsualizar_clonacion
+from seguimientos.models import (
+    AñoAcademico,
+    Ciclo,
+    Docencia,
+    Grupo,
+    Modulo,
+    Profesor,
+)
+from seguimientos.tests.datos import ConsultasConstantesMixin, crear_docencia
+
+
+class ClonarAñoAcademicoTests(ConsultasConstantesMixin, TestCase):
+    """Tests para el servicio de clonación de años académicos"""
+
+    def setUp(self):
+        self.año = AñoAcademico.objects.create(año_academico="2024-25")
+        self.profesor = Profesor.objects.create(
+            email="profesor@example.com", nombre="Juan Pérez"
+        )
+
+    def crear_ciclo(self, nombre, modulos=2):
+        for i in range(modulos):
+            crear_docencia(
+                self.profesor,
+                año=self.año.pk,
+                ciclo=nombre,
+                grupo=f"{nombre}1A",
+                modulo=f"Módulo {i}",
+                unidades=3,
+            )
+
+    def test_clona_todos_los_niveles(self):
+        self.crear_ciclo("DAW")
+        self.crear_ciclo("ASIR", modulos=1)
+
+        nuevo_año, resumen = clonar_año_academico(self.año, "2025-26", "docencias")
+
+        self.assertEqual(
+            resumen,
+            {"ciclos": 2, "modulos": 3, "unidades": 9, "grupos": 2, "docencias": 3},
+        )
+        self.assertTrue(nuevo_año.actual)
+        modulo = Modulo.objects.get(
+            ciclo__año_academico=nuevo_año, ciclo__nombre="ASIR"
+        )
+        self.assertEqual(modulo.unidades_de_temario.count(), 3)
+        docencia = Docencia.objects.get(modulo=modulo)
+        self.assertEqual(docencia.grupo.ciclo, modulo.ciclo)
+        self.assertEqual(docencia.profesor, self.profesor)
+
+    def test_consultas_constantes(self):
+        """Cada nivel se lee y se escribe con una consulta sea cual sea el tamaño"""
+        self.crear_ciclo("DAW", modulos=1)
+        nuevos_años = iter(["2025-26", "2026-27"])
+
+        def crecer():
+            self.crear_ciclo("ASIR", modulos=5)
+            self.crear_ciclo("SMR", modulos=5)
+
+        # Cada vez se clona a un año nuevo, no se puede repetir para calentar
+        self.assertConsultasConstantes(
+            crecer,
+            lambda: clonar_año_academico(self.año, next(nuevos_años), "docencias"),
+            calentar=False,
+        )
+
+    def test_error_no_deja_el_año_a_medias(self):
+        self.crear_ciclo("DAW")
+
+        with mock.patch(
+            "seguimientos.clonacion.clonar_docencias", side_effect=RuntimeError
+        ):
+            with self.assertRaises(RuntimeError):
+                clonar_año_academico(self.año, "2025-26", "docencias")
+
+        self.assertFalse(AñoAcademico.objects.filter(pk="2025-26").exists())
+        self.assertEqual(Ciclo.objects.count(), 1)
+        self.assertEqual(Modulo.objects.count(), 2)
+        self.assertTrue(AñoAcademico.objects.get(pk="2024-25").actual)
+
+    def test_previsualizar_coincide_con_la_clonacion(self):
+        self.crear_ciclo("DAW")
+        self.crear_ciclo("ASIR", modulos=1)
+
+        with self.assertNumQueries(5):
+            previsualizacion, omitidas = previsualizar_clonacion(self.año, "docencias")
+        self.assertEqual(AñoAcademico.objects.count(), 1)
+
+        _, resumen = clonar_año_academico(self.año, "2025-26", "docencias")
+        self.assertEqual(previsualizacion, resumen)
+        self.assertEqual(omitidas, 0)
+
+    def test_previsualizar_docencias_omitidas(self):
+        """Las docencias con el grupo en otro año no se clonan y se avisa"""
+        self.crear_ciclo("DAW", modulos=1)
+        otro_año = AñoAcademico.objects.create(año_academico="2023-24")
+        otro_ciclo = Ciclo.objects.create(nombre="DAW", año_academico=otro_año)
+        otro_grupo = Grupo.objects.create(nombre="DAW1B", ciclo=otro_ciclo, curso=1)
+        Docencia.objects.create(
+            profesor=self.profesor, grupo=otro_grupo, modulo=Modulo.objects.first()
+        )
+
+        previsualizacion, omitidas = previsualizar_clonacion(self.año, "docencias")
+
+        self.assertEqual(previsualizacion["docencias"], 1)
+        self.assertEqual(omitidas, 1)
+
+    def test_comando_clonar_año(self):
+        self.crear_ciclo("DAW")
+        salida = StringIO()
+
+        call_command(
+            "clonar_año", "2024-25", "2025-26", "--opcion=modulos", stdout=salida
+        )
+
+        self.assertIn("modulos: 2", salida.getvalue())
+        self.assertEqual(
+            Modulo.objects.filter(ciclo__año_academico="2025-26").count(), 2
+        )
+        self.assertFalse(
+            Docencia.objects.filter(modulo__ciclo__año_academico="2025-26").exists()
+        )
@@ -0,0 +1,36 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TransactionTestCase
+
+from seguimientos.models import AñoAcademico, Profesor
+
+
+class MedirConexionesTests(TransactionTestCase):
+    """
+    Tests para el comando que mide la latencia de las peticiones. Cierra la
+    conexión entre peticiones, así que no puede ir dentro de una transacción.
+    """
+
+    def setUp(self):
+        AñoAcademico.objects.create(año_academico="2024-25", actual=True)
+        Profesor.objects.create(email="profesor@example.com", nombre="Juan Pérez")
+
+    def test_mide_las_peticiones_autenticadas(self):
+        salida = StringIO()
+
+        call_command(
+            "medir_conexiones",
+            "--email=profesor@example.com",
+            "--peticiones=5",
+            "--calentamiento=1",
+            stdout=salida,
+        )
+
+        self.assertIn("Peticiones: 5 a /api/year-actual/", salida.getvalue())
+        self.assertIn("Latencia (ms): media", salida.getvalue())
+
+    def test_falla_si_la_peticion_falla(self):
+        with self.assertRaisesMessage(CommandError, "ha devuelto 401"):
+            call_command("medir_conexiones", "--peticiones=1", stdout=StringIO())
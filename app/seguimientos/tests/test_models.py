@@ -1,6 +1,8 @@
 from django.test import TestCase
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError
 from seguimientos.models import (
+    Asignacion,
     AñoAcademico,
     Ciclo,
     Grupo,
@@ -150,3 +152,193 @@ class SeguimientoModelTestCase(TestCase):
             # Si hay error, verificar que no está relacionado con los campos de justificación
             self.assertNotIn("justificacion_cumple_programacion", e.error_dict)
             self.assertNotIn("motivo_no_cumple_programacion", e.error_dict)
+
+    def test_orden_mes_academico_empieza_en_septiembre(self):
+        """Verifica que la base de datos calcula el orden del mes en el curso"""
+        for mes in range(1, 13):
+            Seguimiento.objects.create(
+                temario_actual=self.tema1,
+                ultimo_contenido_impartido="Variables",
+                mes=mes,
+                docencia=self.docencia,
+                evaluacion="PRIMERA",
+            )
+
+        meses = Seguimiento.objects.order_by("orden_mes_academico").values_list(
+            "mes", "orden_mes_academico"
+        )
+        self.assertEqual(
+            list(meses),
+            [
+                (mes, orden)
+                for orden, mes in enumerate([9, 10, 11, 12, *range(1, 9)], 1)
+            ],
+        )
+
+    def crear_seguimiento(self):
+        return Seguimiento.objects.create(
+            temario_actual=self.tema1,
+            ultimo_contenido_impartido="Variables",
+            mes=10,
+            docencia=self.docencia,
+            evaluacion="PRIMERA",
+        )
+
+    def test_año_academico_copiado_al_crear(self):
+        """Docencia y seguimiento guardan el año de su módulo"""
+        seguimiento = self.crear_seguimiento()
+        self.assertEqual(self.docencia.año_academico_id, "2024-25")
+        self.assertEqual(seguimiento.año_academico_id, "2024-25")
+
+    def test_año_academico_al_cambiar_el_modulo_de_la_docencia(self):
+        seguimiento = self.crear_seguimiento()
+        otro_año = AñoAcademico.objects.create(año_academico="2025-26")
+        otro_ciclo = Ciclo.objects.create(nombre="Informática", año_academico=otro_año)
+        self.docencia.modulo = Modulo.objects.create(
+            nombre="Programación", curso=1, ciclo=otro_ciclo
+        )
+        self.docencia.save()
+
+        seguimiento.refresh_from_db()
+        self.assertEqual(self.docencia.año_academico_id, "2025-26")
+        self.assertEqual(seguimiento.año_academico_id, "2025-26")
+
+    def test_año_academico_al_mover_el_modulo_de_ciclo(self):
+        seguimiento = self.crear_seguimiento()
+        otro_año = AñoAcademico.objects.create(año_academico="2025-26")
+        self.modulo.ciclo = Ciclo.objects.create(
+            nombre="Informática", año_academico=otro_año
+        )
+        self.modulo.save()
+
+        self.docencia.refresh_from_db()
+        seguimiento.refresh_from_db()
+        self.assertEqual(self.docencia.año_academico_id, "2025-26")
+        self.assertEqual(seguimiento.año_academico_id, "2025-26")
+
+    def test_año_academico_al_mover_el_ciclo_de_año(self):
+        seguimiento = self.crear_seguimiento()
+        self.ciclo.año_academico = AñoAcademico.objects.create(año_academico="2025-26")
+        self.ciclo.save()
+
+        self.docencia.refresh_from_db()
+        seguimiento.refresh_from_db()
+        self.assertEqual(self.docencia.año_academico_id, "2025-26")
+        self.assertEqual(seguimiento.año_academico_id, "2025-26")
+
+    def test_un_seguimiento_al_mes_por_grupo_y_modulo(self):
+        """Otro profesor del mismo grupo y módulo no puede repetir el mes"""
+        self.crear_seguimiento()
+        otro_profesor = Profesor.objects.create(
+            email="otro@test.com", nombre="Ana López", password="segura123"
+        )
+        otra_docencia = Docencia.objects.create(
+            profesor=otro_profesor, grupo=self.grupo, modulo=self.modulo
+        )
+        repetido = Seguimiento(
+            temario_actual=self.tema1,
+            ultimo_contenido_impartido="Variables",
+            mes=10,
+            docencia=otra_docencia,
+            evaluacion="PRIMERA",
+        )
+
+        # El admin valida sin grupo ni módulo en el formulario
+        with self.assertRaisesMessage(
+            ValidationError, "Ya existe un seguimiento para este mes, grupo y módulo."
+        ):
+            repetido.full_clean(exclude=["asignacion", "año_academico"])
+        with self.assertRaises(IntegrityError):
+            repetido.save()
+
+    def test_docencias_del_mismo_grupo_y_modulo_comparten_asignacion(self):
+        otro_profesor = Profesor.objects.create(
+            email="otro@test.com", nombre="Ana López", password="segura123"
+        )
+        otra_docencia = Docencia.objects.create(
+            profesor=otro_profesor, grupo=self.grupo, modulo=self.modulo
+        )
+        self.assertEqual(otra_docencia.asignacion_id, self.docencia.asignacion_id)
+
+        seguimiento = self.crear_seguimiento()
+        otro_grupo = Grupo.objects.create(nombre="1B", ciclo=self.ciclo, curso=1)
+        self.docencia.grupo = otro_grupo
+        self.docencia.save()
+
+        seguimiento.refresh_from_db()
+        self.assertEqual(seguimiento.asignacion.grupo, otro_grupo)
+        self.assertNotEqual(seguimiento.asignacion_id, otra_docencia.asignacion_id)
+
+    def test_guardar_sin_cambiar_grupo_ni_modulo_no_busca_la_asignacion(self):
+        docencia = Docencia.objects.get(pk=self.docencia.pk)
+        with self.assertNumQueries(1):
+            docencia.save()
+
+    def test_la_asignacion_sin_docencias_se_borra(self):
+        seguimiento = self.crear_seguimiento()
+        asignacion_anterior = self.docencia.asignacion_id
+        docencia = Docencia.objects.get(pk=self.docencia.pk)
+        docencia.grupo = Grupo.objects.create(nombre="1B", ciclo=self.ciclo, curso=1)
+        docencia.full_clean()
+        docencia.save()
+
+        seguimiento.refresh_from_db()
+        self.assertEqual(seguimiento.asignacion_id, docencia.asignacion_id)
+        self.assertFalse(Asignacion.objects.filter(pk=asignacion_anterior).exists())
+
+        docencia.delete()
+        self.assertFalse(Asignacion.objects.exists())
+
+    def test_no_se_cambia_a_un_grupo_con_seguimientos_en_los_mismos_meses(self):
+        self.crear_seguimiento()
+        otro_grupo = Grupo.objects.create(nombre="1B", ciclo=self.ciclo, curso=1)
+        otra_docencia = Docencia.objects.create(
+            profesor=Profesor.objects.create(
+                email="otro@test.com", nombre="Ana López", password="segura123"
+            ),
+            grupo=otro_grupo,
+            modulo=self.modulo,
+        )
+        Seguimiento.objects.create(
+            temario_actual=self.tema1,
+            ultimo_contenido_impartido="Variables",
+            mes=10,
+            docencia=otra_docencia,
+            evaluacion="PRIMERA",
+        )
+
+        docencia = Docencia.objects.get(pk=self.docencia.pk)
+        docencia.grupo = otro_grupo
+        with self.assertRaisesMessage(
+            ValidationError, "Ya hay seguimientos de ese grupo y módulo"
+        ):
+            docencia.full_clean()
+
+    def test_borrar_unidad_la_quita_del_temario_completado(self):
+        seguimiento = self.crear_seguimiento()
+        seguimiento.temario_completado = [self.tema2.pk, self.tema3.pk]
+        seguimiento.save()
+
+        self.tema2.delete()
+
+        seguimiento.refresh_from_db()
+        self.assertEqual(seguimiento.temario_completado, [self.tema3.pk])
+        self.assertEqual(seguimiento.unidades_completadas, [self.tema3])
+
+    def test_borrar_unidades_en_un_queryset_las_quita_del_temario_completado(self):
+        seguimiento = self.crear_seguimiento()
+        seguimiento.temario_completado = [self.tema2.pk, self.tema3.pk]
+        seguimiento.save()
+
+        UnidadDeTrabajo.objects.filter(pk=self.tema3.pk).delete()
+
+        seguimiento.refresh_from_db()
+        self.assertEqual(seguimiento.temario_completado, [self.tema2.pk])
+
+    def test_los_ids_de_unidades_que_no_existen_se_saltan_al_leer(self):
+        seguimiento = self.crear_seguimiento()
+        seguimiento.temario_completado = [self.tema2.pk, 999999]
+        seguimiento.save()
+
+        seguimiento.refresh_from_db()
+        self.assertEqual(seguimiento.unidades_completadas, [self.tema2])
@@ -0,0 +1,124 @@
+from django.db import connection
+from django.db.models import Count, F
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from seguimientos.models import (
+    AñoAcademico,
+    Ciclo,
+    Docencia,
+    Grupo,
+    Modulo,
+    Profesor,
+    Seguimiento,
+    UnidadDeTrabajo,
+)
+from seguimientos.paginacion import PaginadorConteoEstimado, estimar_filas
+from seguimientos.particiones import nombre_particion
+
+
+class PaginadorConteoEstimadoTests(TestCase):
+    """Tests para los recuentos estimados de los listados del admin"""
+
+    def setUp(self):
+        self.profesor = Profesor.objects.create(
+            email="profesor@example.com", nombre="Juan Pérez"
+        )
+        self.año = AñoAcademico.objects.create(año_academico="2024-25", actual=True)
+        ciclo = Ciclo.objects.create(nombre="DAW", año_academico=self.año)
+        grupo = Grupo.objects.create(nombre="DAW1A", ciclo=ciclo, curso=1)
+        for i in range(3):
+            modulo = Modulo.objects.create(nombre=f"Módulo {i}", curso=1, ciclo=ciclo)
+            unidad = UnidadDeTrabajo.objects.create(
+                numero_tema=1, titulo="Introducción", modulo=modulo
+            )
+            docencia = Docencia.objects.create(
+                profesor=self.profesor, grupo=grupo, modulo=modulo
+            )
+            Seguimiento.objects.create(
+                docencia=docencia,
+                mes=10,
+                temario_actual=unidad,
+                ultimo_contenido_impartido="Contenido",
+                evaluacion="PRIMERA",
+            )
+
+    def test_estimar_filas_sin_filtros_usa_estadisticas_de_la_tabla(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Seguimiento._meta.db_table}")
+        self.assertEqual(estimar_filas(Seguimiento.objects.all()), 3)
+
+    def test_estimar_filas_suma_las_particiones(self):
+        """La tabla particionada no tiene estadísticas, se suman las de sus particiones"""
+        otro = AñoAcademico.objects.create(año_academico="2023-24")
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {nombre_particion(self.año.pk)}")
+            cursor.execute(f"ANALYZE {nombre_particion(otro.pk)}")
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                [Seguimiento._meta.db_table],
+            )
+            self.assertEqual(cursor.fetchone()[0], -1)
+        self.assertEqual(estimar_filas(Seguimiento.objects.all()), 3)
+
+    def test_estimar_filas_con_filtros_usa_explain(self):
+        queryset = Seguimiento.objects.filter(
+            docencia__modulo__ciclo__año_academico=self.año
+        )
+        with CaptureQueriesContext(connection) as queries:
+            estimadas = estimar_filas(queryset)
+        self.assertIsInstance(estimadas, int)
+        self.assertTrue(queries[0]["sql"].startswith("EXPLAIN"))
+
+    def test_estimar_filas_con_joins_o_agrupando_usa_explain(self):
+        for queryset in [
+            Docencia.objects.annotate(num_seguimientos=Count("seguimientos")),
+            Seguimiento.objects.annotate(
+                profesor_nombre=F("docencia__profesor__nombre")
+            ),
+        ]:
+            with CaptureQueriesContext(connection) as queries:
+                estimadas = estimar_filas(queryset)
+            self.assertIsInstance(estimadas, int)
+            self.assertTrue(queries[0]["sql"].startswith("EXPLAIN"))
+
+    @override_settings(ADMIN_CONTEO_EXACTO_HASTA=0)
+    def test_usa_la_estimacion_del_explain_con_joins(self):
+        queryset = Docencia.objects.annotate(num_seguimientos=Count("seguimientos"))
+        paginador = PaginadorConteoEstimado(queryset.order_by("pk"), 100)
+        with CaptureQueriesContext(connection) as queries:
+            paginador.count
+        self.assertEqual(len(queries), 1)
+        self.assertTrue(queries[0]["sql"].startswith("EXPLAIN"))
+        self.assertGreater(paginador.count, 0)
+
+    def test_cuenta_exactamente_por_debajo_del_umbral(self):
+        paginador = PaginadorConteoEstimado(
+            Seguimiento.objects.filter(mes=10).order_by("pk"), 100
+        )
+        self.assertEqual(paginador.count, 3)
+
+    @override_settings(ADMIN_CONTEO_EXACTO_HASTA=0)
+    def test_usa_la_estimacion_por_encima_del_umbral(self):
+        queryset = Seguimiento.objects.filter(mes=10).order_by("pk")
+        paginador = PaginadorConteoEstimado(queryset, 100)
+        with CaptureQueriesContext(connection) as queries:
+            paginador.count
+        self.assertEqual(paginador.count, estimar_filas(queryset))
+        self.assertFalse(any("COUNT(" in query["sql"] for query in queries))
+
+    @override_settings(ADMIN_CONTEO_EXACTO_HASTA=0)
+    def test_listados_del_admin_con_recuento_estimado(self):
+        Profesor.objects.create_superuser(
+            email="admin@example.com", password="adminpassword", nombre="Admin User"
+        )
+        self.client.login(email="admin@example.com", password="adminpassword")
+        for modelo in ["seguimiento", "docencia", "modulo"]:
+            response = self.client.get(
+                reverse(f"admin:seguimientos_{modelo}_changelist")
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertIsInstance(
+                response.context["cl"].paginator, PaginadorConteoEstimado
+            )
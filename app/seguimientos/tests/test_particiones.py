@@ -0,0 +1,103 @@
+from django.db import connection
+from django.test import TestCase
+
+from seguimientos.models import (
+    AñoAcademico,
+    Ciclo,
+    Docencia,
+    Grupo,
+    Modulo,
+    Profesor,
+    Seguimiento,
+    UnidadDeTrabajo,
+)
+from seguimientos.particiones import nombre_particion
+from seguimientos.purga import purgar_año_academico
+
+
+def particiones():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT inhrelid::regclass::text FROM pg_inherits "
+            "WHERE inhparent = %s::regclass",
+            [Seguimiento._meta.db_table],
+        )
+        return {fila[0] for fila in cursor.fetchall()}
+
+
+def filas(tabla):
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT count(*) FROM {tabla}")
+        return cursor.fetchone()[0]
+
+
+class ParticionesSeguimientoTests(TestCase):
+    """Tests para la partición por año académico de la tabla de seguimientos"""
+
+    def setUp(self):
+        self.profesor = Profesor.objects.create(
+            email="profesor@example.com", nombre="Juan Pérez"
+        )
+        self.antiguo = AñoAcademico.objects.create(año_academico="2023-24")
+        self.actual = AñoAcademico.objects.create(año_academico="2024-25", actual=True)
+        for año in [self.antiguo, self.actual]:
+            ciclo = Ciclo.objects.create(nombre="DAW", año_academico=año)
+            grupo = Grupo.objects.create(nombre="DAW1A", ciclo=ciclo, curso=1)
+            modulo = Modulo.objects.create(nombre="Programación", curso=1, ciclo=ciclo)
+            unidad = UnidadDeTrabajo.objects.create(
+                numero_tema=1, titulo="Introducción", modulo=modulo
+            )
+            docencia = Docencia.objects.create(
+                profesor=self.profesor, grupo=grupo, modulo=modulo
+            )
+            Seguimiento.objects.create(
+                docencia=docencia,
+                mes=10,
+                temario_actual=unidad,
+                ultimo_contenido_impartido="Contenido",
+                evaluacion="PRIMERA",
+            )
+
+    def test_una_particion_por_año(self):
+        self.assertEqual(
+            nombre_particion("2024-25"), "seguimientos_seguimiento_2024_25"
+        )
+        self.assertEqual(
+            particiones(),
+            {"seguimientos_seguimiento_2023_24", "seguimientos_seguimiento_2024_25"},
+        )
+        self.assertEqual(filas("seguimientos_seguimiento_2023_24"), 1)
+        self.assertEqual(filas("seguimientos_seguimiento_2024_25"), 1)
+
+    def test_los_años_creados_sin_save_tienen_particion(self):
+        """La partición la crea la base de datos, no AñoAcademico.save()"""
+        AñoAcademico.objects.bulk_create([AñoAcademico(año_academico="2025-26")])
+
+        self.assertIn("seguimientos_seguimiento_2025_26", particiones())
+
+    def test_las_consultas_del_año_solo_leen_su_particion(self):
+        consulta = Seguimiento.objects.filter(año_academico=self.actual, mes=10)
+        plan = consulta.explain()
+        self.assertIn("seguimientos_seguimiento_2024_25", plan)
+        self.assertNotIn("seguimientos_seguimiento_2023_24", plan)
+
+    def test_cambiar_el_año_del_ciclo_mueve_los_seguimientos(self):
+        ciclo = Ciclo.objects.get(año_academico=self.antiguo)
+        ciclo.año_academico = AñoAcademico.objects.create(año_academico="2025-26")
+        ciclo.save()
+
+        self.assertEqual(filas("seguimientos_seguimiento_2023_24"), 0)
+        self.assertEqual(filas("seguimientos_seguimiento_2025_26"), 1)
+
+    def test_borrar_el_año_borra_su_particion(self):
+        self.antiguo.delete()
+
+        self.assertEqual(particiones(), {"seguimientos_seguimiento_2024_25"})
+        self.assertEqual(Seguimiento.objects.count(), 1)
+
+    def test_purgar_el_año_borra_su_particion(self):
+        borradas = purgar_año_academico(self.antiguo)
+
+        self.assertEqual(borradas["seguimientos"], 1)
+        self.assertEqual(particiones(), {"seguimientos_seguimiento_2024_25"})
+        self.assertEqual(Seguimiento.objects.count(), 1)
@@ -0,0 +1,85 @@
+import os
+import tempfile
+
+from django.test import TestCase, override_settings
+
+from seguimientos.models import Seguimiento
+from seguimientos.pdf_cache import guardar_informe, huella_informe, leer_informe
+from seguimientos.tests.datos import crear_docencia, crear_seguimiento
+
+
+class HuellaInformeTests(TestCase):
+    """Tests para la huella que identifica un informe PDF en la caché"""
+
+    def setUp(self):
+        docencia = crear_docencia()
+        self.profesor = docencia.profesor
+        self.unidad = docencia.modulo.unidades_de_temario.get()
+        self.seguimiento = crear_seguimiento(
+            docencia, temario_completado=[self.unidad.pk]
+        )
+
+    def huella(self):
+        return huella_informe(Seguimiento.objects.all(), "v1", "Informe")
+
+    def test_huella_estable_sin_cambios(self):
+        self.assertEqual(self.huella(), self.huella())
+
+    def test_huella_cambia_al_modificar_seguimiento(self):
+        antes = self.huella()
+        self.seguimiento.ultimo_contenido_impartido = "Otro contenido"
+        self.seguimiento.save()
+        self.assertNotEqual(antes, self.huella())
+
+    def test_huella_cambia_al_modificar_datos_relacionados(self):
+        antes = self.huella()
+        self.profesor.nombre = "Juan Pérez García"
+        self.profesor.save()
+        despues_profesor = self.huella()
+        self.assertNotEqual(antes, despues_profesor)
+
+        self.unidad.titulo = "Tema 1: Python"
+        self.unidad.save()
+        self.assertNotEqual(despues_profesor, self.huella())
+
+    def test_huella_depende_de_la_seleccion(self):
+        self.assertNotEqual(
+            self.huella(),
+            huella_informe(Seguimiento.objects.none(), "v1", "Informe"),
+        )
+
+    def test_huella_depende_de_la_version_de_plantilla(self):
+        self.assertNotEqual(
+            self.huella(),
+            huella_informe(Seguimiento.objects.all(), "v2", "Informe"),
+        )
+
+
+class CacheInformesTests(TestCase):
+    """Tests para el almacenamiento en disco de los informes"""
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+
+    def test_guardar_y_leer(self):
+        with override_settings(PDF_CACHE_DIR=self.directorio.name):
+            self.assertIsNone(leer_informe("a"))
+            guardar_informe("a", b"%PDF-a")
+            self.assertEqual(leer_informe("a"), b"%PDF-a")
+
+    def test_expulsa_el_menos_usado(self):
+        with override_settings(
+            PDF_CACHE_DIR=self.directorio.name, PDF_CACHE_MAX_BYTES=20
+        ):
+            guardar_informe("a", b"0" * 10)
+            guardar_informe("b", b"1" * 10)
+            # Marcamos "a" como más antiguo y luego lo leemos para que pase a ser el más reciente
+            os.utime(os.path.join(self.directorio.name, "a.pdf"), (0, 0))
+            os.utime(os.path.join(self.directorio.name, "b.pdf"), (1, 1))
+            leer_informe("a")
+            guardar_informe("c", b"2" * 10)
+
+            self.assertIsNotNone(leer_informe("a"))
+            self.assertIsNone(leer_informe("b"))
+            self.assertIsNotNone(leer_informe("c"))
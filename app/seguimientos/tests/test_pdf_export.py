@@ -0,0 +1,204 @@
+import calendar
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from io import BytesIO
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from pypdf import PdfWriter
+
+from seguimientos.models import Seguimiento
+from seguimientos.pdf_export import (
+    _htmls_por_bloque,
+    _renderizar_en_paralelo,
+    agrupar_por_año_y_mes,
+    descartar_pool,
+    numerar_paginas,
+    obtener_pool,
+)
+from seguimientos.tests.datos import crear_docencia, crear_seguimiento
+
+
+class AgruparPorAñoYMesTests(TestCase):
+    """Tests para la agrupación por bloques del informe PDF"""
+
+    def setUp(self):
+        self.docencias = {
+            año: crear_docencia(año=año) for año in ["2023-24", "2024-25"]
+        }
+
+    def crear_seguimiento(self, año, mes):
+        return crear_seguimiento(self.docencias[año], mes=mes)
+
+    def test_bloques_en_orden_academico(self):
+        """Los bloques se ordenan por año y por mes empezando en septiembre"""
+        self.crear_seguimiento("2024-25", 1)
+        self.crear_seguimiento("2024-25", 9)
+        self.crear_seguimiento("2023-24", 10)
+        self.crear_seguimiento("2024-25", 12)
+
+        bloques = list(agrupar_por_año_y_mes(Seguimiento.objects.all()))
+
+        self.assertEqual(
+            [(año, mes) for año, mes, _ in bloques],
+            [
+                ("2023-24", calendar.month_name[10].title()),
+                ("2024-25", calendar.month_name[9].title()),
+                ("2024-25", calendar.month_name[12].title()),
+                ("2024-25", calendar.month_name[1].title()),
+            ],
+        )
+
+    def test_seguimientos_del_mismo_mes_en_un_bloque(self):
+        """Todos los seguimientos de un mismo año y mes van en el mismo bloque"""
+        self.docencias["otra"] = crear_docencia(grupo="DAW1B")
+        self.crear_seguimiento("2024-25", 10)
+        self.crear_seguimiento("otra", 10)
+
+        bloques = list(agrupar_por_año_y_mes(Seguimiento.objects.all()))
+
+        self.assertEqual(len(bloques), 1)
+        self.assertEqual(len(bloques[0][2]), 2)
+
+    def test_consultas_constantes_al_renderizar(self):
+        """El HTML del informe se genera con las mismas consultas sea cual sea el tamaño"""
+        modulo = self.docencias["2024-25"].modulo
+        for i in range(5):
+            self.docencias[i] = crear_docencia(grupo=f"DAW1{i}")
+            seguimiento = self.crear_seguimiento(i, 10 + i % 2)
+            seguimiento.temario_completado = list(
+                modulo.unidades_de_temario.values_list("pk", flat=True)
+            )
+            seguimiento.save()
+        self.crear_seguimiento("2023-24", 10)
+
+        # Una consulta para los seguimientos y otra para el temario completado
+        with self.assertNumQueries(2):
+            htmls = list(
+                _htmls_por_bloque(
+                    agrupar_por_año_y_mes(Seguimiento.objects.all()),
+                    6,
+                    "Informe",
+                    timezone.now(),
+                )
+            )
+        self.assertEqual(len(htmls), 3)
+
+    def test_la_cabecera_lleva_la_fecha_de_los_datos(self):
+        """La fecha de la cabecera es la de los datos y no la de cada render"""
+        self.crear_seguimiento("2024-25", 10)
+        fecha_datos = timezone.make_aware(datetime(2024, 10, 31, 18, 5))
+
+        with mock.patch(
+            "django.utils.timezone.now",
+            return_value=timezone.make_aware(datetime(2025, 1, 1)),
+        ):
+            (html,) = _htmls_por_bloque(
+                agrupar_por_año_y_mes(Seguimiento.objects.all()),
+                1,
+                "Informe",
+                fecha_datos,
+            )
+
+        self.assertIn("Datos a 31 octubre 2024, 18:05", html)
+
+
+class PoolProcesosTests(SimpleTestCase):
+    """Tests para el pool de procesos compartido entre exportaciones"""
+
+    def tearDown(self):
+        descartar_pool()
+
+    def test_se_reutiliza_entre_exportaciones(self):
+        self.assertIs(obtener_pool(2), obtener_pool(2))
+
+    def test_se_crea_otro_si_cambian_los_workers(self):
+        pool = obtener_pool(2)
+
+        self.assertIsNot(obtener_pool(3), pool)
+
+    def pool_roto(self, al_enviar):
+        """Pool falso que falla con BrokenProcessPool al enviar o al recoger"""
+        pool = mock.Mock()
+        if al_enviar:
+            pool.submit.side_effect = BrokenProcessPool("Un worker ha terminado")
+        else:
+            futuro = Future()
+            futuro.set_exception(BrokenProcessPool("Un worker ha terminado"))
+            pool.submit.return_value = futuro
+        return pool
+
+    def pool_sano(self):
+        pool = mock.Mock()
+
+        def submit(funcion, html_string):
+            futuro = Future()
+            futuro.set_result(f"pdf {html_string}")
+            return futuro
+
+        pool.submit.side_effect = submit
+        return pool
+
+    def renderizar(self, *pools):
+        with (
+            mock.patch("seguimientos.pdf_export.obtener_pool", side_effect=list(pools)),
+            mock.patch("seguimientos.pdf_export.descartar_pool") as descartar,
+        ):
+            partes = list(_renderizar_en_paralelo(["a", "b", "c"], 2))
+        return partes, descartar
+
+    def test_se_crea_otro_si_se_rompe_al_enviar(self):
+        roto = self.pool_roto(al_enviar=True)
+        partes, descartar = self.renderizar(roto, self.pool_sano())
+
+        self.assertEqual(partes, ["pdf a", "pdf b", "pdf c"])
+        descartar.assert_called_once_with(roto)
+
+    def test_se_reenvian_las_partes_en_vuelo_si_se_rompe_al_recoger(self):
+        roto = self.pool_roto(al_enviar=False)
+        partes, descartar = self.renderizar(roto, self.pool_sano())
+
+        self.assertEqual(partes, ["pdf a", "pdf b", "pdf c"])
+        descartar.assert_called_once_with(roto)
+
+    def test_solo_se_reintenta_una_vez(self):
+        with self.assertRaises(BrokenProcessPool):
+            self.renderizar(
+                self.pool_roto(al_enviar=True), self.pool_roto(al_enviar=False)
+            )
+
+    def test_descartar_un_pool_que_ya_no_es_el_actual_no_cierra_el_nuevo(self):
+        viejo = obtener_pool(2)
+        nuevo = obtener_pool(3)
+
+        descartar_pool(viejo)
+
+        self.assertIs(obtener_pool(3), nuevo)
+
+
+class NumerarPaginasTests(SimpleTestCase):
+    """Tests para la numeración de las páginas del informe ya unido"""
+
+    def pdf_en_blanco(self, paginas):
+        writer = PdfWriter()
+        for _ in range(paginas):
+            writer.add_blank_page(width=595, height=842)
+        salida = BytesIO()
+        writer.write(salida)
+        return salida.getvalue()
+
+    def test_numera_con_el_total_del_informe_unido(self):
+        writer = PdfWriter()
+        # Dos partes renderizadas por separado, de 2 y 1 páginas
+        for paginas in (2, 1):
+            writer.append(BytesIO(self.pdf_en_blanco(paginas)))
+
+        with mock.patch("seguimientos.pdf_export.obtener_renderizador") as obtener:
+            obtener.return_value.renderizar.return_value = self.pdf_en_blanco(3)
+            numerar_paginas(writer)
+
+        (html,) = obtener.return_value.renderizar.call_args.args
+        self.assertEqual(html.count('class="numeracion"'), 3)
+        self.assertEqual(len(writer.pages), 3)
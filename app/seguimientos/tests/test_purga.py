@@ -0,0 +1,153 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from seguimientos.models import (
+    AñoAcademico,
+    Ciclo,
+    Docencia,
+    EstadoPurga,
+    Grupo,
+    Modulo,
+    Profesor,
+    PurgaAño,
+    Seguimiento,
+    UnidadDeTrabajo,
+)
+from seguimientos.purga import contar_año, ejecutar_purga, purgar_año_academico
+
+
+class PurgarAñoAcademicoTests(TestCase):
+    """Tests para el borrado en bloque de un año académico"""
+
+    def setUp(self):
+        self.profesor = Profesor.objects.create(
+            email="profesor@example.com", nombre="Juan Pérez"
+        )
+        self.antiguo = AñoAcademico.objects.create(año_academico="2023-24")
+        self.actual = AñoAcademico.objects.create(año_academico="2024-25", actual=True)
+        for año in [self.antiguo, self.actual]:
+            self.crear_datos(año, seguimientos=2)
+
+    def crear_datos(self, año, seguimientos):
+        ciclo = Ciclo.objects.create(nombre="DAW", año_academico=año)
+        grupo = Grupo.objects.create(nombre="DAW1A", ciclo=ciclo, curso=1)
+        for i in range(seguimientos):
+            modulo = Modulo.objects.create(nombre=f"Módulo {i}", curso=1, ciclo=ciclo)
+            unidad = UnidadDeTrabajo.objects.create(
+                numero_tema=1, titulo="Introducción", modulo=modulo
+            )
+            docencia = Docencia.objects.create(
+                profesor=self.profesor, grupo=grupo, modulo=modulo
+            )
+            Seguimiento.objects.create(
+                docencia=docencia,
+                mes=10,
+                temario_actual=unidad,
+                temario_completado=[unidad.pk],
+                ultimo_contenido_impartido="Contenido",
+                evaluacion="PRIMERA",
+            )
+
+    def test_contar_año(self):
+        self.assertEqual(
+            contar_año(self.antiguo),
+            {
+                "seguimientos": 2,
+                "docencias": 2,
+                "asignaciones": 2,
+                "unidades": 2,
+                "modulos": 2,
+                "grupos": 1,
+                "ciclos": 1,
+                "clonaciones": 0,
+            },
+        )
+
+    def test_borra_solo_el_año(self):
+        borradas = purgar_año_academico(self.antiguo)
+
+        self.assertEqual(borradas, contar_año(self.actual))
+        self.assertFalse(AñoAcademico.objects.filter(pk="2023-24").exists())
+        self.assertEqual(Ciclo.objects.get().año_academico, self.actual)
+        self.assertEqual(Seguimiento.objects.count(), 2)
+        self.assertEqual(
+            [s.unidades_completadas for s in Seguimiento.objects.all()],
+            [[s.temario_actual] for s in Seguimiento.objects.all()],
+        )
+        self.assertTrue(AñoAcademico.objects.get(pk="2024-25").actual)
+
+    def test_borrar_el_año_actual_elige_otro(self):
+        purgar_año_academico(self.actual)
+
+        self.assertTrue(AñoAcademico.objects.get(pk="2023-24").actual)
+
+    def test_consultas_constantes(self):
+        """Cada tabla se borra con una consulta sea cual sea el tamaño"""
+        with CaptureQueriesContext(connection) as pocos:
+            purgar_año_academico(self.antiguo)
+
+        grande = AñoAcademico.objects.create(año_academico="2022-23")
+        self.crear_datos(grande, seguimientos=10)
+        with CaptureQueriesContext(connection) as muchos:
+            purgar_año_academico(grande)
+
+        self.assertEqual(len(pocos), len(muchos))
+        self.assertEqual(Seguimiento.objects.count(), 2)
+
+    def test_la_particion_se_borra_al_final(self):
+        """El DROP bloquea la tabla de seguimientos, va después de todos los DELETE"""
+        with CaptureQueriesContext(connection) as consultas:
+            borradas = purgar_año_academico(self.antiguo)
+
+        sql = [consulta["sql"] for consulta in consultas]
+        drop = next(i for i, s in enumerate(sql) if s.startswith("DROP TABLE"))
+        self.assertFalse(any(s.startswith("DELETE") for s in sql[drop:]))
+        self.assertEqual(borradas["seguimientos"], 2)
+
+
+class EjecutarPurgaTests(TestCase):
+    """Tests para el borrado de un año en segundo plano con su PurgaAño"""
+
+    # El borrado escribe su progreso por la conexión "progreso"
+    databases = {"default", "progreso"}
+
+    def setUp(self):
+        self.año = AñoAcademico.objects.create(año_academico="2023-24")
+        Ciclo.objects.create(nombre="DAW", año_academico=self.año)
+
+    def test_guarda_lo_borrado(self):
+        purga = ejecutar_purga(PurgaAño.objects.create(año_academico="2023-24").pk)
+
+        purga.refresh_from_db()
+        self.assertEqual(purga.estado, EstadoPurga.COMPLETADA)
+        self.assertIn(["ciclos", 1], purga.progreso)
+        self.assertIsNotNone(purga.terminada)
+        self.assertFalse(AñoAcademico.objects.exists())
+
+    def test_guarda_el_error(self):
+        purga = PurgaAño.objects.create(año_academico="2023-24")
+
+        with (
+            mock.patch(
+                "seguimientos.purga.purgar_año_academico",
+                side_effect=RuntimeError("sin conexión"),
+            ),
+            self.assertLogs("seguimientos.purga", level="ERROR"),
+        ):
+            ejecutar_purga(purga.pk)
+
+        purga.refresh_from_db()
+        self.assertEqual(purga.estado, EstadoPurga.ERROR)
+        self.assertIn("sin conexión", purga.mensaje)
+        self.assertTrue(AñoAcademico.objects.exists())
+
+    def test_el_año_ya_no_existe(self):
+        purga = PurgaAño.objects.create(año_academico="2022-23")
+
+        purga = ejecutar_purga(purga.pk)
+
+        self.assertEqual(purga.estado, EstadoPurga.ERROR)
+        self.assertEqual(purga.mensaje, "El año académico 2022-23 ya no existe")
@@ -108,7 +108,11 @@ class SeguimientoSerializerTests(TestCase):
         self.client.force_authenticate(user=self.profesor2)
         response = self.client.post(url, data, format="json")
         self.assertEqual(response.status_code, 400)
-        self.assertIn("docencia", response.json())
+        self.assertEqual(
+            response.json()["docencia"],
+            ["Ya existe un seguimiento para este mes, grupo y módulo."],
+        )
+        self.assertEqual(Seguimiento.objects.count(), 1)
 
     def test_validate_seguimiento_valido(self):
         url = reverse("seguimiento-list")
@@ -169,6 +173,43 @@ class SeguimientoSerializerTests(TestCase):
         response = self.client.post(url, data, format="json")
         self.assertEqual(response.status_code, 400)
 
+    def test_temario_completado_ordenado_por_numero_de_tema(self):
+        temario0 = UnidadDeTrabajo.objects.create(
+            numero_tema=0, titulo="Presentación", modulo=self.modulo1
+        )
+        url = reverse("seguimiento-list")
+        data = {
+            "temario_actual": self.temario1.pk,
+            "docencia": self.docencia.pk,
+            "mes": 9,
+            "temario_completado": [self.temario1.pk, temario0.pk],
+            "ultimo_contenido_impartido": "Estructuras de control",
+            "estado": "AL_DIA",
+            "evaluacion": "PRIMERA",
+        }
+        self.client.force_authenticate(user=self.profesor)
+        response = self.client.post(url, data, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            response.json()["temario_completado"], [temario0.pk, self.temario1.pk]
+        )
+
+    def test_temario_completado_inexistente(self):
+        url = reverse("seguimiento-list")
+        data = {
+            "temario_actual": self.temario1.pk,
+            "docencia": self.docencia.pk,
+            "mes": 9,
+            "temario_completado": [self.temario1.pk, 0],
+            "ultimo_contenido_impartido": "Estructuras de control",
+            "estado": "AL_DIA",
+            "evaluacion": "PRIMERA",
+        }
+        self.client.force_authenticate(user=self.profesor)
+        response = self.client.post(url, data, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("temario_completado", response.json())
+
     def test_validate_put_cambio_mes_docencia(self):
         """
         Verifica que no se pueda cambiar el mes o la docencia en un PUT.
@@ -1,8 +1,31 @@
+import json
+from unittest import mock
+
+from django.db import connection
 from django.test import TestCase
 from django.core.cache import cache
-from seguimientos.models import AñoAcademico
+from django.test.client import RequestFactory
+from django.urls import reverse
+
+from seguimientos.admin import SeguimientoAdmin
+from seguimientos.admin_filters import BaseAñoAcademicoFilter
+from seguimientos.cache_catalogo import version_cache_años
+from seguimientos.models import (
+    AñoAcademico,
+    Ciclo,
+    Docencia,
+    Grupo,
+    Modulo,
+    Profesor,
+    Seguimiento,
+    UnidadDeTrabajo,
+)
+from seguimientos.purga import purgar_año_academico
 from seguimientos.utils import (
     get_año_academico_actual,
+    get_años_academicos,
+    get_modulo_de_docencia,
+    get_temario_modulo,
 )
 
 
@@ -33,7 +56,10 @@ class GetAñoAcademicoActualTests(TestCase):
         get_año_academico_actual()
 
         # Verificar que el valor está en caché
-        self.assertEqual(cache.get("año_academico_actual"), "2023-24")
+        self.assertEqual(
+            cache.get("año_academico_actual", version=version_cache_años()),
+            "2023-24",
+        )
 
         # Cambiar el año actual
         año_obj = AñoAcademico.objects.get(actual=True)
@@ -46,3 +72,163 @@ class GetAñoAcademicoActualTests(TestCase):
         # Limpiar la caché y verificar que devuelve el valor actualizado
         cache.clear()
         self.assertEqual(get_año_academico_actual(), "2024-25")
+
+
+class GetAñosAcademicosTests(TestCase):
+    """Tests para la lista de años en caché y el filtro de año del admin"""
+
+    def setUp(self):
+        cache.clear()
+        AñoAcademico.objects.create(año_academico="2023-24")
+        AñoAcademico.objects.create(año_academico="2024-25", actual=True)
+
+    def test_lista_en_caché(self):
+        self.assertEqual(get_años_academicos(), ["2024-25", "2023-24"])
+        with self.assertNumQueries(0):
+            self.assertEqual(get_años_academicos(), ["2024-25", "2023-24"])
+
+    def test_se_invalida_al_crear_y_borrar(self):
+        get_años_academicos()
+        AñoAcademico.objects.create(año_academico="2025-26")
+        self.assertEqual(get_años_academicos(), ["2025-26", "2024-25", "2023-24"])
+
+        AñoAcademico.objects.get(año_academico="2023-24").delete()
+        self.assertEqual(get_años_academicos(), ["2025-26", "2024-25"])
+
+        purgar_año_academico(AñoAcademico.objects.get(año_academico="2025-26"))
+        self.assertEqual(get_años_academicos(), ["2024-25"])
+        self.assertEqual(get_año_academico_actual(), "2024-25")
+
+    def test_filtro_sin_consultas(self):
+        """Con la caché llena el filtro de año no hace ninguna consulta"""
+        get_años_academicos()
+        get_año_academico_actual()
+        model_admin = SeguimientoAdmin(Seguimiento, None)
+
+        for valor in [None, "2023-24", "todos", "1999-00"]:
+            params = {"año_academico": [valor]} if valor else {}
+            request = RequestFactory().get("/", {k: v[0] for k, v in params.items()})
+            with self.assertNumQueries(0):
+                filtro = BaseAñoAcademicoFilter(
+                    request, params, Seguimiento, model_admin
+                )
+                filtro.queryset(request, Seguimiento.objects.all())
+
+    def test_filtro_con_año_que_falta_en_la_caché(self):
+        """Un año creado por otro proceso filtra aunque la lista en caché no lo tenga"""
+        get_años_academicos()
+        with mock.patch("seguimientos.models.invalidar_cache_años"):
+            AñoAcademico.objects.create(año_academico="2025-26")
+        self.assertNotIn("2025-26", get_años_academicos())
+        model_admin = SeguimientoAdmin(Seguimiento, None)
+        params = {"año_academico": ["2025-26"]}
+        request = RequestFactory().get("/", {"año_academico": "2025-26"})
+        filtro = BaseAñoAcademicoFilter(request, params, Seguimiento, model_admin)
+
+        queryset = filtro.queryset(request, Seguimiento.objects.all())
+
+        self.assertIn("2025-26", str(queryset.query))
+
+
+class GetTemarioModuloTests(TestCase):
+    """Tests para el temario en caché del autocompletado de seguimientos"""
+
+    def setUp(self):
+        cache.clear()
+        año = AñoAcademico.objects.create(año_academico="2024-25")
+        ciclo = Ciclo.objects.create(nombre="DAW", año_academico=año)
+        self.modulo = Modulo.objects.create(nombre="Programación", curso=1, ciclo=ciclo)
+        for numero_tema, titulo in [(2, "Funciones"), (1, "Variables")]:
+            UnidadDeTrabajo.objects.create(
+                numero_tema=numero_tema, titulo=titulo, modulo=self.modulo
+            )
+        self.docencia = Docencia.objects.create(
+            profesor=Profesor.objects.create(
+                email="profesor@example.com", nombre="Profesor"
+            ),
+            grupo=Grupo.objects.create(nombre="DAW1A", ciclo=ciclo, curso=1),
+            modulo=self.modulo,
+        )
+
+    def titulos(self):
+        return [unidad.titulo for unidad in get_temario_modulo(self.modulo.pk)]
+
+    def autocompletar(self, q=""):
+        response = self.client.get(
+            reverse("admin:temario-autocomplete"),
+            {"q": q, "forward": json.dumps({"docencia": str(self.docencia.pk)})},
+        )
+        return [resultado["text"] for resultado in response.json()["results"]]
+
+    def test_en_caché(self):
+        self.assertEqual(get_modulo_de_docencia(self.docencia.pk), self.modulo.pk)
+        self.assertEqual(self.titulos(), ["Variables", "Funciones"])
+        with self.assertNumQueries(0):
+            self.assertEqual(get_modulo_de_docencia(self.docencia.pk), self.modulo.pk)
+            self.assertEqual(self.titulos(), ["Variables", "Funciones"])
+
+    def test_se_invalida_al_cambiar_el_temario(self):
+        self.titulos()
+        unidad = UnidadDeTrabajo.objects.create(
+            numero_tema=3, titulo="Clases", modulo=self.modulo
+        )
+        self.assertEqual(self.titulos(), ["Variables", "Funciones", "Clases"])
+        unidad.delete()
+        self.assertEqual(self.titulos(), ["Variables", "Funciones"])
+
+    def test_solo_se_invalida_el_modulo_que_cambia(self):
+        otro_modulo = Modulo.objects.create(
+            nombre="Sistemas", curso=1, ciclo=self.modulo.ciclo
+        )
+        self.titulos()
+        unidad = UnidadDeTrabajo.objects.create(
+            numero_tema=1, titulo="Hardware", modulo=otro_modulo
+        )
+        Docencia.objects.create(
+            profesor=self.docencia.profesor,
+            grupo=self.docencia.grupo,
+            modulo=otro_modulo,
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(self.titulos(), ["Variables", "Funciones"])
+
+        # Al mover la unidad de módulo se invalidan los dos
+        unidad = UnidadDeTrabajo.objects.get(pk=unidad.pk)
+        unidad.modulo = self.modulo
+        unidad.numero_tema = 3
+        unidad.save()
+        self.assertEqual(self.titulos(), ["Variables", "Funciones", "Hardware"])
+        self.assertEqual(get_temario_modulo(otro_modulo.pk), [])
+
+    def test_se_invalida_al_cambiar_el_modulo_de_la_docencia(self):
+        self.assertEqual(get_modulo_de_docencia(self.docencia.pk), self.modulo.pk)
+        otro_modulo = Modulo.objects.create(
+            nombre="Sistemas", curso=1, ciclo=self.modulo.ciclo
+        )
+        docencia = Docencia.objects.get(pk=self.docencia.pk)
+        docencia.modulo = otro_modulo
+        docencia.save()
+        self.assertEqual(get_modulo_de_docencia(self.docencia.pk), otro_modulo.pk)
+
+        docencia.delete()
+        self.assertIsNone(get_modulo_de_docencia(self.docencia.pk))
+
+    @mock.patch("seguimientos.utils.MAX_UNIDADES_TEMARIO_CACHEADO", 1)
+    def test_modulo_grande_sin_caché(self):
+        self.assertIsNone(get_temario_modulo(self.modulo.pk))
+        self.assertEqual(self.autocompletar("func"), ["T2 - Funciones"])
+
+    def test_la_busqueda_sin_caché_usa_el_indice_de_trigramas(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = (
+            UnidadDeTrabajo.objects.filter(titulo__icontains="func")
+            .order_by()
+            .explain()
+        )
+        self.assertIn("unidad_titulo_trgm_idx", plan)
+
+    def test_autocompletado(self):
+        self.assertEqual(self.autocompletar(), ["T1 - Variables", "T2 - Funciones"])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.autocompletar("FUNC"), ["T2 - Funciones"])
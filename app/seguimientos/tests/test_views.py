@@ -152,7 +152,7 @@ class SeguimientosFaltantesViewTestCase(TestCase):
         self.assertEqual(len(response.data), 0)
 
     def test_seguimientos_faltantes_despues_de_seguimientos_mismo_grupo(self):
-        # Crear seguimientos para ambas docencias en el mismo grupo y módulo
+        # Crear el seguimiento del grupo y módulo de ambas docencias, solo puede haber uno
         Seguimiento.objects.create(
             temario_actual=self.unidad,
             ultimo_contenido_impartido="Introducción",
@@ -161,14 +161,6 @@ class SeguimientosFaltantesViewTestCase(TestCase):
             docencia=self.docencia1,
             evaluacion="PRIMERA",
         )
-        Seguimiento.objects.create(
-            temario_actual=self.unidad,
-            ultimo_contenido_impartido="Introducción",
-            estado="AL_DIA",
-            mes=self.mes,
-            docencia=self.docencia2,
-            evaluacion="PRIMERA",
-        )
         self.client.force_authenticate(user=self.profesor1)
         # Verificar que ninguna docencia está pendiente de seguimiento
         response = self.client.get(
@@ -6,6 +6,7 @@ router = DefaultRouter()
 router.register(r"seguimientos", views.SeguimientoViewSet, basename="seguimiento")
 router.register(r"modulos", views.ModuloViewSet, basename="modulo")
 router.register(r"docencias", views.DocenciaViewSet, basename="docencia")
+router.register(r"archivo", views.AñoArchivadoViewSet, basename="año-archivado")
 urlpatterns = [
     path("", include(router.urls)),
     path(
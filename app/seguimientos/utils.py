@@ -1,5 +1,11 @@
+from itertools import islice
+
 from django.core.cache import cache
-from .models import AñoAcademico
+from .cache_catalogo import clave_modulo_docencia, clave_temario, version_cache_años
+from .models import AñoAcademico, Docencia, UnidadDeTrabajo
+
+# Los módulos con más unidades no se cachean, se buscan en la base de datos
+MAX_UNIDADES_TEMARIO_CACHEADO = 100
 
 
 def get_año_academico_actual():
@@ -9,7 +15,8 @@ def get_año_academico_actual():
     """
     # Comprobar si tenemos un valor en caché
     clave_cache = "año_academico_actual"
-    año_cacheado = cache.get(clave_cache)
+    version = version_cache_años()
+    año_cacheado = cache.get(clave_cache, version=version)
 
     if año_cacheado:
         return año_cacheado
@@ -20,8 +27,94 @@ def get_año_academico_actual():
     if latest_year:
         ultimo_año = latest_year.año_academico
         # Almacenar el resultado en caché (86400 segundos = 24 horas)
-        cache.set(clave_cache, ultimo_año, 86400)
+        cache.set(clave_cache, ultimo_año, 86400, version=version)
     else:
         ultimo_año = ""
 
     return ultimo_año
+
+
+def get_años_academicos():
+    """
+    Devuelve los años académicos, del más reciente al más antiguo,
+    con caché para no consultarlos en cada listado del admin.
+    """
+    version = version_cache_años()
+    años = cache.get("años_academicos", version=version)
+    if años is None:
+        años = list(
+            AñoAcademico.objects.order_by("-año_academico").values_list(
+                "año_academico", flat=True
+            )
+        )
+        cache.set("años_academicos", años, 86400, version=version)
+    return años
+
+
+def get_modulo_de_docencia(docencia_id):
+    """
+    Devuelve el id del módulo de la docencia, o None si no existe,
+    con caché para el autocompletado del temario.
+    """
+    clave_cache = clave_modulo_docencia(docencia_id)
+    modulo_id = cache.get(clave_cache)
+    if modulo_id is None:
+        modulo_id = (
+            Docencia.objects.filter(pk=docencia_id)
+            .values_list("modulo_id", flat=True)
+            .first()
+        )
+        if modulo_id is not None:
+            cache.set(clave_cache, modulo_id, 86400)
+    return modulo_id
+
+
+def get_temario_modulo(modulo_id):
+    """
+    Devuelve las unidades de trabajo del módulo ordenadas por número de tema,
+    con caché, o None si el módulo tiene demasiadas para cachearlas.
+    """
+    clave_cache = clave_temario(modulo_id)
+    temario = cache.get(clave_cache)
+    if temario is None:
+        temario = list(
+            UnidadDeTrabajo.objects.filter(modulo_id=modulo_id)
+            .order_by("numero_tema")
+            .values_list("id", "numero_tema", "titulo")[
+                : MAX_UNIDADES_TEMARIO_CACHEADO + 1
+            ]
+        )
+        # Se cachea también que el módulo es demasiado grande
+        if len(temario) > MAX_UNIDADES_TEMARIO_CACHEADO:
+            temario = False
+        cache.set(clave_cache, temario, 86400)
+    if temario is False:
+        return None
+    return [
+        UnidadDeTrabajo(
+            id=id, numero_tema=numero_tema, titulo=titulo, modulo_id=modulo_id
+        )
+        for id, numero_tema, titulo in temario
+    ]
+
+
+def cargar_unidades_completadas(seguimientos):
+    """
+    Carga las unidades del temario completado de todos los seguimientos con una
+    sola consulta y las deja en su unidades_completadas.
+    """
+    unidades = UnidadDeTrabajo.objects.in_bulk(
+        {pk for seguimiento in seguimientos for pk in seguimiento.temario_completado}
+    )
+    for seguimiento in seguimientos:
+        seguimiento.unidades_completadas = [
+            unidades[pk] for pk in seguimiento.temario_completado if pk in unidades
+        ]
+    return seguimientos
+
+
+def recorrer_con_unidades_completadas(seguimientos, tamaño_lote):
+    """Recorre los seguimientos cargando las unidades completadas de cada lote con una consulta"""
+    seguimientos = iter(seguimientos)
+    while lote := list(islice(seguimientos, tamaño_lote)):
+        yield from cargar_unidades_completadas(lote)
@@ -1,4 +1,6 @@
+from .archivo import leer_seguimientos
 from .models import (
+    AñoArchivado,
     Seguimiento,
     Modulo,
     UnidadDeTrabajo,
@@ -6,7 +8,6 @@ from .models import (
     RecordatorioEmailConfig,
 )
 from rest_framework import status, viewsets, generics
-from django.db.models import Q
 from rest_framework.views import APIView
 from .utils import get_año_academico_actual
 from rest_framework.decorators import action
@@ -19,6 +20,7 @@ from .serializers import RecordatorioSerializer
 from django.template import Template, Context
 import calendar
 from .serializers import (
+    AñoArchivadoSerializer,
     SeguimientoSerializer,
     ModuloSerializer,
     UnidadDeTrabajoSerializer,
@@ -44,23 +46,12 @@ class SeguimientoViewSet(viewsets.ModelViewSet):
 
         if not self.request.user.is_authenticated:
             return Seguimiento.objects.none()
-        # Obtiene todas las docencias del profesor actual
-        docencias_profesor = Docencia.objects.filter(profesor=self.request.user)
-
-        # Crea un objeto Q para construir una consulta OR para cada par (grupo, módulo)
-        consulta = Q()
-        for docencia in docencias_profesor:
-            # Añade condición para este par específico (grupo, módulo)
-            consulta |= Q(
-                docencia__grupo=docencia.grupo, docencia__modulo=docencia.modulo
+        # Seguimientos de las asignaciones (grupo, módulo) de las docencias del profesor
+        seguimientos = Seguimiento.objects.filter(
+            asignacion__in=Docencia.objects.filter(profesor=self.request.user).values(
+                "asignacion"
             )
-
-        # Si el profesor no tiene docencias, devuelve un queryset vacío
-        if not docencias_profesor.exists():
-            return Seguimiento.objects.none()
-
-        # Devuelve los seguimientos que coinciden con cualquiera de los pares (grupo, módulo) del profesor
-        seguimientos = Seguimiento.objects.filter(consulta)
+        )
 
         # Filtra los seguimientos por parametros pasados en la URL
         year = (
@@ -70,12 +61,11 @@ class SeguimientoViewSet(viewsets.ModelViewSet):
         )
         mes = self.request.query_params.get("mes")
         if year:
-            seguimientos = seguimientos.filter(
-                docencia__modulo__ciclo__año_academico=year
-            )
+            seguimientos = seguimientos.filter(año_academico=year)
         if mes:
             seguimientos = seguimientos.filter(mes=mes)
-        return seguimientos
+        # Ordenados por mes del curso, empezando en septiembre
+        return seguimientos.order_by("orden_mes_academico", "pk")
 
 
 class ModuloViewSet(viewsets.ReadOnlyModelViewSet):
@@ -102,7 +92,37 @@ class DocenciaViewSet(viewsets.ReadOnlyModelViewSet):
     def get_queryset(self):
         return Docencia.objects.filter(
             profesor=self.request.user,
-            modulo__ciclo__año_academico=get_año_academico_actual(),
+            año_academico=get_año_academico_actual(),
+        )
+
+
+class AñoArchivadoViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    ViewSet de solo lectura de los años archivados. Los seguimientos se leen de
+    la copia comprimida del año, cada profesor ve los de los grupos y módulos en
+    los que tenía docencia y los administradores todos.
+    """
+
+    queryset = AñoArchivado.objects.defer("datos")
+    serializer_class = AñoArchivadoSerializer
+    permission_classes = [IsAuthenticated]
+
+    @action(detail=True, methods=["get"])
+    def seguimientos(self, request, pk):
+        archivado = AñoArchivado.objects.filter(pk=pk).first()
+        if archivado is None:
+            return Response("No existe ese año archivado", status.HTTP_404_NOT_FOUND)
+        mes = request.query_params.get("mes")
+        if mes is not None and not mes.isdigit():
+            return Response("Mes no válido", status.HTTP_400_BAD_REQUEST)
+        return Response(
+            list(
+                leer_seguimientos(
+                    archivado,
+                    mes=int(mes) if mes is not None else None,
+                    email_docente=None if request.user.is_admin else request.user.email,
+                )
+            )
         )
 
 
@@ -125,22 +145,16 @@ class SeguimientosFaltantesView(generics.ListAPIView):
         mes = self.kwargs["mes"]
         user = self.request.user
         # Paso 1: Filtrar las instancias de Docencia por año académico
-        docencias = Docencia.objects.filter(modulo__ciclo__año_academico=año_academico)
+        docencias = Docencia.objects.filter(año_academico=año_academico)
 
         # Paso 2: Obtener todos los Seguimiento para el mes y año académico dados
-        seguimientos = Seguimiento.objects.filter(
-            mes=mes, docencia__modulo__ciclo__año_academico=año_academico
-        )
-
-        # Paso 3: Excluir las Docencia que ya tienen un Seguimiento para el mes dado
-        docencias_con_seguimiento = seguimientos.values_list("docencia", flat=True)
-        docencias_sin_seguimiento = docencias.exclude(id__in=docencias_con_seguimiento)
+        seguimientos = Seguimiento.objects.filter(mes=mes, año_academico=año_academico)
 
-        # Paso 4: Excluir las Docencia donde otra Docencia con el mismo grupo y módulo ya tiene un Seguimiento
-        for seguimiento in seguimientos:
-            docencias_sin_seguimiento = docencias_sin_seguimiento.exclude(
-                grupo=seguimiento.docencia.grupo, modulo=seguimiento.docencia.modulo
-            )
+        # Paso 3: Excluir las Docencia cuya asignación (grupo y módulo) ya tiene un
+        # Seguimiento para el mes dado, lo haya hecho esta u otra docencia
+        docencias_sin_seguimiento = docencias.exclude(
+            asignacion__in=seguimientos.values("asignacion")
+        )
         # Si es administrador y quiere todas se le muestran, si no solo las del profesor
         if user.is_admin and self.request.query_params.get("all") is not None:
             return docencias_sin_seguimiento
@@ -164,7 +178,7 @@ class SeguimientosFaltantesAnualView(generics.ListAPIView):
         resultados_por_mes = {}
 
         # Paso 1: Filtrar las instancias de Docencia por año académico
-        docencias = Docencia.objects.filter(modulo__ciclo__año_academico=año_academico)
+        docencias = Docencia.objects.filter(año_academico=año_academico)
 
         # Si no es administrador o no se solicitan todas, filtrar por profesor
         if not (user.is_admin and self.request.query_params.get("all") is not None):
@@ -174,21 +188,15 @@ class SeguimientosFaltantesAnualView(generics.ListAPIView):
         for num_mes in range(1, 13):
             # Paso 2: Obtener todos los Seguimiento para el mes y año académico dados
             seguimientos = Seguimiento.objects.filter(
-                mes=num_mes, docencia__modulo__ciclo__año_academico=año_academico
+                mes=num_mes, año_academico=año_academico
             )
 
-            # Paso 3: Excluir las Docencia que ya tienen un Seguimiento para el mes dado
-            docencias_con_seguimiento = seguimientos.values_list("docencia", flat=True)
+            # Paso 3: Excluir las Docencia cuya asignación (grupo y módulo) ya tiene un
+            # Seguimiento para el mes dado, lo haya hecho esta u otra docencia
             docencias_sin_seguimiento = docencias.exclude(
-                id__in=docencias_con_seguimiento
+                asignacion__in=seguimientos.values("asignacion")
             )
 
-            # Paso 4: Excluir las Docencia donde otra Docencia con el mismo grupo y módulo ya tiene un Seguimiento
-            for seguimiento in seguimientos:
-                docencias_sin_seguimiento = docencias_sin_seguimiento.exclude(
-                    grupo=seguimiento.docencia.grupo, modulo=seguimiento.docencia.modulo
-                )
-
             # Añadir los IDs de docencias sin seguimiento al resultado para este mes
             if docencias_sin_seguimiento.exists():
                 resultados_por_mes[num_mes] = list(